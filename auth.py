@@ -0,0 +1,28 @@
+"""Kirish: foydalanuvchini topish va parolini tekshirish (Tkinter'siz)."""
+import sqlite3
+
+import passwords
+import repository as repo
+
+
+def authenticate(login, password, role):
+    """(foydalanuvchi, None) yoki (None, xato matni).
+
+    Foydalanuvchi yozuvi repo.users keshidan olinadi. Eski (sha256) yoki
+    arzonroq xesh to'g'ri paroldan keyin joriy algoritmga o'tkaziladi.
+    """
+    user = repo.users.find_for_login(login, role)
+    if not user:
+        return None, "Foydalanuvchi topilmadi!"
+
+    user_id, ism, stored_hash, salt = user
+    if not passwords.verify_password(password, stored_hash, salt):
+        return None, "Noto'g'ri parol!"
+
+    # Parol faqat hozir ma'lum - qayta xeshlashning yagona imkoniyati
+    if passwords.needs_rehash(stored_hash):
+        try:
+            repo.users.set_password(user_id, *passwords.hash_password(password))
+        except sqlite3.Error:
+            pass  # keyingi kirishda yana urinib ko'riladi
+    return {'id': user_id, 'name': ism, 'role': role}, None
@@ -0,0 +1 @@
+"""Mahalliy vaqtinchalik bazada ishlaydigan o'lchovlar (python -m benchmarks.<nom>)."""
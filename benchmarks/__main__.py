@@ -0,0 +1,131 @@
+"""Displeysiz o'lchovlar.
+
+    python -m benchmarks generate --out bench.db --scale medium
+    python -m benchmarks run --db bench.db --save base.json
+    python -m benchmarks run --db bench.db --compare base.json     # sekinlashsa 1 kodi bilan chiqadi
+    python -m benchmarks run --scale small                          # bazani o'zi yaratadi
+
+Baza har safar vaqtinchalik nusxaga ko'chiriladi - o'lchovlar uni o'zgartirmaydi.
+"""
+import argparse
+import dataclasses
+import os
+import sqlite3
+import sys
+import tempfile
+
+import database
+import timings
+from benchmarks import datagen, harness, suite
+
+
+def scale_from_args(args):
+    scale = datagen.SCALES[args.scale]
+    overrides = {name: getattr(args, name) for name in ('teachers', 'students', 'tests', 'questions',
+                                                        'results_per_student', 'seed')
+                 if getattr(args, name) is not None}
+    return dataclasses.replace(scale, **overrides)
+
+
+def add_scale_arguments(parser):
+    parser.add_argument('--scale', choices=sorted(datagen.SCALES), default='small')
+    for name in ('teachers', 'students', 'tests', 'questions', 'results-per-student', 'seed'):
+        parser.add_argument(f'--{name}', type=int)
+
+
+def cmd_generate(args):
+    scale = scale_from_args(args)
+    count = datagen.generate(args.out, scale)
+    print(f"{args.out}: {scale}, {count} ta natija", file=sys.stderr)
+    return 0
+
+
+def copy_database(source, target):
+    """WAL bilan ham to'g'ri nusxa olish uchun backup API"""
+    src, dst = sqlite3.connect(source), sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+def cmd_run(args):
+    if args.db and not os.path.isfile(args.db):
+        print(f"Baza fayli topilmadi: {args.db}", file=sys.stderr)
+        return 1
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'bench.db')
+        if args.db:
+            copy_database(args.db, path)
+            source = args.db
+        else:
+            scale = scale_from_args(args)
+            print(f"Baza yaratilmoqda: {scale}", file=sys.stderr)
+            datagen.generate(path, scale)
+            source = f"{args.scale} {scale}"
+
+        database.configure_pool(path)
+        database.init_db()
+        ctx = suite.Context(workdir)
+        try:
+            suite.prepare(ctx)
+        except ValueError as error:
+            database.get_pool().close()
+            print(f"{source}: {error}", file=sys.stderr)
+            return 1
+
+        only = set(args.only.split(',')) if args.only else None
+        results = {}
+        for bench in suite.benchmarks(ctx):
+            if only and bench.name not in only:
+                continue
+            repeat = args.heavy_repeat if bench.heavy else args.repeat
+            if bench.max_repeat is not None:
+                repeat = min(repeat, bench.max_repeat)
+            samples = harness.measure(bench.fn, repeat, args.warmup, bench.setup)
+            results[bench.name] = timings.summarize(samples)
+            print(f"  {bench.name}: p50 {results[bench.name]['p50']:.2f} ms", file=sys.stderr)
+        ctx.close()
+        database.get_pool().close()
+
+    print(f"\nBaza: {source}")
+    harness.print_report(results)
+    if args.save:
+        meta = dict(timings.environment(), source=source, repeat=args.repeat)
+        harness.save(args.save, results, meta)
+    if args.compare:
+        regressions = timings.compare(results, timings.load(args.compare)['results'], args.threshold)
+        if regressions:
+            print(f"\nSekinlashgan amallar: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Edu Evaluation o'lchovlari")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('generate', help="sinov bazasini yaratish")
+    p.add_argument('--out', required=True)
+    add_scale_arguments(p)
+    p.set_defaults(func=cmd_generate)
+
+    p = commands.add_parser('run', help="o'lchovlarni bajarish")
+    p.add_argument('--db', help="tayyor baza (berilmasa --scale bo'yicha yaratiladi)")
+    add_scale_arguments(p)
+    p.add_argument('--repeat', type=int, default=200)
+    p.add_argument('--heavy-repeat', type=int, default=3, help="eksport kabi sekin amallar uchun")
+    p.add_argument('--warmup', type=int, default=3)
+    p.add_argument('--only', help="vergul bilan ajratilgan amallar (masalan login,start_test)")
+    p.add_argument('--save', help="natijani JSON ga saqlash")
+    p.add_argument('--compare', help="avval saqlangan JSON bilan solishtirish")
+    p.add_argument('--threshold', type=float, default=timings.REGRESSION_THRESHOLD)
+    p.set_defaults(func=cmd_run)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Sinov uchun katta baza yaratish (init_db sxemasi bilan).
+
+    python -m benchmarks generate --out bench.db --students 20000 --tests 500
+
+Parollar: BENCH_LOGINS ta o'quvchi joriy narxdagi xesh bilan (kirish o'lchovi
+uchun, paroli 'parol'), qolganlari arzon xesh bilan - tayyorlash tez bo'lishi uchun.
+"""
+import os
+import random
+import string
+from dataclasses import dataclass
+
+import database
+import passwords
+
+
+BENCH_LOGINS = 50
+BENCH_PASSWORD = 'parol'
+CHEAP_PARAMS = {'iterations': 1000}
+BATCH = 5000
+
+FIRST_NAMES = ['Ali', 'Vali', 'Aziz', 'Dilnoza', 'Madina', 'Jasur', 'Shahnoza', 'Otabek',
+               'Malika', 'Sardor', 'Nodira', 'Bekzod', 'Gulnora', 'Javlon', 'Zarina', 'Umid']
+LAST_NAMES = ['Karimov', 'Rahimova', 'Toshmatov', 'Yusupova', 'Aliyev', 'Saidova',
+              'Ergashev', 'Qodirova', 'Nazarov', 'Ismoilova', 'Xolmatov', 'Abdullayeva']
+SUBJECTS = ['Matematika', 'Fizika', 'Kimyo', 'Biologiya', 'Tarix', 'Ona tili',
+            'Ingliz tili', 'Geografiya', 'Informatika', 'Adabiyot']
+
+
+@dataclass
+class Scale:
+    teachers: int = 5
+    students: int = 5000
+    tests: int = 200
+    questions: int = 30             # har bir testda
+    results_per_student: int = 20   # har bir o'quvchi ishlagan testlar
+    seed: int = 1
+
+
+SCALES = {
+    'small': Scale(students=1000, tests=50, questions=20, results_per_student=5),
+    'medium': Scale(),
+    'large': Scale(teachers=20, students=50000, tests=2000, questions=40, results_per_student=40),
+}
+
+
+def _batched_insert(conn, query, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            conn.executemany(query, batch)
+            batch = []
+    if batch:
+        conn.executemany(query, batch)
+
+
+def generate(path, scale):
+    """path da yangi baza yaratib, scale bo'yicha to'ldirish"""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    rng = random.Random(scale.seed)
+    database.configure_pool(path)
+    database.init_db()
+
+    cheap_hash, cheap_salt = passwords.hash_password(BENCH_PASSWORD, params=CHEAP_PARAMS)
+    with database.db_session() as conn:
+        # O'qituvchilar (admin - id 1 - allaqachon bor)
+        _batched_insert(conn, '''
+        INSERT INTO users (ism, login, parol_hash, salt, role) VALUES (?, ?, ?, ?, 'teacher')
+        ''', ((f"O'qituvchi {i}", f'teacher{i}', cheap_hash, cheap_salt) for i in range(scale.teachers)))
+        teacher_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'teacher'")]
+
+        def student(i):
+            if i < BENCH_LOGINS:
+                parol_hash, salt = passwords.hash_password(BENCH_PASSWORD)
+            else:
+                parol_hash, salt = cheap_hash, cheap_salt
+            ism = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+            return ism, f'student{i}', parol_hash, salt
+
+        _batched_insert(conn, '''
+        INSERT INTO users (ism, login, parol_hash, salt, role) VALUES (?, ?, ?, ?, 'student')
+        ''', (student(i) for i in range(scale.students)))
+        student_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'student' ORDER BY id")]
+
+        _batched_insert(conn, '''
+        INSERT INTO tests (nomi, oqituvchi_id, savollar_soni) VALUES (?, ?, ?)
+        ''', ((f"{rng.choice(SUBJECTS)} {i // len(SUBJECTS) + 1}-{i}", rng.choice(teacher_ids), scale.questions)
+              for i in range(scale.tests)))
+        test_ids = [row[0] for row in conn.execute("SELECT id FROM tests ORDER BY id")]
+
+        keys = {test_id: ''.join(rng.choice('ABCD') for _ in range(scale.questions)) for test_id in test_ids}
+        _batched_insert(conn, '''
+        INSERT INTO questions (test_id, savol_matni, variant_a, variant_b, variant_c, variant_d, togri_javob)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', ((test_id, f"{n + 1}-savol: " + ''.join(rng.choices(string.ascii_lowercase + ' ', k=60)),
+               'Variant A', 'Variant B', 'Variant C', 'Variant D', keys[test_id][n])
+              for test_id in test_ids for n in range(scale.questions)))
+
+        def attempts():
+            per_student = min(scale.results_per_student, len(test_ids))
+            for student_id in student_ids:
+                skill = rng.random()
+                for test_id in rng.sample(test_ids, per_student):
+                    key = keys[test_id]
+                    answers = ''.join(k if rng.random() < skill else rng.choice('ABCD ') for k in key)
+                    correct = sum(a == k for a, k in zip(answers, key))
+                    foiz = correct / len(key) * 100
+                    yield student_id, test_id, correct, foiz, foiz >= 60, answers
+
+        rows = list(attempts())
+        _batched_insert(conn, '''
+        INSERT INTO results (oquvchi_id, test_id, togri_javoblar, foiz, otganmi, javoblar)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        _batched_insert(conn, '''
+        INSERT INTO student_test_attempts (oquvchi_id, test_id) VALUES (?, ?)
+        ''', ((row[0], row[1]) for row in rows))
+    database.get_pool().close()
+    return len(rows)
@@ -0,0 +1,43 @@
+"""O'lchash, hisobot va ikki o'lchovni solishtirish.
+
+Natijalar JSON ga saqlanadi ({nom: {p50, p95, ...}}); --compare bilan avvalgi
+saqlangan o'lchov bilan solishtiriladi va sekinlashganlar ko'rsatiladi.
+"""
+import json
+import time
+
+from timings import PERCENTILES
+
+
+def measure(fn, repeat, warmup=1, setup=None):
+    """fn(i) ni repeat marta bajarib, har birining vaqtini (ms) qaytarish.
+
+    setup(i) vaqtga qo'shilmaydi (masalan, keshni tozalash).
+    """
+    for i in range(warmup):
+        if setup is not None:
+            setup(-1 - i)
+        fn(-1 - i)
+    timings = []
+    for i in range(repeat):
+        if setup is not None:
+            setup(i)
+        t0 = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def save(path, results, meta):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+def print_report(results, stream=None):
+    header = f"{'amal':<26}{'n':>6}" + ''.join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}"
+    print(header, file=stream)
+    for name, summary in results.items():
+        print(f"{name:<26}{summary['n']:>6}"
+              + ''.join(f"{summary[f'p{p}']:>10.2f}" for p in PERCENTILES)
+              + f"{summary['max']:>10.2f}", file=stream)
+    print("(ms)", file=stream)
@@ -0,0 +1,121 @@
+"""Dars boshidagi bir vaqtdagi kirishlarni o'lchash.
+
+    python -m benchmarks.login --students 20000 --burst 40 --rounds 5
+
+Vaqtinchalik bazada --students ta o'quvchi yaratiladi (kirmaydiganlari arzon
+xesh bilan - tayyorlash tez bo'lishi uchun), keyin --burst ta oqim bir vaqtda
+auth.authenticate ni chaqiradi. Har bir holat uchun kirish vaqtining
+p50 / p95 / max qiymatlari, faqat bazadan qidirish vaqti va so'rov rejasi
+(EXPLAIN QUERY PLAN) chiqariladi:
+
+    cold      - kesh bo'sh, login UNIQUE indeksi bo'yicha qidirish
+    warm      - sinf ro'yxati oldindan keshga yuklangan (users.prefetch)
+    scan      - kesh bo'sh, indekssiz (FROM users NOT INDEXED) - jadvalni to'liq ko'rish
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import auth
+import database
+import passwords
+import repository as repo
+from timings import percentile
+
+
+FILLER_PARAMS = {'iterations': 1000}    # kirmaydigan o'quvchilar uchun
+SCAN_FOR_LOGIN = repo.UsersRepository.FIND_FOR_LOGIN.replace('FROM users', 'FROM users NOT INDEXED')
+
+
+def populate(students, burst):
+    """O'quvchilarni yaratish; birinchi burst tasi joriy narxdagi xesh bilan"""
+    filler_hash, filler_salt = passwords.hash_password('filler', params=FILLER_PARAMS)
+    with database.db_session() as conn:
+        rows = []
+        for i in range(students):
+            if i < burst:
+                parol_hash, salt = passwords.hash_password(f'parol{i}')
+            else:
+                parol_hash, salt = filler_hash, filler_salt
+            rows.append((f"O'quvchi {i}", f'student{i}', parol_hash, salt, 'student'))
+        repo.users.add_many(rows, conn=conn)
+
+
+def burst_once(burst, fn):
+    """burst ta oqimda fn(i) ni bir vaqtda boshlash; har birining vaqti (ms)"""
+    barrier = threading.Barrier(burst)
+
+    def run(i):
+        barrier.wait()
+        t0 = time.perf_counter()
+        fn(i)
+        return (time.perf_counter() - t0) * 1000
+
+    with ThreadPoolExecutor(max_workers=burst) as executor:
+        return list(executor.map(run, range(burst)))
+
+
+def login(i):
+    user, error = auth.authenticate(f'student{i}', f'parol{i}', 'student')
+    if error:
+        raise RuntimeError(error)
+
+
+def lookup(i):
+    repo.users.find_for_login(f'student{i}', 'student')
+
+
+def query_plan():
+    with database.db_session() as conn:
+        rows = conn.execute("EXPLAIN QUERY PLAN " + repo.users.FIND_FOR_LOGIN, ('student0', 'student'))
+        return '; '.join(row[3] for row in rows)
+
+
+def scenario(name, burst, rounds, prepare):
+    login_ms, lookup_ms = [], []
+    for _ in range(rounds):
+        prepare()
+        lookup_ms += burst_once(burst, lookup)
+        prepare()
+        login_ms += burst_once(burst, login)
+    print(f"{name:<9} kirish  p50 {percentile(login_ms, 50):7.1f}  p95 {percentile(login_ms, 95):7.1f}  "
+          f"max {max(login_ms):7.1f} ms | qidirish p50 {percentile(lookup_ms, 50):6.2f}  "
+          f"p95 {percentile(lookup_ms, 95):6.2f} ms")
+    print(f"{'':<9} reja: {query_plan()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.login', description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--burst', type=int, default=passwords.BURST_SIZE)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--pool-size', type=int, default=database.POOL_SIZE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure_pool(os.path.join(tmp, 'bench.db'), size=args.pool_size)
+        database.init_db()
+        repo.users.invalidate()
+        populate(args.students, args.burst)
+
+        print(f"{args.students} o'quvchi, bir vaqtda {args.burst} ta kirish, {args.rounds} marta; "
+              f"{passwords.ALGORITHM} {passwords.current_params()} "
+              f"(bitta xesh {passwords.measure():.0f} ms), hovuz {args.pool_size}")
+        roster = [f'student{i}' for i in range(args.burst)]
+        scenario('cold', args.burst, args.rounds, repo.users.invalidate)
+        scenario('warm', args.burst, args.rounds, lambda: repo.users.prefetch(roster))
+        repo.users.FIND_FOR_LOGIN = SCAN_FOR_LOGIN
+        try:
+            scenario('scan', args.burst, args.rounds, repo.users.invalidate)
+        finally:
+            del repo.users.FIND_FOR_LOGIN
+        database.get_pool().close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Imtihon oxiridagi bir vaqtdagi natija topshirishlarni o'lchash.
+
+    python -m benchmarks.submissions --clients 500 --rounds 3
+
+Vaqtinchalik bazada --clients ta o'quvchi va har bir raund uchun ikkita yangi
+test yaratiladi, keyin --clients ta oqim bir vaqtda natija topshiradi:
+
+    direct  - har bir o'quvchi o'z ulanishi va tranzaksiyasi bilan
+              (grading.engine.persist). Laboratoriyadagi alohida kompyuterlar
+              kabi --processes ta jarayonga bo'lingan, ulanishlar oldindan ochiladi
+    queue   - bitta jarayonda submissions.SubmissionQueue: jurnal + guruhli
+              commit (server rejimi yoki bitta kompyuterdagi ko'p oyna)
+
+Har biri uchun javob vaqti (direct - commitgacha, queue - jurnalga yozilguncha)
+p50 / p95 / max, hammasi bazaga tushguncha ketgan vaqt, soniyasiga natijalar
+va xatolar (masalan, "database is locked") soni chiqariladi.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import database
+import grading
+import passwords
+import repository as repo
+import submissions
+from timings import percentile
+
+
+FILLER_PARAMS = {'iterations': 1000}
+
+
+def populate(clients):
+    parol_hash, salt = passwords.hash_password('parol', params=FILLER_PARAMS)
+    with database.db_session() as conn:
+        repo.users.add_many([("O'qituvchi", 'teacher', parol_hash, salt, 'teacher')], conn=conn)
+        repo.users.add_many([(f"O'quvchi {i}", f'student{i}', parol_hash, salt, 'student')
+                             for i in range(clients)], conn=conn)
+        teacher_id = conn.execute("SELECT id FROM users WHERE login = 'teacher'").fetchone()[0]
+        student_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'student' ORDER BY id")]
+    return teacher_id, student_ids
+
+
+def new_test(teacher_id, questions, rng):
+    with database.db_session() as conn:
+        test_id = repo.tests.create("Imtihon", teacher_id, questions, conn=conn)
+        repo.questions.add_many([(test_id, f"{n + 1}-savol", 'A', 'B', 'C', 'D', rng.choice('ABCD'))
+                                 for n in range(questions)], conn=conn)
+    return grading.load_test(test_id)
+
+
+def burst(student_ids, fn):
+    """Hamma oqim bir vaqtda fn(student_id) ni boshlaydi; (vaqtlar ms, xatolar)"""
+    barrier = threading.Barrier(len(student_ids))
+    errors = []
+
+    def run(student_id):
+        barrier.wait()
+        t0 = time.perf_counter()
+        try:
+            fn(student_id)
+        except Exception as error:
+            errors.append(error)
+        return (time.perf_counter() - t0) * 1000
+
+    with ThreadPoolExecutor(max_workers=len(student_ids)) as executor:
+        return list(executor.map(run, student_ids)), errors
+
+
+def report(name, timings, errors, total_s, count):
+    print(f"{name:<7} javob p50 {percentile(timings, 50):8.1f}  p95 {percentile(timings, 95):8.1f}  "
+          f"max {max(timings):8.1f} ms | hammasi {total_s * 1000:8.1f} ms, "
+          f"{count / total_s:7.0f} natija/s | xato {len(errors)}")
+    for message in sorted({str(error) for error in errors})[:3]:
+        print(f"        {message}")
+
+
+def direct_worker(db_path, timeout, grades, start_at):
+    """Alohida jarayon: o'z ulanishlarini ochib, start_at da hamma bilan birga topshirish"""
+    database.configure_pool(db_path, size=len(grades), timeout=timeout)
+    pool = database.get_pool()
+    connections = [pool.acquire() for _ in grades]
+    for conn in connections:
+        pool.release(conn)
+    time.sleep(max(0.0, start_at - time.time()))
+    by_student = dict(grades)
+    timings, errors = burst(list(by_student),
+                            lambda student_id: grading.engine.persist(student_id, by_student[student_id]))
+    finished = time.time()
+    pool.close()
+    return timings, [str(error) for error in errors], finished
+
+
+def run_direct(student_ids, test, rng, processes, db_path, timeout):
+    grades = [(student_id, grading.engine.score(test, rng.choices('ABCD', k=test.total))) for student_id in student_ids]
+    shares = [grades[i::processes] for i in range(processes)]
+    start_at = time.time() + 3     # jarayonlar ishga tushib, ulanishlarini ochib olsin
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as executor:
+        outcomes = list(executor.map(direct_worker, [db_path] * processes, [timeout] * processes,
+                                     shares, [start_at] * processes))
+    timings = [ms for outcome in outcomes for ms in outcome[0]]
+    errors = [error for outcome in outcomes for error in outcome[1]]
+    total_s = max(outcome[2] for outcome in outcomes) - start_at
+    report('direct', timings, errors, total_s, len(student_ids) - len(errors))
+
+
+def run_queue(student_ids, test, rng, journal):
+    grades = {student_id: grading.engine.score(test, rng.choices('ABCD', k=test.total)) for student_id in student_ids}
+    queue = submissions.SubmissionQueue(journal)
+    accepted = []
+    t0 = time.perf_counter()
+    timings, errors = burst(student_ids, lambda student_id: accepted.append(queue.submit(student_id, grades[student_id])))
+    for submission in accepted:
+        submission.committed.result()
+    total_s = time.perf_counter() - t0
+    queue.close()
+    report('queue', timings, errors, total_s, len(accepted))
+    print(f"        {queue.batches} ta tranzaksiya")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.submissions', description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--questions', type=int, default=30)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--processes', type=int, default=20, help="direct holati uchun jarayonlar")
+    parser.add_argument('--timeout', type=float, default=database.BUSY_TIMEOUT,
+                        help="SQLite busy timeout, sekund (direct holatidagi kutish chegarasi)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        database.configure_pool(db_path, timeout=args.timeout)
+        database.init_db()
+        teacher_id, student_ids = populate(args.clients)
+        print(f"{args.clients} ta bir vaqtdagi topshirish, {args.questions} savol, {args.rounds} marta")
+        for _ in range(args.rounds):
+            run_direct(student_ids, new_test(teacher_id, args.questions, rng), rng,
+                       min(args.processes, args.clients), db_path, args.timeout)
+            run_queue(student_ids, new_test(teacher_id, args.questions, rng), rng, os.path.join(tmp, 'journal'))
+        database.get_pool().close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
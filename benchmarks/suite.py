@@ -0,0 +1,141 @@
+"""Ilovadagi amallarning aynan o'sha so'rovlari.
+
+Har bir o'lchov GUI ishlatadigan funksiyani chaqiradi:
+
+    login                   auth.authenticate (kesh bo'sh)
+    login_lookup            repo.users.find_for_login (kesh bo'sh, xeshlashsiz)
+    student_panel           repo.tests.available_for_student, birinchi sahifa (kesh bo'sh)
+    start_test              grading.load_test
+    finish_test             grading.engine.score + persist (to'g'ridan-to'g'ri tranzaksiya)
+    finish_test_queue       client.LocalBackend.submit: jurnal + guruhli commit (ilovadagi yo'l)
+    teacher_results         TeacherResultsPanel.show_results: jami soni (test_stats) + birinchi sahifa
+    teacher_results_search  birinchi sahifa, o'quvchi ismi bo'yicha filtr bilan (sanalmaydi)
+    teacher_stats           repo.stats.for_teacher_tests
+    export_xlsx, export_csv exporters.export_results (butun natijalar)
+"""
+import os
+import random
+from dataclasses import dataclass, field
+
+import auth
+import client
+import exporters
+import grading
+import repository as repo
+import submissions
+from database import db_session
+from repository import ResultFilter
+
+from benchmarks import datagen
+
+
+@dataclass
+class Benchmark:
+    name: str
+    fn: object
+    setup: object = None
+    heavy: bool = False     # sekin amal: --heavy-repeat marta takrorlanadi
+    max_repeat: int = None
+
+
+@dataclass
+class Context:
+    workdir: str
+    seed: int = 1
+    teacher_id: int = None
+    student_ids: list = field(default_factory=list)
+    test_ids: list = field(default_factory=list)
+    submissions: object = None
+
+    def close(self):
+        if self.submissions is not None:
+            self.submissions.close()
+
+
+def prepare(ctx):
+    """Bazadan o'lchovlar uchun kerakli id larni olish va finish_test uchun yangi test yaratish"""
+    with db_session() as conn:
+        row = conn.execute('''
+        SELECT t.oqituvchi_id FROM results r JOIN tests t ON t.id = r.test_id
+        GROUP BY t.oqituvchi_id ORDER BY COUNT(*) DESC LIMIT 1
+        ''').fetchone()
+        if row is None:
+            raise ValueError("bazada natijalar yo'q - o'lchash uchun to'ldirilgan baza kerak "
+                             "(python -m benchmarks generate)")
+        ctx.teacher_id = row[0]
+        ctx.student_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'student' ORDER BY id")]
+        ctx.test_ids = [row[0] for row in conn.execute("SELECT id FROM tests ORDER BY id")]
+
+        # Hech kim ishlamagan testlar: har bir finish_test boshqa o'quvchi nomidan yoziladi
+        ctx.fresh_test_id = copy_test(conn, ctx.test_ids[0], ctx.teacher_id)
+        ctx.queue_test_id = copy_test(conn, ctx.test_ids[0], ctx.teacher_id)
+    ctx.fresh_test = grading.load_test(ctx.fresh_test_id)
+    ctx.queue_test = grading.load_test(ctx.queue_test_id)
+    ctx.submissions = submissions.SubmissionQueue(journal_dir=os.path.join(ctx.workdir, 'journal'))
+
+
+def copy_test(conn, source, teacher_id):
+    test_id = repo.tests.create("Benchmark testi", teacher_id, 0, conn=conn)
+    conn.execute('''
+    INSERT INTO questions (test_id, savol_matni, variant_a, variant_b, variant_c, variant_d, togri_javob)
+    SELECT ?, savol_matni, variant_a, variant_b, variant_c, variant_d, togri_javob
+    FROM questions WHERE test_id = ? ORDER BY id
+    ''', (test_id, source))
+    repo.tests.refresh_question_count(test_id, conn=conn)
+    return test_id
+
+
+def benchmarks(ctx):
+    rng = random.Random(ctx.seed)
+    bench_logins = min(datagen.BENCH_LOGINS, len(ctx.student_ids))
+    pick_student = lambda i: ctx.student_ids[i % len(ctx.student_ids)]
+
+    def login(i):
+        user, error = auth.authenticate(f'student{i % bench_logins}', datagen.BENCH_PASSWORD, 'student')
+        if error:
+            raise RuntimeError(error)
+
+    def student_panel_setup(i):
+        repo.tests.invalidate_available(pick_student(i))
+
+    def finish_test(i):
+        # Manfiy i (qizdirish) ro'yxat oxiridan oladi - takrorlanmaydi
+        student_id = ctx.student_ids[i]
+        answers = [rng.choice('ABCD') for _ in range(ctx.fresh_test.total)]
+        grade = grading.engine.score(ctx.fresh_test, answers)
+        grading.engine.persist(student_id, grade)
+
+    backend = client.LocalBackend(ctx.submissions)
+
+    def finish_test_queue(i):
+        # Ilovadagidek: jurnalga fsync, keyin guruhli commit natijasi kutiladi
+        answers = [rng.choice('ABCD') for _ in range(ctx.queue_test.total)]
+        backend.submit(ctx.student_ids[i], ctx.queue_test, answers)
+
+    def teacher_results(filters):
+        def run(i):
+            if filters is None or filters.countable():
+                repo.results.count_for_teacher(ctx.teacher_id, filters)
+            repo.results.page_for_teacher(ctx.teacher_id, filters, limit=repo.results.PAGE_SIZE)
+        return run
+
+    def export(extension):
+        path = os.path.join(ctx.workdir, 'export' + extension)
+        return lambda i: exporters.export_results(path, ctx.teacher_id)
+
+    return [
+        # Parol xeshlash qasddan sekin (passwords.calibrate), shuning uchun kamroq takrorlanadi
+        Benchmark('login', login, lambda i: repo.users.invalidate(), max_repeat=50),
+        Benchmark('login_lookup', lambda i: repo.users.find_for_login(f'student{i % bench_logins}', 'student'),
+                  lambda i: repo.users.invalidate()),
+        Benchmark('student_panel', lambda i: repo.tests.available_for_student(pick_student(i)), student_panel_setup),
+        Benchmark('start_test', lambda i: grading.load_test(rng.choice(ctx.test_ids))),
+        # Har bir o'quvchi testni bir marta ishlaydi
+        Benchmark('finish_test', finish_test, max_repeat=len(ctx.student_ids) // 2),
+        Benchmark('finish_test_queue', finish_test_queue, max_repeat=len(ctx.student_ids) // 2),
+        Benchmark('teacher_results', teacher_results(None)),
+        Benchmark('teacher_results_search', teacher_results(ResultFilter(ism=datagen.LAST_NAMES[0]))),
+        Benchmark('teacher_stats', lambda i: repo.stats.for_teacher_tests(ctx.teacher_id)),
+        Benchmark('export_xlsx', export('.xlsx'), heavy=True),
+        Benchmark('export_csv', export('.csv'), heavy=True),
+    ]
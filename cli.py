@@ -0,0 +1,196 @@
+"""Tkinter'siz ommaviy amallar (displeysiz serverlarda, rejalashtirilgan vazifalar uchun).
+
+    python -m cli students import oquvchilar.csv
+    python -m cli tests import "Matematika 9" savollar.xlsx --teacher admin
+    python -m cli results export natijalar.parquet --teacher admin --passed
+    python -m cli stats --teacher admin --students
+    python -m cli regrade --test 12
+    python -m cli regrade --question 345 --answer B
+    python -m cli passwords calibrate --budget-ms 1000 --burst 40
+
+Baza yo'li: --db yoki EDU_DB_PATH. Xatolikda 1 kodi bilan chiqadi.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+import database
+import exporters
+import grading
+import importers
+import passwords
+import repository as repo
+from repository import ResultFilter
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def teacher_id(login):
+    user = repo.users.find_for_login(login, 'teacher')
+    if user is None:
+        raise LookupError(f"O'qituvchi topilmadi: {login}")
+    return user[0]
+
+
+def cmd_students_import(args):
+    def progress(report):
+        if args.verbose:
+            log(f"  {report.processed} ta qator, {report.added} ta qo'shildi")
+
+    report = importers.enroll_students(args.file, args.batch_size, args.workers, progress)
+    for line, login in report.duplicates:
+        log(f"{line}-qator: login band: {login}")
+    for line, message in report.errors:
+        log(message)
+    log(f"{report.added} ta o'quvchi qo'shildi, {len(report.duplicates)} ta login band, "
+        f"{len(report.errors)} ta qator noto'g'ri")
+
+
+def cmd_tests_import(args):
+    test_id, count = importers.create_test_from_file(args.name, teacher_id(args.teacher), args.file, args.batch_size)
+    log(f"Test yaratildi (id={test_id}), {count} ta savol")
+
+
+def cmd_results_export(args):
+    filters = ResultFilter(
+        otganmi=True if args.passed else False if args.failed else None,
+        test_nomi=args.test,
+        ism=args.student,
+        min_foiz=args.min_foiz,
+    )
+
+    def progress(done, total):
+        if args.verbose:
+            log(f"  {done}/{total}")
+
+    count = exporters.export_results(args.file, teacher_id(args.teacher), filters, args.format, progress)
+    log(f"{count} ta natija saqlandi: {args.file}")
+
+
+def cmd_stats(args):
+    owner = teacher_id(args.teacher)
+    if args.students:
+        rows, title = repo.stats.for_teacher_students(owner), "O'quvchi"
+    else:
+        rows, title = repo.stats.for_teacher_tests(owner), "Test"
+    print("{:<30} {:>8} {:>8} {:>8} {:>9} {:>7} {:>7}".format(
+        title, "Urinish", "O'tgan", "O'tish", "O'rtacha", "Min", "Max"))
+    for _, name, urinishlar, otganlar, ortacha, foiz_min, foiz_max in rows:
+        print(f"{name[:30]:<30} {urinishlar:>8} {otganlar:>8} {otganlar / urinishlar * 100:>7.1f}% "
+              f"{ortacha:>8.1f}% {foiz_min:>6.1f}% {foiz_max:>6.1f}%")
+
+
+def cmd_regrade(args):
+    engine = grading.GradingEngine(args.threshold) if args.threshold is not None else grading.engine
+
+    def progress(report):
+        if args.verbose:
+            log(f"  {report.checked} ta tekshirildi, {report.changed} ta o'zgardi")
+
+    if args.question is not None:
+        if not args.answer:
+            raise ValueError("--question bilan --answer ham berilishi kerak")
+        report = engine.fix_answer(args.question, args.answer, args.chunk_size, progress)
+    else:
+        report = engine.regrade_test(args.test, args.chunk_size, progress)
+    log(f"Test {report.test_id}: {report.checked} ta urinish qayta baholandi, "
+        f"{report.changed} tasi o'zgardi, {report.skipped} tasida javoblar saqlanmagan")
+
+
+def cmd_passwords_calibrate(args):
+    algorithm = args.algorithm or passwords.ALGORITHM
+    log(f"Joriy: {algorithm} {passwords.current_params(algorithm)}, "
+        f"bitta xesh {passwords.measure(algorithm):.0f} ms")
+    params, hash_ms, worst_ms = passwords.calibrate(args.budget_ms, args.burst, args.workers, algorithm)
+    log(f"Tavsiya: {params} - bitta xesh {hash_ms:.0f} ms, "
+        f"{args.burst} ta bir vaqtdagi kirishda eng sekini ~{worst_ms:.0f} ms")
+    # Muhit o'zgaruvchilari stdout ga: `eval $(python -m cli passwords calibrate)` uchun
+    print(f"export EDU_PASSWORD_ALGORITHM={algorithm}")
+    if algorithm == 'pbkdf2_sha256':
+        print(f"export EDU_PBKDF2_ITERATIONS={params['iterations']}")
+    else:
+        print(f"export EDU_SCRYPT_N={params['n']}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m cli', description="Edu Evaluation - ommaviy amallar")
+    parser.add_argument('--db', help="mavjud baza fayli (standart: EDU_DB_PATH yoki edu_evaluation.db)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="jarayonni ko'rsatish")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    students = commands.add_parser('students', help="o'quvchilar").add_subparsers(dest='action', required=True)
+    p = students.add_parser('import', help="CSV/XLSX dan o'quvchilar qo'shish (ustunlar: ism, login, parol)")
+    p.add_argument('file')
+    p.add_argument('--batch-size', type=int, default=importers.BATCH_SIZE)
+    p.add_argument('--workers', type=int, help="parol xeshlash jarayonlari (standart: CPU soni)")
+    p.set_defaults(func=cmd_students_import)
+
+    tests = commands.add_parser('tests', help="testlar").add_subparsers(dest='action', required=True)
+    p = tests.add_parser('import', help="CSV/XLSX savollar bankidan yangi test yaratish")
+    p.add_argument('name')
+    p.add_argument('file')
+    p.add_argument('--teacher', default='admin', help="o'qituvchi logini")
+    p.add_argument('--batch-size', type=int, default=importers.BATCH_SIZE)
+    p.set_defaults(func=cmd_tests_import)
+
+    results = commands.add_parser('results', help="natijalar").add_subparsers(dest='action', required=True)
+    p = results.add_parser('export', help="natijalarni CSV / XLSX / Parquet ga eksport qilish")
+    p.add_argument('file')
+    p.add_argument('--format', choices=[ext.lstrip('.') for ext in exporters.BACKENDS],
+                   help="standart: fayl kengaytmasidan")
+    p.add_argument('--teacher', default='admin', help="o'qituvchi logini")
+    holat = p.add_mutually_exclusive_group()
+    holat.add_argument('--passed', action='store_true', help="faqat o'tganlar")
+    holat.add_argument('--failed', action='store_true', help="faqat o'tolmaganlar")
+    p.add_argument('--test', help="test nomi (aniq)")
+    p.add_argument('--student', help="o'quvchi ismi (qisman)")
+    p.add_argument('--min-foiz', type=float)
+    p.set_defaults(func=cmd_results_export)
+
+    p = commands.add_parser('stats', help="testlar yoki o'quvchilar bo'yicha statistika")
+    p.add_argument('--teacher', default='admin', help="o'qituvchi logini")
+    p.add_argument('--students', action='store_true', help="o'quvchilar bo'yicha")
+    p.set_defaults(func=cmd_stats)
+
+    p = commands.add_parser('regrade', help="joriy javob kaliti bo'yicha qayta baholash")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument('--test', type=int, help="test id")
+    target.add_argument('--question', type=int, help="savol id (--answer bilan: kalitni tuzatib qayta baholash)")
+    p.add_argument('--answer', help="yangi to'g'ri javob (A/B/C/D)")
+    p.add_argument('--threshold', type=float, help=f"o'tish chegarasi, foiz (standart {grading.PASS_THRESHOLD:g})")
+    p.add_argument('--chunk-size', type=int, default=grading.REGRADE_CHUNK)
+    p.set_defaults(func=cmd_regrade)
+
+    pw = commands.add_parser('passwords', help="parol xeshlash").add_subparsers(dest='action', required=True)
+    p = pw.add_parser('calibrate', help="kirish vaqti byudjetiga mos xeshlash narxini tanlash")
+    p.add_argument('--algorithm', choices=sorted(passwords.HASHERS))
+    p.add_argument('--budget-ms', type=float, default=passwords.LOGIN_BUDGET_MS,
+                   help="bir vaqtdagi kirishlarda eng sekin javob, ms")
+    p.add_argument('--burst', type=int, default=passwords.BURST_SIZE, help="bir vaqtda kiradiganlar soni")
+    p.add_argument('--workers', type=int, help="xeshlashga ajratilgan yadrolar (standart: CPU soni)")
+    p.set_defaults(func=cmd_passwords_calibrate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.db:
+        # Xato yozilgan yo'l yangi bo'sh baza (admin bilan) yaratib, importni unga qilmasin
+        if not os.path.isfile(args.db):
+            log(f"Xatolik: baza fayli topilmadi: {args.db}")
+            return 1
+        database.configure_pool(args.db)
+    try:
+        database.init_db()
+        args.func(args)
+    except (ValueError, LookupError, OSError, RuntimeError, sqlite3.Error) as error:
+        log(f"Xatolik: {error}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
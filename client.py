@@ -0,0 +1,170 @@
+"""O'quvchi oynalari uchun ma'lumot manbai: bazaning o'zi yoki imtihon serveri (server.py).
+
+    python version2.py                                  # baza fayliga to'g'ridan-to'g'ri
+    python version2.py --server http://10.0.0.5:8765    # yoki EDU_API_URL=...
+
+Ikkala manba bir xil metodlarga ega va bir xil ko'rinishdagi qiymatlarni
+qaytaradi, shuning uchun oynalar qaysi biri ishlatilayotganini bilmaydi.
+Server rejimida baholash serverda bo'ladi: javob kaliti mijozga kelmaydi.
+"""
+import http.client
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+
+import auth
+import grading
+import repository as repo
+import submissions
+
+
+API_TIMEOUT = 30    # sekund
+
+
+class ApiError(RuntimeError):
+    """Server so'rovni bajarmadi (xato matni serverdan)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LocalBackend:
+    """Baza fayli bilan ishlash (avvalgidek)"""
+
+    def __init__(self, submission_queue=None):
+        self.submission_queue = submission_queue    # berilmasa - umumiy navbat (submissions.get_queue)
+
+    def authenticate(self, login, password, role):
+        return auth.authenticate(login, password, role)
+
+    def logout(self):
+        pass
+
+    def available_for_student(self, student_id, after_id=0):
+        return repo.tests.available_for_student(student_id, after_id)
+
+    def load_test(self, test_id):
+        return grading.load_test(test_id)
+
+    def submit(self, student_id, test, answers):
+        """Baholash va natijani saqlash; Grade qaytaradi.
+
+        Natija avval jurnalga yoziladi (submissions), bazaga esa boshqa
+        o'quvchilarnikilar bilan bitta tranzaksiyada tushadi. Commit natijasi
+        kutiladi: takroriy urinish yoki yozilmay qolgani o'quvchiga aytiladi
+        (submissions.NotCommittedError).
+        """
+        grade = grading.engine.score(test, answers)
+        submission = (self.submission_queue or submissions.get_queue()).submit(student_id, grade)
+        result_id = submission.committed.result()   # qayta urinishlar soni cheklangan
+        if result_id is None:
+            raise ValueError("Bu testni allaqachon ishlagansiz")
+        return grade
+
+    def results_for_student(self, student_id):
+        return repo.results.for_student(student_id)
+
+
+class ApiBackend:
+    """Imtihon serveri orqali ishlash. Har bir fon oqimi o'z keep-alive ulanishini ishlatadi."""
+
+    def __init__(self, base_url, timeout=API_TIMEOUT):
+        url = urlsplit(base_url)
+        if url.scheme != 'http' or not url.hostname:
+            raise ValueError(f"Server manzili http://host:port ko'rinishida bo'lishi kerak: {base_url}")
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.timeout = timeout
+        self.token = None
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        for attempt in (1, 2):
+            conn = self._connection()
+            sent = False
+            try:
+                conn.request(method, path, body, headers)
+                sent = True
+                response = conn.getresponse()
+                data = json.loads(response.read() or b'null')
+                break
+            except (http.client.HTTPException, ConnectionError) as error:
+                conn.close()
+                self._local.conn = None
+                # Server yopgan eski keep-alive ulanish - bir marta qayta ulanamiz. Yuborilgan
+                # POST ni takrorlamaymiz: server uni bajargan bo'lishi mumkin (natija ikki marta)
+                if attempt == 2 or (sent and method != 'GET'):
+                    raise ConnectionError(f"Serverga ulanib bo'lmadi: {error}") from error
+            except OSError as error:
+                conn.close()
+                self._local.conn = None
+                raise ConnectionError(f"Serverga ulanib bo'lmadi: {error}") from error
+        if response.status != 200:
+            raise ApiError(response.status, (data or {}).get('error', f"HTTP {response.status}"))
+        return data
+
+    def authenticate(self, login, password, role):
+        try:
+            data = self.request('POST', '/api/login', {'login': login, 'password': password, 'role': role})
+        except ApiError as error:
+            if error.status in (401, 403):
+                return None, str(error)
+            raise
+        self.token = data['token']
+        return data['user'], None
+
+    def logout(self):
+        """Tokenni serverda bekor qilish; server javob bermasa ham token unutiladi"""
+        if self.token is None:
+            return
+        try:
+            self.request('POST', '/api/logout')
+        except (ApiError, ConnectionError):
+            pass
+        self.token = None
+
+    def available_for_student(self, student_id, after_id=0):
+        data = self.request('GET', f'/api/tests?after_id={int(after_id)}')
+        return [tuple(row) for row in data['tests']]
+
+    def load_test(self, test_id):
+        try:
+            data = self.request('GET', f'/api/tests/{int(test_id)}')
+        except ApiError as error:
+            if error.status == 404:
+                return grading.LoadedTest(test_id, [], '')
+            raise
+        return grading.LoadedTest(data['id'], [tuple(q) for q in data['questions']], answer_key='')
+
+    def submit(self, student_id, test, answers):
+        data = self.request('POST', f'/api/tests/{int(test.id)}/submit', {'answers': list(answers)})
+        return grading.Grade(data['test_id'], data['correct'], data['total'], data['percentage'], data['passed'])
+
+    def results_for_student(self, student_id):
+        return [tuple(row) for row in self.request('GET', '/api/results')['results']]
+
+
+def server_url(argv):
+    """--server URL yoki EDU_API_URL; berilmagan bo'lsa None"""
+    if '--server' in argv:
+        index = argv.index('--server') + 1
+        if index < len(argv):
+            return argv[index]
+    return os.environ.get('EDU_API_URL') or None
+
+
+def backend_for(argv):
+    url = server_url(argv)
+    return ApiBackend(url) if url else LocalBackend()
@@ -0,0 +1,576 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import passwords
+import querylog
+
+
+# ==================== SOZLAMALAR ====================
+DB_PATH = os.environ.get('EDU_DB_PATH', 'edu_evaluation.db')
+POOL_SIZE = int(os.environ.get('EDU_DB_POOL_SIZE', '5'))
+BUSY_TIMEOUT = 10       # sekund: bazaning qulfi bo'shashini kutish
+ACQUIRE_TIMEOUT = 30    # sekund: hovuzdan bo'sh ulanish kutish
+STATEMENT_CACHE_SIZE = 256  # har bir ulanishdagi tayyorlangan so'rovlar keshi
+
+
+class PoolExhaustedError(sqlite3.OperationalError):
+    """Hovuzda belgilangan vaqt ichida bo'sh ulanish topilmadi"""
+
+
+class ConnectionPool:
+    """SQLite ulanishlari hovuzi.
+
+    Ulanishlar bir marta ochiladi, PRAGMA sozlamalari faqat ochilganda
+    qo'llanadi va keyin ulanish qayta-qayta ishlatiladi. Har bir berishdan
+    oldin ulanish sog'lomligi tekshiriladi, buzilgani yangisiga almashtiriladi.
+    """
+
+    def __init__(self, db_path=DB_PATH, size=POOL_SIZE, timeout=BUSY_TIMEOUT):
+        if size < 1:
+            raise ValueError("Hovuz hajmi kamida 1 bo'lishi kerak")
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            factory=querylog.connection_factory(),
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    @staticmethod
+    def is_healthy(conn):
+        """Ulanish hali ishlayotganini tekshirish"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        """Hovuzdan ulanish olish (kerak bo'lsa yangisini ochish)"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Ulanishlar hovuzi yopilgan")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                conn = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise PoolExhaustedError(f"{timeout} sekund ichida bo'sh ulanish topilmadi") from None
+
+        if not self.is_healthy(conn):
+            self._discard(conn)
+            with self._lock:
+                self._created += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return conn
+
+    def release(self, conn):
+        """Ulanishni hovuzga qaytarish"""
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._discard(conn)
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """Ulanishni olib, ish tugagach hovuzga qaytaruvchi context manager"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Barcha bo'sh ulanishlarni yopish"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(db_path=None, size=None, timeout=None):
+    """Umumiy hovuzni yangi sozlamalar bilan qayta yaratish"""
+    global _pool
+    with _pool_lock:
+        old = _pool
+        _pool = ConnectionPool(
+            db_path or (old.db_path if old else DB_PATH),
+            size or (old.size if old else POOL_SIZE),
+            timeout or (old.timeout if old else BUSY_TIMEOUT),
+        )
+    if old is not None:
+        old.close()
+    return _pool
+
+
+def get_pool():
+    """Umumiy ulanishlar hovuzini olish"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+# ==================== DATABASE UTILITIES ====================
+# id(ulanish) -> commitdan keyin chaqiriladigan funksiyalar (ochiq db_session lar uchun)
+_commit_hooks = {}
+
+
+@contextmanager
+def db_session():
+    """Database transaktsiyalari uchun context manager"""
+    pool = get_pool()
+    conn = pool.acquire()
+    hooks = _commit_hooks[id(conn)] = []
+    try:
+        yield conn
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        del _commit_hooks[id(conn)]
+        pool.release(conn)
+    # Rollback bo'lsa chaqirilmaydi
+    for fn in hooks:
+        fn()
+
+
+def on_commit(conn, fn):
+    """fn ni conn ning db_session i commit qilingandan keyin chaqirish (masalan, keshni tozalash).
+
+    Ulanish db_session dan bo'lmasa yoki ochiq tranzaksiya bo'lmasa - darhol chaqiriladi.
+    """
+    hooks = _commit_hooks.get(id(conn))
+    if hooks is None or not conn.in_transaction:
+        fn()
+    else:
+        hooks.append(fn)
+
+
+# ==================== MIGRATSIYALAR ====================
+# O'quvchi ismi va test nomi bo'yicha qisman qidiruv uchun FTS5 trigram indekslari.
+# Tashqi kontentli jadvallar: matn users/tests da qoladi, triggerlar indeksni sinxron tutadi.
+SEARCH_INDEX_SQL = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS users_fts
+    USING fts5(ism, content='users', content_rowid='id', tokenize='trigram');
+
+CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+    INSERT INTO users_fts (rowid, ism) VALUES (new.id, new.ism);
+END;
+CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+    INSERT INTO users_fts (users_fts, rowid, ism) VALUES ('delete', old.id, old.ism);
+END;
+CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF ism ON users BEGIN
+    INSERT INTO users_fts (users_fts, rowid, ism) VALUES ('delete', old.id, old.ism);
+    INSERT INTO users_fts (rowid, ism) VALUES (new.id, new.ism);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tests_fts
+    USING fts5(nomi, content='tests', content_rowid='id', tokenize='trigram');
+
+CREATE TRIGGER IF NOT EXISTS tests_fts_ai AFTER INSERT ON tests BEGIN
+    INSERT INTO tests_fts (rowid, nomi) VALUES (new.id, new.nomi);
+END;
+CREATE TRIGGER IF NOT EXISTS tests_fts_ad AFTER DELETE ON tests BEGIN
+    INSERT INTO tests_fts (tests_fts, rowid, nomi) VALUES ('delete', old.id, old.nomi);
+END;
+CREATE TRIGGER IF NOT EXISTS tests_fts_au AFTER UPDATE OF nomi ON tests BEGIN
+    INSERT INTO tests_fts (tests_fts, rowid, nomi) VALUES ('delete', old.id, old.nomi);
+    INSERT INTO tests_fts (rowid, nomi) VALUES (new.id, new.nomi);
+END;
+
+-- Mavjud qatorlarni indeksga yuklash
+INSERT INTO users_fts (users_fts) VALUES ('rebuild');
+INSERT INTO tests_fts (tests_fts) VALUES ('rebuild');
+'''
+
+
+def trigram_supported():
+    """SQLite FTS5 trigram tokenizerini qo'llab-quvvatlaydimi (3.34+)"""
+    try:
+        probe = sqlite3.connect(':memory:')
+        try:
+            probe.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+        finally:
+            probe.close()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _create_search_index(conn):
+    # Eski SQLite'da indeks yaratilmaydi, qidiruv LIKE bilan ishlayveradi
+    if trigram_supported():
+        for statement in _split_sql(SEARCH_INDEX_SQL):
+            conn.execute(statement)
+
+
+# Test va o'quvchi bo'yicha yig'ma statistika: results ga yozilganda triggerlar
+# yangilaydi, shuning uchun o'qituvchi oynasi results ni qayta skanerlamaydi.
+# Gistogramma: foiz 10 lik oraliqlarga bo'linadi (0: 0-9, ..., 9: 90-100).
+STATS_SCHEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS test_stats (
+    test_id INTEGER PRIMARY KEY,
+    urinishlar INTEGER NOT NULL DEFAULT 0,
+    otganlar INTEGER NOT NULL DEFAULT 0,
+    foiz_yigindi REAL NOT NULL DEFAULT 0,
+    foiz_min REAL,
+    foiz_max REAL,
+    FOREIGN KEY (test_id) REFERENCES tests(id)
+);
+
+CREATE TABLE IF NOT EXISTS student_stats (
+    oqituvchi_id INTEGER NOT NULL,
+    oquvchi_id INTEGER NOT NULL,
+    urinishlar INTEGER NOT NULL DEFAULT 0,
+    otganlar INTEGER NOT NULL DEFAULT 0,
+    foiz_yigindi REAL NOT NULL DEFAULT 0,
+    foiz_min REAL,
+    foiz_max REAL,
+    PRIMARY KEY (oqituvchi_id, oquvchi_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS test_histogram (
+    test_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    soni INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (test_id, bucket)
+) WITHOUT ROWID;
+'''
+
+# Triggerlar uchun bo'laklar; ROW o'rniga old yoki new qo'yiladi
+_STATS_BUCKET = "min(CAST(ROW.foiz / 10 AS INTEGER), 9)"
+_STATS_TEACHER = "(SELECT oqituvchi_id FROM tests WHERE id = ROW.test_id)"
+
+_STATS_ADD = f'''
+    INSERT INTO test_stats (test_id, urinishlar, otganlar, foiz_yigindi, foiz_min, foiz_max)
+    VALUES (ROW.test_id, 1, ROW.otganmi != 0, ROW.foiz, ROW.foiz, ROW.foiz)
+    ON CONFLICT (test_id) DO UPDATE SET
+        urinishlar = urinishlar + 1,
+        otganlar = otganlar + excluded.otganlar,
+        foiz_yigindi = foiz_yigindi + excluded.foiz_yigindi,
+        foiz_min = min(coalesce(foiz_min, excluded.foiz_min), excluded.foiz_min),
+        foiz_max = max(coalesce(foiz_max, excluded.foiz_max), excluded.foiz_max);
+    INSERT INTO student_stats (oqituvchi_id, oquvchi_id, urinishlar, otganlar, foiz_yigindi, foiz_min, foiz_max)
+    VALUES ({_STATS_TEACHER}, ROW.oquvchi_id, 1, ROW.otganmi != 0, ROW.foiz, ROW.foiz, ROW.foiz)
+    ON CONFLICT (oqituvchi_id, oquvchi_id) DO UPDATE SET
+        urinishlar = urinishlar + 1,
+        otganlar = otganlar + excluded.otganlar,
+        foiz_yigindi = foiz_yigindi + excluded.foiz_yigindi,
+        foiz_min = min(coalesce(foiz_min, excluded.foiz_min), excluded.foiz_min),
+        foiz_max = max(coalesce(foiz_max, excluded.foiz_max), excluded.foiz_max);
+    INSERT INTO test_histogram (test_id, bucket, soni)
+    VALUES (ROW.test_id, {_STATS_BUCKET}, 1)
+    ON CONFLICT (test_id, bucket) DO UPDATE SET soni = soni + 1;
+'''
+
+_STATS_SUBTRACT = f'''
+    UPDATE test_stats SET
+        urinishlar = urinishlar - 1,
+        otganlar = otganlar - (ROW.otganmi != 0),
+        foiz_yigindi = foiz_yigindi - ROW.foiz
+    WHERE test_id = ROW.test_id;
+    UPDATE student_stats SET
+        urinishlar = urinishlar - 1,
+        otganlar = otganlar - (ROW.otganmi != 0),
+        foiz_yigindi = foiz_yigindi - ROW.foiz
+    WHERE oqituvchi_id = {_STATS_TEACHER} AND oquvchi_id = ROW.oquvchi_id;
+    UPDATE test_histogram SET soni = soni - 1
+    WHERE test_id = ROW.test_id AND bucket = {_STATS_BUCKET};
+'''
+
+# Olib tashlangan qiymat min/max bo'lgan bo'lsa, faqat o'sha test/o'quvchi qatorlaridan qayta hisoblash
+_STATS_FIX_RANGE = f'''
+    UPDATE test_stats SET
+        foiz_min = (SELECT min(foiz) FROM results WHERE test_id = ROW.test_id),
+        foiz_max = (SELECT max(foiz) FROM results WHERE test_id = ROW.test_id)
+    WHERE test_id = ROW.test_id AND (ROW.foiz <= foiz_min OR ROW.foiz >= foiz_max);
+    UPDATE student_stats SET
+        foiz_min = (SELECT min(r.foiz) FROM results r JOIN tests t ON t.id = r.test_id
+                    WHERE r.oquvchi_id = ROW.oquvchi_id AND t.oqituvchi_id = student_stats.oqituvchi_id),
+        foiz_max = (SELECT max(r.foiz) FROM results r JOIN tests t ON t.id = r.test_id
+                    WHERE r.oquvchi_id = ROW.oquvchi_id AND t.oqituvchi_id = student_stats.oqituvchi_id)
+    WHERE oqituvchi_id = {_STATS_TEACHER} AND oquvchi_id = ROW.oquvchi_id
+      AND (ROW.foiz <= foiz_min OR ROW.foiz >= foiz_max);
+'''
+
+STATS_TRIGGERS_SQL = (
+    "CREATE TRIGGER IF NOT EXISTS results_stats_ai AFTER INSERT ON results BEGIN"
+    + _STATS_ADD.replace('ROW.', 'new.') + "END;\n"
+    "CREATE TRIGGER IF NOT EXISTS results_stats_ad AFTER DELETE ON results BEGIN"
+    + _STATS_SUBTRACT.replace('ROW.', 'old.') + _STATS_FIX_RANGE.replace('ROW.', 'old.') + "END;\n"
+    "CREATE TRIGGER IF NOT EXISTS results_stats_au AFTER UPDATE OF foiz, otganmi, test_id, oquvchi_id ON results BEGIN"
+    + _STATS_SUBTRACT.replace('ROW.', 'old.') + _STATS_ADD.replace('ROW.', 'new.')
+    + _STATS_FIX_RANGE.replace('ROW.', 'old.') + "END;\n"
+)
+
+# Yig'ma jadvallarni results dan to'liq qayta qurish: 4-migratsiyada mavjud natijalar uchun.
+# Keyin ularni faqat triggerlar yuritadi (qayta baholash UPDATE lari ham shu orqali)
+STATS_REBUILD_SQL = f'''
+DELETE FROM test_stats;
+DELETE FROM student_stats;
+DELETE FROM test_histogram;
+
+INSERT INTO test_stats (test_id, urinishlar, otganlar, foiz_yigindi, foiz_min, foiz_max)
+SELECT test_id, count(*), sum(otganmi != 0), sum(foiz), min(foiz), max(foiz)
+FROM results GROUP BY test_id;
+
+INSERT INTO student_stats (oqituvchi_id, oquvchi_id, urinishlar, otganlar, foiz_yigindi, foiz_min, foiz_max)
+SELECT t.oqituvchi_id, r.oquvchi_id, count(*), sum(r.otganmi != 0), sum(r.foiz), min(r.foiz), max(r.foiz)
+FROM results r JOIN tests t ON t.id = r.test_id
+GROUP BY t.oqituvchi_id, r.oquvchi_id;
+
+INSERT INTO test_histogram (test_id, bucket, soni)
+SELECT test_id, {_STATS_BUCKET.replace('ROW.', '')} AS b, count(*)
+FROM results GROUP BY test_id, b;
+'''
+
+
+def rebuild_stats(conn):
+    for statement in _split_sql(STATS_REBUILD_SQL):
+        conn.execute(statement)
+
+
+def _create_stats_tables(conn):
+    for statement in _split_sql(STATS_SCHEMA_SQL + STATS_TRIGGERS_SQL):
+        conn.execute(statement)
+    rebuild_stats(conn)
+
+
+_fts_cache = {}
+
+
+def fts_enabled():
+    """Joriy bazada qidiruv indekslari (users_fts, tests_fts) bormi"""
+    db_path = get_pool().db_path
+    if db_path not in _fts_cache:
+        with db_session() as conn:
+            found = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'"
+            ).fetchone()
+        _fts_cache[db_path] = found is not None
+    return _fts_cache[db_path]
+
+
+# Har bir qadam: (versiya, tavsif, SQL skript yoki conn qabul qiluvchi funksiya).
+# Bazadagi PRAGMA user_version qaysi qadamlar bajarilganini bildiradi, shuning
+# uchun mavjud edu_evaluation.db fayllari joyida yangilanadi.
+MIGRATIONS = [
+    (1, "Bazaviy jadvallar", '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ism TEXT NOT NULL,
+        login TEXT UNIQUE NOT NULL,
+        parol_hash TEXT NOT NULL,
+        salt TEXT NOT NULL,
+        role TEXT NOT NULL CHECK (role IN ('teacher', 'student'))
+    );
+    
+    CREATE TABLE IF NOT EXISTS tests (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nomi TEXT NOT NULL,
+        oqituvchi_id INTEGER NOT NULL,
+        savollar_soni INTEGER DEFAULT 0,
+        FOREIGN KEY (oqituvchi_id) REFERENCES users(id)
+    );
+    
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        test_id INTEGER NOT NULL,
+        savol_matni TEXT NOT NULL,
+        variant_a TEXT NOT NULL,
+        variant_b TEXT NOT NULL,
+        variant_c TEXT NOT NULL,
+        variant_d TEXT NOT NULL,
+        togri_javob TEXT CHECK (togri_javob IN ('A', 'B', 'C', 'D')),
+        FOREIGN KEY (test_id) REFERENCES tests(id)
+    );
+    
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        oquvchi_id INTEGER NOT NULL,
+        test_id INTEGER NOT NULL,
+        togri_javoblar INTEGER NOT NULL,
+        foiz REAL NOT NULL,
+        otganmi BOOLEAN NOT NULL,
+        vaqt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (oquvchi_id) REFERENCES users(id),
+        FOREIGN KEY (test_id) REFERENCES tests(id)
+    );
+    
+    CREATE TABLE IF NOT EXISTS student_test_attempts (
+        oquvchi_id INTEGER NOT NULL,
+        test_id INTEGER NOT NULL,
+        PRIMARY KEY (oquvchi_id, test_id),
+        FOREIGN KEY (oquvchi_id) REFERENCES users(id),
+        FOREIGN KEY (test_id) REFERENCES tests(id)
+    );
+    '''),
+
+    (2, "Natijalar, savollar va urinishlar uchun indekslar", '''
+    -- start_test / finish_test: WHERE test_id = ? ORDER BY id
+    CREATE INDEX IF NOT EXISTS idx_questions_test ON questions (test_id);
+
+    -- O'qituvchi paneli: tests -> results (test_id bo'yicha), ustunlar indeksda
+    CREATE INDEX IF NOT EXISTS idx_tests_teacher ON tests (oqituvchi_id, nomi);
+    CREATE INDEX IF NOT EXISTS idx_results_test_cover
+        ON results (test_id, oquvchi_id, togri_javoblar, foiz, otganmi, vaqt);
+
+    -- O'quvchi natijalari: WHERE r.oquvchi_id = ?
+    CREATE INDEX IF NOT EXISTS idx_results_student_cover
+        ON results (oquvchi_id, test_id, togri_javoblar, foiz, otganmi, vaqt);
+
+    -- Test bo'yicha urinishlar (PRIMARY KEY oquvchi_id bo'yicha qidiruvni qoplaydi)
+    CREATE INDEX IF NOT EXISTS idx_attempts_test ON student_test_attempts (test_id, oquvchi_id);
+    '''),
+
+    (3, "Ism va test nomi bo'yicha FTS5 trigram qidiruv", _create_search_index),
+
+    (4, "Test va o'quvchi bo'yicha yig'ma statistika jadvallari", _create_stats_tables),
+
+    # Har bir savolga berilgan javob bitta satrda: "AC BD..." (bo'sh joy - javob berilmagan),
+    # savollar id tartibida. Kalit tuzatilganda natijalarni qayta baholash uchun kerak.
+    (5, "Natijalarda o'quvchi javoblarini saqlash", '''
+    ALTER TABLE results ADD COLUMN javoblar TEXT;
+    '''),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Bazaning joriy sxema versiyasi"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Bajarilmagan migratsiyalarni ketma-ket, har birini alohida tranzaksiyada qo'llash"""
+    current = get_schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Baza versiyasi ({current}) dastur versiyasidan ({SCHEMA_VERSION}) yangiroq"
+        )
+
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        if conn.in_transaction:
+            conn.commit()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Bir vaqtda ishga tushgan boshqa jarayon yozish qulfini bizdan oldin
+            # olib, shu qadamni bajarib bo'lgan bo'lishi mumkin
+            current = get_schema_version(conn)
+            if version <= current:
+                conn.commit()
+                continue
+            if callable(step):
+                step(conn)
+            else:
+                for statement in _split_sql(step):
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = version
+    _fts_cache.clear()
+    return current
+
+
+def _split_sql(script):
+    """SQL skriptni alohida buyruqlarga ajratish (executescript tranzaksiyani yopib qo'yadi)"""
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        if line.strip().startswith('--'):
+            continue
+        statement += line
+        if sqlite3.complete_statement(statement):
+            if statement.strip():
+                yield statement.strip()
+            statement = ''
+    if statement.strip():
+        raise sqlite3.ProgrammingError(f"Tugallanmagan SQL: {statement.strip()[:60]}")
+
+
+# 1. Ma'lumotlar Bazasini Sozlash
+def init_db():
+    with db_session() as conn:
+        migrate(conn)
+        cursor = conn.cursor()
+    
+        # Dastur boshlanganda admin qo'shamiz (xeshlash qimmat - faqat admin yo'q bo'lsa)
+        if cursor.execute("SELECT 1 FROM users WHERE login = 'admin'").fetchone():
+            return
+        try:
+            parol_hash, salt = passwords.hash_password('admin123')
+            cursor.execute('''
+            INSERT INTO users (ism, login, parol_hash, salt, role)
+            VALUES (?, ?, ?, ?, ?)
+            ''', ('Admin', 'admin', parol_hash, salt, 'teacher'))
+        except sqlite3.IntegrityError:
+            pass  # Admin allaqachon mavjud
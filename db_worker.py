@@ -0,0 +1,110 @@
+import queue
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import TclError, messagebox
+
+import querylog
+
+
+class DBWorker:
+    """Ma'lumotlar bazasi amallarini fon oqimlarida bajaruvchi yordamchi.
+
+    Tkinter vidjetlariga faqat asosiy oqimdan murojaat qilish mumkin, shuning
+    uchun tayyor natijalar navbatga qo'yiladi va root.after orqali asosiy
+    oqimda on_success / on_error callbacklariga uzatiladi.
+    """
+
+    def __init__(self, root, max_workers=2, poll_interval=20):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-worker')
+        self._done = queue.SimpleQueue()
+        self._calls = queue.SimpleQueue()
+        self._pending = 0
+        self._polling = False
+
+    def submit(self, fn, *args, on_success=None, on_error=None, owner=None, **kwargs):
+        """fn(*args, **kwargs) ni fon oqimida ishga tushirish.
+
+        owner - vidjet; natija kelguncha u yo'q qilingan bo'lsa (foydalanuvchi
+        boshqa oynaga o'tib ketgan), callbacklar chaqirilmaydi.
+        """
+        if querylog.ENABLED:
+            # So'rovlar jurnalida qaysi ekrandan kelgani ko'rinsin
+            fn = self._tagged(fn, self._screen_name(sys._getframe(1)))
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._pending += 1
+        future.add_done_callback(lambda f: self._done.put((f, on_success, on_error, owner)))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+        return future
+
+    @staticmethod
+    def _screen_name(frame):
+        owner = frame.f_locals.get('self')
+        name = frame.f_code.co_name
+        return f"{type(owner).__name__}.{name}" if owner is not None else name
+
+    @staticmethod
+    def _tagged(fn, screen):
+        def run(*args, **kwargs):
+            with querylog.screen(screen):
+                return fn(*args, **kwargs)
+        return run
+
+    def post(self, fn, *args):
+        """Fon oqimidan chaqiriladi: fn(*args) ni Tk oqimida bajarish (masalan, progress)"""
+        self._calls.put((fn, args))
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    fn, args = self._calls.get_nowait()
+                except queue.Empty:
+                    break
+                self._call(fn, *args)
+
+            while True:
+                try:
+                    future, on_success, on_error, owner = self._done.get_nowait()
+                except queue.Empty:
+                    break
+                self._pending -= 1
+                if owner is not None and not self._alive(owner):
+                    continue
+
+                error = future.exception()
+                if error is None:
+                    if on_success is not None:
+                        self._call(on_success, future.result())
+                elif on_error is not None:
+                    self._call(on_error, error)
+                else:
+                    messagebox.showerror("Xatolik", f"Ma'lumotlar bazasi xatosi: {error}")
+        finally:
+            # Callbackdagi xato keyingi natijalarni yetkazishni to'xtatib qo'ymasin
+            if self._pending > 0:
+                self.root.after(self.poll_interval, self._poll)
+            else:
+                self._polling = False
+
+    @staticmethod
+    def _call(fn, *args):
+        try:
+            fn(*args)
+        except Exception as error:
+            traceback.print_exc()
+            messagebox.showerror("Xatolik", f"Kutilmagan xatolik: {error}")
+
+    @staticmethod
+    def _alive(widget):
+        try:
+            return bool(widget.winfo_exists())
+        except TclError:
+            return False
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,202 @@
+"""Natijalarni faylga oqim bilan eksport qilish.
+
+Qatorlar bazadan bo'laklab (fetchmany) o'qiladi va darhol tanlangan formatga
+yoziladi, shuning uchun million qatorli eksport ham cheklangan xotirada, bitta
+o'tishda bajariladi. Formatlar: CSV, XLSX (openpyxl write-only) va Parquet
+(pyarrow). Filtrlar natijalar oynasidagi ResultFilter bilan bir xil.
+"""
+import csv
+import os
+
+import repository as repo
+
+
+CHUNK_SIZE = 1000
+WIDTH_SAMPLE = 1000     # XLSX ustun kengligi shuncha birinchi qator bo'yicha hisoblanadi
+MAX_COLUMN_WIDTH = 60
+
+RESULTS_HEADER = ["O'quvchi", "Test nomi", "To'g'ri javoblar", "Foiz", "Holat", "Vaqt"]
+
+
+class ExportBackend:
+    """Eksport formati: open() -> write(rows)... -> close()"""
+    extension = None
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = header
+
+    def open(self):
+        pass
+
+    def write(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CsvBackend(ExportBackend):
+    extension = '.csv'
+
+    def open(self):
+        # utf-8-sig: Excel o'zbekcha harflarni to'g'ri ochishi uchun
+        self._file = open(self.path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.header)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class XlsxBackend(ExportBackend):
+    """openpyxl write-only rejimi.
+
+    Write-only rejimda ustun kengligini qatorlardan oldin berish kerak, shuning
+    uchun birinchi sample_size qator yig'ib olinadi, kenglik ular bo'yicha
+    hisoblanadi va keyin hammasi oqim bilan yoziladi.
+    """
+    extension = '.xlsx'
+
+    def __init__(self, path, header, sample_size=WIDTH_SAMPLE):
+        super().__init__(path, header)
+        self.sample_size = sample_size
+        self._sample = []
+        self._started = False
+
+    def open(self):
+        from openpyxl import Workbook
+
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("Natijalar")
+
+    def write(self, rows):
+        if self._started:
+            for row in rows:
+                self._ws.append(row)
+            return
+        self._sample.extend(rows)
+        if len(self._sample) >= self.sample_size:
+            self._start()
+
+    def _start(self):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        # **Ustun kengliklari**
+        widths = [len(str(name)) for name in self.header]
+        for row in self._sample[:self.sample_size]:
+            for i, value in enumerate(row):
+                if value is not None:
+                    widths[i] = max(widths[i], len(str(value)))
+        for i, width in enumerate(widths, start=1):
+            self._ws.column_dimensions[get_column_letter(i)].width = min(width + 3, MAX_COLUMN_WIDTH)
+
+        # **Headerlarni bold qilish**
+        bold = Font(bold=True)
+        header_cells = []
+        for name in self.header:
+            cell = WriteOnlyCell(self._ws, value=name)
+            cell.font = bold
+            header_cells.append(cell)
+        self._ws.append(header_cells)
+
+        self._started = True
+        sample, self._sample = self._sample, []
+        self.write(sample)
+
+    def close(self):
+        if not self._started:
+            self._start()
+        self._wb.save(self.path)
+
+
+class ParquetBackend(ExportBackend):
+    extension = '.parquet'
+
+    def open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet eksporti uchun pyarrow o'rnatilishi kerak (pip install pyarrow)") from None
+
+        self._pa = pa
+        self._schema = pa.schema([
+            (self.header[0], pa.string()),
+            (self.header[1], pa.string()),
+            (self.header[2], pa.int64()),
+            (self.header[3], pa.float64()),
+            (self.header[4], pa.string()),
+            (self.header[5], pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows)) if rows else [[] for _ in self.header]
+        table = self._pa.Table.from_arrays(
+            [self._pa.array(column, type=field.type) for column, field in zip(columns, self._schema)],
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+BACKENDS = {backend.extension: backend for backend in (CsvBackend, XlsxBackend, ParquetBackend)}
+
+FILE_TYPES = [
+    ("Excel files", "*.xlsx"),
+    ("CSV files", "*.csv"),
+    ("Parquet files", "*.parquet"),
+]
+
+
+def backend_for(path, header, fmt=None):
+    """Fayl kengaytmasi (yoki fmt) bo'yicha eksport formatini tanlash"""
+    extension = '.' + fmt.lstrip('.').lower() if fmt else os.path.splitext(path)[1].lower()
+    try:
+        return BACKENDS[extension](path, header)
+    except KeyError:
+        raise ValueError(f"Qo'llab-quvvatlanmaydigan eksport formati: {extension or path}") from None
+
+
+def holat_text(otganmi):
+    return "O'tdi" if otganmi else "O'tmadi"
+
+
+def export_results(path, teacher_id, filters=None, fmt=None, progress=None, chunk_size=CHUNK_SIZE):
+    """O'qituvchi natijalarini filtrlar bo'yicha faylga eksport qilish.
+
+    progress(yozilgan, jami) har bir bo'lakdan keyin chaqiriladi (fon oqimidan).
+    Yozilgan qatorlar sonini qaytaradi.
+    """
+    total = repo.results.count_for_teacher(teacher_id, filters)
+    backend = backend_for(path, RESULTS_HEADER, fmt)
+    backend.open()
+    done = 0
+    try:
+        if progress is not None:
+            progress(done, total)
+        for rows in repo.results.iter_for_teacher(teacher_id, filters, chunk_size):
+            backend.write([(ism, nomi, togri, foiz, holat_text(otganmi), vaqt)
+                           for ism, nomi, togri, foiz, otganmi, vaqt in rows])
+            done += len(rows)
+            if progress is not None:
+                progress(done, total)
+        backend.close()
+    except Exception:
+        # Yarim yozilgan fayl qolmasin
+        try:
+            backend.close()
+        except Exception:
+            pass
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return done
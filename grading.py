@@ -0,0 +1,203 @@
+"""Baholash: Tkinter'siz ishlaydigan, alohida chaqirish va ommaviy baholash mumkin.
+
+    test = load_test(test_id)
+    grade = engine.score(test, ['A', 'C', None, ...])
+    engine.persist(student_id, grade)
+
+    # N ta javoblar to'plamini bitta NumPy taqqoslashda baholash
+    batch = engine.score_batch(test, [answers1, answers2, ...])
+
+    # To'g'ri javob tuzatilgach, testning barcha urinishlarini qayta baholash
+    engine.fix_answer(question_id, 'B')
+
+O'tish chegarasi EDU_PASS_THRESHOLD muhit o'zgaruvchisi bilan yoki
+GradingEngine(pass_threshold=...) orqali beriladi.
+"""
+import os
+from dataclasses import dataclass
+
+import repository as repo
+from database import db_session
+
+
+PASS_THRESHOLD = float(os.environ.get('EDU_PASS_THRESHOLD', 60))  # foiz: shundan yuqori yoki teng bo'lsa o'tdi
+REGRADE_CHUNK = 5000    # qayta baholashda bitta tranzaksiyadagi urinishlar
+
+
+@dataclass
+class LoadedTest:
+    """Xotiraga bir marta yuklangan test: savollar va javob kaliti bir xil (id) tartibda"""
+    id: int
+    questions: list     # (savol, a, b, c, d)
+    answer_key: str     # masalan "ABDC..." - har bir savolga bitta harf
+
+    @property
+    def total(self):
+        return len(self.questions)
+
+
+@dataclass
+class Grade:
+    """Bitta urinish natijasi"""
+    test_id: int
+    correct: int
+    total: int
+    percentage: float
+    passed: bool
+    answers: str = None     # "AC B..." - results.javoblar ga yoziladi
+
+
+@dataclass
+class BatchGrade:
+    """score_batch natijasi: har bir urinish uchun bitta element (NumPy massivlar)"""
+    test_id: int
+    total: int
+    correct: object     # int64[N]
+    percentage: object  # float64[N]
+    passed: object      # bool[N]
+
+    def __len__(self):
+        return len(self.correct)
+
+    def __iter__(self):
+        """Grade obyektlari ko'rinishida"""
+        for correct, percentage, passed in zip(self.correct, self.percentage, self.passed):
+            yield Grade(self.test_id, int(correct), self.total, float(percentage), bool(passed))
+
+
+@dataclass
+class RegradeReport:
+    test_id: int
+    checked: int = 0    # qayta baholangan urinishlar
+    changed: int = 0    # natijasi o'zgarganlari
+    skipped: int = 0    # javoblari saqlanmagan eski urinishlar
+
+
+def load_test(test_id, conn=None):
+    """Savollar va to'g'ri javoblarni bitta so'rovda yuklash"""
+    rows = repo.questions.with_answer_key(test_id, conn=conn)
+    return LoadedTest(
+        id=test_id,
+        questions=[row[:5] for row in rows],
+        answer_key=''.join(row[5] or ' ' for row in rows),
+    )
+
+
+def _pad(letters, length):
+    """Javoblarni aniq length uzunlikdagi satrga keltirish (yetishmaganlari bo'sh joy)"""
+    if isinstance(letters, str):
+        return letters[:length].ljust(length)
+    return ''.join(a or ' ' for a in letters[:length]).ljust(length)
+
+
+def _as_codes(letters, length):
+    """Javob harflarini uint8 massivga aylantirish"""
+    import numpy as np  # og'ir modul: dastur ishga tushishini sekinlashtirmasligi uchun
+
+    return np.frombuffer(_pad(letters, length).encode('ascii'), dtype=np.uint8)
+
+
+def _as_matrix(answer_sets, length):
+    """N ta javoblar to'plamini (N, length) o'lchamli uint8 matritsaga aylantirish"""
+    import numpy as np
+
+    packed = ''.join(_pad(answers, length) for answers in answer_sets).encode('ascii')
+    return np.frombuffer(packed, dtype=np.uint8).reshape(-1, length)
+
+
+class GradingEngine:
+    """Javoblarni kalit bilan taqqoslash va natijani saqlash"""
+
+    def __init__(self, pass_threshold=PASS_THRESHOLD):
+        self.pass_threshold = pass_threshold
+
+    def score(self, test, answers):
+        """Bitta urinishni baholash - vektorli taqqoslash bilan"""
+        import numpy as np
+
+        packed = _pad(answers, test.total)
+        key = _as_codes(test.answer_key, test.total)
+        given = _as_codes(packed, test.total)
+        correct = int(np.count_nonzero(key == given))
+        percentage = (correct / test.total) * 100 if test.total else 0.0
+        return Grade(test.id, correct, test.total, percentage, percentage >= self.pass_threshold, packed)
+
+    def score_batch(self, test, answer_sets):
+        """N ta urinishni bitta massiv taqqoslashda baholash.
+
+        answer_sets - javoblar ro'yxatlari yoki "AB C..." ko'rinishidagi satrlar.
+        """
+        import numpy as np
+
+        total = test.total
+        if total == 0:
+            n = len(answer_sets)
+            return BatchGrade(test.id, 0, np.zeros(n, dtype=np.int64),
+                              np.zeros(n), np.zeros(n, dtype=bool))
+        key = _as_codes(test.answer_key, total)
+        given = _as_matrix(answer_sets, total)
+        correct = np.count_nonzero(given == key, axis=1).astype(np.int64)
+        percentage = correct / total * 100
+        return BatchGrade(test.id, total, correct, percentage, percentage >= self.pass_threshold)
+
+    def persist(self, student_id, grade, conn=None):
+        """Natija va urinishni bitta tranzaksiyada yozish; results.id ni qaytaradi"""
+        return repo.results.record(
+            student_id, grade.test_id, grade.correct, grade.percentage, grade.passed,
+            answers=grade.answers, conn=conn,
+        )
+
+    def submit(self, student_id, test, answers, conn=None):
+        """Baholash va saqlash"""
+        grade = self.score(test, answers)
+        self.persist(student_id, grade, conn=conn)
+        return grade
+
+    def regrade_test(self, test_id, chunk_size=REGRADE_CHUNK, progress=None):
+        """Testning javoblari saqlangan barcha urinishlarini joriy kalit bo'yicha qayta baholash.
+
+        Urinishlar id bo'yicha chunk_size lik bo'laklarda o'qiladi, har bir bo'lak
+        score_batch bilan baholanadi va faqat o'zgargan qatorlar o'sha bo'lakning
+        tranzaksiyasida yangilanadi. progress(report) har bo'lakdan keyin chaqiriladi.
+        """
+        import numpy as np
+
+        test = load_test(test_id)
+        report = RegradeReport(test_id, skipped=repo.results.count_without_answers(test_id))
+        after_id = 0
+        while True:
+            with db_session() as conn:
+                rows = repo.results.answers_for_test(test_id, after_id, chunk_size, conn=conn)
+                if not rows:
+                    break
+                ids, answer_sets, old_correct, old_foiz, old_passed = zip(*rows)
+                batch = self.score_batch(test, answer_sets)
+
+                changed = ((batch.correct != np.array(old_correct, dtype=np.int64))
+                           | ~np.isclose(batch.percentage, np.array(old_foiz, dtype=np.float64))
+                           | (batch.passed != np.array(old_passed, dtype=bool)))
+                updates = [
+                    (int(batch.correct[i]), float(batch.percentage[i]), bool(batch.passed[i]), ids[i])
+                    for i in np.flatnonzero(changed)
+                ]
+                repo.results.update_scores(updates, conn=conn)
+
+            after_id = ids[-1]
+            report.checked += len(rows)
+            report.changed += len(updates)
+            if progress is not None:
+                progress(report)
+        return report
+
+    def fix_answer(self, question_id, togri_javob, chunk_size=REGRADE_CHUNK, progress=None):
+        """Savolning to'g'ri javobini tuzatib, testni qayta baholash"""
+        togri_javob = togri_javob.strip().upper()
+        if togri_javob not in ('A', 'B', 'C', 'D'):
+            raise ValueError(f"To'g'ri javob A, B, C yoki D bo'lishi kerak (berilgan: {togri_javob!r})")
+        test_id = repo.questions.set_answer(question_id, togri_javob)
+        if test_id is None:
+            raise ValueError(f"Savol topilmadi: {question_id}")
+        return self.regrade_test(test_id, chunk_size, progress)
+
+
+engine = GradingEngine()
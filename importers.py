@@ -0,0 +1,218 @@
+"""CSV / XLSX fayllardan ommaviy import.
+
+Fayllar qatorma-qator o'qiladi (XLSX uchun openpyxl read_only rejimi), shuning
+uchun minglab qatorli fayllar ham xotiraga to'liq yuklanmaydi. Qatorlar
+BATCH_SIZE bo'yicha executemany bilan yoziladi.
+"""
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+import passwords
+import repository as repo
+from database import db_session
+
+
+BATCH_SIZE = 500
+PARALLEL_MIN_ROWS = 200     # bundan kam parol bo'lsa jarayonlar hovuzi ishga tushirilmaydi
+HASH_CHUNK = 50             # bitta jarayonga bir martada yuboriladigan parollar
+
+# Sarlavhadagi ustun nomlari -> ichki nom
+QUESTION_COLUMNS = {
+    'savol': 'savol', 'savol_matni': 'savol',
+    'a': 'a', 'variant_a': 'a',
+    'b': 'b', 'variant_b': 'b',
+    'c': 'c', 'variant_c': 'c',
+    'd': 'd', 'variant_d': 'd',
+    'javob': 'javob', 'togri_javob': 'javob',
+}
+
+STUDENT_COLUMNS = {
+    'ism': 'ism', 'name': 'ism',
+    'login': 'login',
+    'parol': 'parol', 'password': 'parol',
+}
+
+
+class RowValidationError(ValueError):
+    """Import qilinayotgan faylda noto'g'ri qator"""
+
+    def __init__(self, line, message):
+        super().__init__(f"{line}-qator: {message}")
+        self.line = line
+
+
+def read_rows(path):
+    """Fayl qatorlarini (qator raqami, qiymatlar ro'yxati) ko'rinishida oqim bilan berish"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for line, row in enumerate(csv.reader(f), start=1):
+                yield line, [value.strip() for value in row]
+    elif ext in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            for line, row in enumerate(wb.active.iter_rows(values_only=True), start=1):
+                yield line, ['' if value is None else str(value).strip() for value in row]
+        finally:
+            wb.close()
+    else:
+        raise ValueError(f"Qo'llab-quvvatlanmaydigan fayl turi: {ext}")
+
+
+def read_records(path, columns):
+    """Sarlavha qatori bo'yicha har bir qatorni lug'atga aylantirish.
+
+    columns - sarlavhadagi nom -> ichki nom; barcha ichki nomlar bo'lishi shart.
+    """
+    rows = read_rows(path)
+    try:
+        _, header = next(rows)
+    except StopIteration:
+        return
+
+    index = {}
+    for i, name in enumerate(header):
+        key = columns.get(name.strip().lower())
+        if key is not None and key not in index:
+            index[key] = i
+    missing = sorted(set(columns.values()) - set(index))
+    if missing:
+        raise RowValidationError(1, f"sarlavhada ustunlar yo'q: {', '.join(missing)}")
+
+    for line, row in rows:
+        if not any(row):
+            continue  # bo'sh qatorlarni o'tkazib yuboramiz
+        yield line, {key: row[i] if i < len(row) else '' for key, i in index.items()}
+
+
+def batched(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def question_row(test_id, line, record):
+    """Import qatorini tekshirib, questions jadvali uchun kortejga aylantirish"""
+    if not all(record[key] for key in ('savol', 'a', 'b', 'c', 'd')):
+        raise RowValidationError(line, "savol va barcha variantlar to'ldirilishi kerak")
+    javob = record['javob'].upper()
+    if javob not in ('A', 'B', 'C', 'D'):
+        raise RowValidationError(line, f"to'g'ri javob A, B, C yoki D bo'lishi kerak (berilgan: {record['javob']!r})")
+    return (test_id, record['savol'], record['a'], record['b'], record['c'], record['d'], javob)
+
+
+def import_questions(test_id, path, batch_size=BATCH_SIZE, conn=None):
+    """Savollar bankini testga import qilish; qo'shilgan savollar sonini qaytaradi.
+
+    Hammasi bitta tranzaksiyada: biror qator noto'g'ri bo'lsa, hech narsa saqlanmaydi.
+    """
+    records = read_records(path, QUESTION_COLUMNS)
+    rows = (question_row(test_id, line, record) for line, record in records)
+
+    with repo.use_session(conn) as conn:
+        count = 0
+        for batch in batched(rows, batch_size):
+            repo.questions.add_many(batch, conn=conn)
+            count += len(batch)
+        repo.tests.refresh_question_count(test_id, conn=conn)
+    return count
+
+
+def create_test_from_file(nomi, teacher_id, path, batch_size=BATCH_SIZE):
+    """Yangi test yaratib, savollarini fayldan import qilish: (test_id, savollar soni)"""
+    with db_session() as conn:
+        test_id = repo.tests.create(nomi, teacher_id, 0, conn=conn)
+        count = import_questions(test_id, path, batch_size, conn=conn)
+        if count == 0:
+            raise RowValidationError(2, "faylda birorta ham savol yo'q")
+    return test_id, count
+
+
+
+@dataclass
+class EnrollmentReport:
+    added: int = 0
+    duplicates: list = field(default_factory=list)  # (qator, login) - login band yoki faylda takrorlangan
+    errors: list = field(default_factory=list)      # (qator, xabar) - noto'g'ri qatorlar
+
+    @property
+    def processed(self):
+        return self.added + len(self.duplicates) + len(self.errors)
+
+
+def student_record(line, record):
+    """O'quvchi qatorini tekshirish: (ism, login, parol)"""
+    if not all(record[key] for key in ('ism', 'login', 'parol')):
+        raise RowValidationError(line, "ism, login va parol to'ldirilishi kerak")
+    return record['ism'], record['login'], record['parol']
+
+
+def _hash_student(student):
+    """Jarayonlar hovuzida bajariladi: (ism, login, parol) -> users qatori"""
+    ism, login, parol = student
+    parol_hash, salt = passwords.hash_password(parol)
+    return (ism, login, parol_hash, salt, 'student')
+
+
+def enroll_students(path, batch_size=BATCH_SIZE, workers=None, progress=None):
+    """Ro'yxat faylidan o'quvchilarni ommaviy qo'shish.
+
+    Parollar jarayonlar hovuzida xeshlanadi, qatorlar batch_size lik bo'laklarda
+    (har biri alohida tranzaksiyada) executemany bilan yoziladi. Band loginlar va
+    noto'g'ri qatorlar butun importni to'xtatmaydi - hisobotga yoziladi.
+    progress(report) har bir bo'lakdan keyin chaqiriladi.
+    """
+    report = EnrollmentReport()
+    seen = set()
+    executor = None
+    try:
+        for batch in batched(read_records(path, STUDENT_COLUMNS), batch_size):
+            students, lines = [], {}
+            for line, record in batch:
+                try:
+                    student = student_record(line, record)
+                except RowValidationError as error:
+                    report.errors.append((line, str(error)))
+                    continue
+                login = student[1]
+                if login in seen:
+                    report.duplicates.append((line, login))
+                    continue
+                seen.add(login)
+                students.append(student)
+                lines[login] = line
+
+            # Band loginlar uchun parolni xeshlab o'tirmaymiz
+            taken = repo.users.existing_logins(lines)
+            students = [student for student in students if student[1] not in taken]
+
+            if len(students) >= PARALLEL_MIN_ROWS:
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=workers)
+                rows = list(executor.map(_hash_student, students, chunksize=HASH_CHUNK))
+            else:
+                rows = [_hash_student(student) for student in students]
+
+            with db_session() as conn:
+                # Xeshlash paytida boshqa jarayon qo'shgan bo'lishi mumkin - yozish qulfini olib,
+                # qayta tekshiramiz: tekshiruv va qo'shish orasida hech kim yoza olmaydi
+                conn.execute("BEGIN IMMEDIATE")
+                taken |= repo.users.existing_logins([row[1] for row in rows], conn=conn)
+                rows = [row for row in rows if row[1] not in taken]
+                repo.users.add_many(rows, conn=conn)
+            report.added += len(rows)
+            report.duplicates.extend(sorted((lines[login], login) for login in taken))
+            if progress is not None:
+                progress(report)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return report
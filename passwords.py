@@ -0,0 +1,147 @@
+"""Parollarni xeshlash va tekshirish.
+
+Algoritm va uning parametrlari har bir qatorning parol_hash ustunida saqlanadi:
+
+    pbkdf2_sha256$iterations=310000$<hex>
+    scrypt$n=16384,r=8,p=1$<hex>
+    <64 belgili hex>                      - eski format: sha256(parol + salt)
+
+Tuz (salt) avvalgidek alohida ustunda. Joriy algoritm va narx EDU_PASSWORD_*
+muhit o'zgaruvchilari bilan beriladi; eskirgan yoki arzonroq xeshlar kirishda
+(to'g'ri parol bilan) avtomatik qayta xeshlanadi - needs_rehash() ga qarang.
+
+Narxni shu kompyuter uchun tanlash: python -m cli passwords calibrate
+"""
+import hashlib
+import hmac
+import math
+import os
+import time
+
+
+ALGORITHM = os.environ.get('EDU_PASSWORD_ALGORITHM', 'pbkdf2_sha256')
+PBKDF2_ITERATIONS = int(os.environ.get('EDU_PBKDF2_ITERATIONS', 310000))
+SCRYPT_N = int(os.environ.get('EDU_SCRYPT_N', 2 ** 14))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+
+# Kalibrlash: bir vaqtda BURST_SIZE ta kirish bo'lganda ham javob LOGIN_BUDGET_MS dan oshmasin
+LOGIN_BUDGET_MS = 1000
+BURST_SIZE = 40     # dars boshida bir sinf
+CALIBRATION_MARGIN = 0.8    # o'lchash xatosi va boshqa yuklama uchun byudjetning shu qismi ishlatiladi
+
+
+def _pbkdf2_sha256(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), int(iterations)).hex()
+
+
+def _scrypt(password, salt, n, r, p):
+    n, r, p = int(n), int(r), int(p)
+    return hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=32).hex()
+
+
+def _sha256(password, salt):
+    return hashlib.sha256((password + salt).encode()).hexdigest()
+
+
+HASHERS = {
+    'pbkdf2_sha256': _pbkdf2_sha256,
+    'scrypt': _scrypt,
+}
+
+
+def current_params(algorithm=None):
+    """Yangi xeshlar uchun parametrlar"""
+    algorithm = algorithm or ALGORITHM
+    if algorithm == 'pbkdf2_sha256':
+        return {'iterations': PBKDF2_ITERATIONS}
+    if algorithm == 'scrypt':
+        return {'n': SCRYPT_N, 'r': SCRYPT_R, 'p': SCRYPT_P}
+    raise ValueError(f"Noma'lum parol algoritmi: {algorithm}")
+
+
+def encode(algorithm, params, digest):
+    return f"{algorithm}${','.join(f'{k}={v}' for k, v in params.items())}${digest}"
+
+
+def decode(encoded):
+    """parol_hash -> (algoritm, parametrlar, xesh). Eski sha256 xeshlar uchun ('sha256', {}, xesh)"""
+    if '$' not in encoded:
+        return 'sha256', {}, encoded
+    algorithm, params, digest = encoded.split('$', 2)
+    params = dict(item.split('=', 1) for item in params.split(',') if item)
+    return algorithm, {k: int(v) for k, v in params.items()}, digest
+
+
+def hash_password(password, algorithm=None, params=None):
+    """Yangi tuz bilan xeshlash: (parol_hash, salt)"""
+    algorithm = algorithm or ALGORITHM
+    params = params or current_params(algorithm)
+    salt = os.urandom(SALT_BYTES).hex()
+    return encode(algorithm, params, HASHERS[algorithm](password, salt, **params)), salt
+
+
+def verify_password(password, encoded, salt):
+    algorithm, params, digest = decode(encoded)
+    if algorithm == 'sha256':
+        candidate = _sha256(password, salt)
+    elif algorithm in HASHERS:
+        candidate = HASHERS[algorithm](password, salt, **params)
+    else:
+        return False
+    return hmac.compare_digest(candidate, digest)
+
+
+def needs_rehash(encoded):
+    """Xesh joriy algoritm/narxdan eski yoki arzonmi"""
+    algorithm, params, _ = decode(encoded)
+    if algorithm != ALGORITHM:
+        return True
+    current = current_params(algorithm)
+    return any(params.get(key, 0) < value for key, value in current.items())
+
+
+def measure(algorithm=None, params=None, repeat=3):
+    """Bitta xeshlashning eng yaxshi vaqti (ms)"""
+    algorithm = algorithm or ALGORITHM
+    params = params or current_params(algorithm)
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        HASHERS[algorithm]('benchmark-password', 'benchmark-salt', **params)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def calibrate(budget_ms=LOGIN_BUDGET_MS, burst=BURST_SIZE, workers=None, algorithm=None):
+    """Shu kompyuterda budget_ms ichida burst ta kirishga ulguradigan eng qimmat parametrlar.
+
+    burst ta xeshlash workers ta yadroga navbat bilan tushadi, shuning uchun
+    bitta xesh uchun budget_ms / ceil(burst / workers) vaqt qoladi.
+    (parametrlar, bitta xesh ms, eng yomon kirish ms) qaytaradi.
+    """
+    algorithm = algorithm or ALGORITHM
+    workers = workers or os.cpu_count() or 1
+    rounds = math.ceil(burst / workers)
+    per_hash_ms = budget_ms * CALIBRATION_MARGIN / rounds
+
+    if algorithm == 'pbkdf2_sha256':
+        # Vaqt takrorlar soniga chiziqli bog'liq
+        probe = {'iterations': 50000}
+        iterations = int(probe['iterations'] * per_hash_ms / measure(algorithm, probe))
+        params = {'iterations': max(1000, iterations // 1000 * 1000)}
+    elif algorithm == 'scrypt':
+        # n faqat 2 ning darajasi bo'ladi: byudjetga sig'adigan eng kattasi
+        params = {'n': 2 ** 10, 'r': SCRYPT_R, 'p': SCRYPT_P}
+        while params['n'] < 2 ** 20:
+            bigger = dict(params, n=params['n'] * 2)
+            if measure(algorithm, bigger, repeat=1) > per_hash_ms:
+                break
+            params = bigger
+    else:
+        raise ValueError(f"Noma'lum parol algoritmi: {algorithm}")
+
+    hash_ms = measure(algorithm, params)
+    return params, hash_ms, hash_ms * rounds
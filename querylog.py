@@ -0,0 +1,294 @@
+"""So'rovlarni o'lchash: vaqt, qaytgan qatorlar, chaqirgan joy va sekin so'rovlar jurnali.
+
+Yoqish (dastur ishga tushishidan oldin):
+
+    EDU_QUERY_LOG=1            sekin so'rovlarni jurnalga yozish
+    EDU_QUERY_LOG=all          hamma so'rovlarni yozish
+    EDU_SLOW_QUERY_MS=100      sekin deb hisoblanadigan chegara
+    EDU_QUERY_LOG_FILE=queries.log
+    EDU_EXPLAIN_SLOW=1         sekin so'rovlar uchun EXPLAIN QUERY PLAN ham yoziladi
+
+Yoqilganda hovuz ulanishlari InstrumentedConnection bo'lib ochiladi. So'rov
+vaqti execute dan kursor oxirigacha o'qilguncha (yoki yopilguncha) o'lchanadi.
+"Ekran" - DBWorker.submit ni chaqirgan metod (screen() bilan belgilanadi),
+"chaqiruvchi" - so'rovni yuborgan birinchi repository/ilova funksiyasi.
+Oxirgi natijalar va har bir so'rov bo'yicha yig'indilar xotirada turadi -
+o'qituvchi panelidagi Diagnostika oynasi ularni ko'rsatadi.
+"""
+import logging
+import logging.handlers
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+_mode = os.environ.get('EDU_QUERY_LOG', '').lower()
+ENABLED = _mode not in ('', '0', 'no', 'off')
+LOG_ALL = _mode == 'all'
+SLOW_QUERY_MS = float(os.environ.get('EDU_SLOW_QUERY_MS', 100))
+LOG_FILE = os.environ.get('EDU_QUERY_LOG_FILE', 'queries.log')
+EXPLAIN_SLOW = os.environ.get('EDU_EXPLAIN_SLOW', '1') not in ('0', 'no', 'off')
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 5
+RECENT_SIZE = 500       # xotirada turadigan oxirgi sekin so'rovlar
+
+# Chaqiruvchini aniqlashda o'tkazib yuboriladigan (infratuzilma) modullar
+_SKIP_MODULES = {'querylog', 'database', 'contextlib', 'threading', 'concurrent.futures.thread',
+                 'db_worker', 'sqlite3', 'sqlite3.dbapi2'}
+
+logger = logging.getLogger('edu.queries')
+_local = threading.local()
+_lock = threading.Lock()
+
+
+@dataclass
+class QueryRecord:
+    sql: str
+    params: object
+    screen: str
+    caller: str
+    wall_time: float
+    elapsed_ms: float = 0.0
+    rows: int = 0
+    many: bool = False
+    plan: list = field(default_factory=list)
+    finished: bool = False
+
+
+@dataclass
+class QueryStats:
+    """Bir xil so'rov matni bo'yicha yig'indi"""
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    slow: int = 0
+    callers: set = field(default_factory=set)
+
+
+recent_slow = deque(maxlen=RECENT_SIZE)
+stats = {}
+
+
+def enable(slow_ms=None, log_file=None, log_all=None, explain=None):
+    """Dasturdan yoqish (yangi ochiladigan ulanishlarga ta'sir qiladi - database.configure_pool)"""
+    global ENABLED, SLOW_QUERY_MS, LOG_FILE, LOG_ALL, EXPLAIN_SLOW
+    ENABLED = True
+    if slow_ms is not None:
+        SLOW_QUERY_MS = slow_ms
+    if log_file is not None:
+        LOG_FILE = log_file
+    if log_all is not None:
+        LOG_ALL = log_all
+    if explain is not None:
+        EXPLAIN_SLOW = explain
+    _setup_logger()
+
+
+def _setup_logger():
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    if LOG_FILE:
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+
+def reset():
+    with _lock:
+        recent_slow.clear()
+        stats.clear()
+
+
+@contextmanager
+def screen(name):
+    """Shu blok ichidagi so'rovlarni name ekraniga bog'lash (oqim bo'yicha)"""
+    previous = getattr(_local, 'screen', None)
+    _local.screen = name
+    try:
+        yield
+    finally:
+        _local.screen = previous
+
+
+def _caller():
+    """So'rovni yuborgan birinchi infratuzilma bo'lmagan funksiya: modul.Klass.metod"""
+    frame = sys._getframe(3)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module not in _SKIP_MODULES:
+            code = frame.f_code
+            owner = frame.f_locals.get('self')
+            name = f"{type(owner).__name__}.{code.co_name}" if owner is not None else code.co_name
+            return f"{module}.{name}"
+        frame = frame.f_back
+    return '?'
+
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(sql):
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _finish(conn, record):
+    if record.finished:
+        return
+    record.finished = True
+    slow = record.elapsed_ms >= SLOW_QUERY_MS
+    sql = normalize(record.sql)
+
+    if slow and EXPLAIN_SLOW and not record.many:
+        try:
+            plan = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + record.sql, record.params or ())
+            record.plan = [row[3] for row in plan.fetchall()]
+        except sqlite3.Error:
+            pass
+
+    with _lock:
+        entry = stats.get(sql)
+        if entry is None:
+            entry = stats[sql] = QueryStats(sql)
+        entry.count += 1
+        entry.total_ms += record.elapsed_ms
+        entry.max_ms = max(entry.max_ms, record.elapsed_ms)
+        entry.rows += record.rows
+        entry.callers.add(record.caller)
+        if slow:
+            entry.slow += 1
+            recent_slow.append(record)
+
+    if slow or LOG_ALL:
+        message = (f"{record.elapsed_ms:.1f} ms rows={record.rows} screen={record.screen or '-'} "
+                   f"caller={record.caller} sql={sql[:500]}")
+        if record.plan:
+            message += " plan=" + " | ".join(record.plan)
+        logger.log(logging.WARNING if slow else logging.DEBUG, message)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Vaqt va qatorlarni joriy QueryRecord ga qo'shib boruvchi kursor"""
+    _record = None
+
+    def _start(self, sql, params, many):
+        self._close_record()
+        self._record = QueryRecord(sql, params, getattr(_local, 'screen', None), _caller(),
+                                   time.time(), many=many)
+
+    def _timed(self, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            if self._record is not None:
+                self._record.elapsed_ms += (time.perf_counter() - t0) * 1000
+
+    def execute(self, sql, params=()):
+        self._start(sql, params, False)
+        self._timed(super().execute, sql, params)
+        if self.description is None:    # INSERT/UPDATE: qatorlar qaytmaydi
+            self._record.rows = max(self.rowcount, 0)
+            self._close_record()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._start(sql, None, True)
+        self._timed(super().executemany, sql, seq_of_params)
+        self._record.rows = max(self.rowcount, 0)
+        self._close_record()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        self._count(1 if row is not None else 0, exhausted=row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        self._count(len(rows), exhausted=not rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._count(len(rows), exhausted=True)
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._close_record()
+            raise
+        self._count(1)
+        return row
+
+    def __iter__(self):
+        return self
+
+    def _count(self, rows, exhausted=False):
+        if self._record is not None:
+            self._record.rows += rows
+            if exhausted:
+                self._close_record()
+
+    def _close_record(self):
+        record, self._record = self._record, None
+        if record is not None:
+            _finish(self.connection, record)
+
+    def close(self):
+        self._close_record()
+        super().close()
+
+    def __del__(self):
+        # fetchone bilan bitta qator olingan kursor oxirigacha o'qilmaydi
+        try:
+            self._close_record()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Barcha so'rovlari InstrumentedCursor orqali o'tadigan ulanish"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+
+def connection_factory():
+    """database._connect uchun: o'lchash yoqilgan bo'lsa InstrumentedConnection"""
+    return InstrumentedConnection if ENABLED else sqlite3.Connection
+
+
+def top_queries(limit=50, key='total_ms'):
+    """Eng ko'p vaqt olgan so'rovlar (yig'indilar nusxasi)"""
+    with _lock:
+        entries = list(stats.values())
+    return sorted(entries, key=lambda entry: getattr(entry, key), reverse=True)[:limit]
+
+
+def slow_queries():
+    with _lock:
+        return list(recent_slow)
+
+
+if ENABLED:
+    _setup_logger()
@@ -0,0 +1,553 @@
+"""Ma'lumotlar bazasiga murojaat qatlami.
+
+Barcha SQL so'rovlar shu yerda jamlangan. So'rov matnlari o'zgarmas bo'lgani
+uchun hovuzdagi uzoq yashovchi ulanishlar ularni bir marta tayyorlab,
+statement keshidan qayta ishlatadi (database.STATEMENT_CACHE_SIZE).
+Har bir metod tayyor ulanishni (conn) qabul qiladi - bir nechta amalni bitta
+tranzaksiyada bajarish uchun; berilmasa o'zining db_session'ini ochadi.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from database import db_session, fts_enabled, on_commit
+
+
+@contextmanager
+def use_session(conn=None):
+    """Berilgan ulanishni ishlatish yoki yangi db_session ochish"""
+    if conn is not None:
+        yield conn
+    else:
+        with db_session() as new_conn:
+            yield new_conn
+
+
+class LRUCache:
+    """Oqimlar uchun xavfsiz, hajmi cheklangan kesh: eng uzoq ishlatilmagani chiqarib yuboriladi"""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._items.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def discard(self, predicate):
+        """predicate(kalit, qiymat) rost bo'lgan yozuvlarni o'chirish"""
+        with self._lock:
+            for key in [key for key, value in self._items.items() if predicate(key, value)]:
+                del self._items[key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+# ==================== FOYDALANUVCHILAR ====================
+USER_CACHE_SIZE = int(os.environ.get('EDU_USER_CACHE_SIZE', '2048'))
+AVAILABLE_CACHE_SIZE = int(os.environ.get('EDU_AVAILABLE_CACHE_SIZE', '1024'))
+# Boshqa kompyuter (jarayon) yaratgan test yoki yozgan natija shuncha sekundda ko'rinadi
+AVAILABLE_CACHE_SECONDS = float(os.environ.get('EDU_AVAILABLE_CACHE_SECONDS', '30'))
+
+
+class UsersRepository:
+    FIND_FOR_LOGIN = '''
+    SELECT id, ism, parol_hash, salt FROM users
+    WHERE login = ? AND role = ?
+    '''
+    INSERT = '''
+    INSERT INTO users (ism, login, parol_hash, salt, role)
+    VALUES (?, ?, ?, ?, ?)
+    '''
+    SET_PASSWORD = 'UPDATE users SET parol_hash = ?, salt = ? WHERE id = ?'
+    FIND_MANY_FOR_LOGIN = '''
+    SELECT login, id, ism, parol_hash, salt FROM users
+    WHERE role = ? AND login IN ({})
+    '''
+
+    def __init__(self, cache_size=USER_CACHE_SIZE):
+        # (login, role) -> (id, ism, parol_hash, salt).
+        # Dars boshida bir sinf birdan kirganda har bir kirish bazaga bormasligi uchun.
+        self.cache = LRUCache(cache_size)
+
+    def find_for_login(self, login, role, conn=None):
+        """(id, ism, parol_hash, salt) yoki None"""
+        key = (login, role)
+        row = self.cache.get(key)
+        if row is not None:
+            return row
+        with use_session(conn) as conn:
+            row = conn.execute(self.FIND_FOR_LOGIN, (login, role)).fetchone()
+        if row is not None:
+            self.cache.put(key, row)
+        return row
+
+    def prefetch(self, logins, role='student', conn=None):
+        """Bir guruh foydalanuvchini bitta so'rovda keshga yuklash (masalan, dars boshidan oldin)"""
+        logins = list(logins)
+        found = 0
+        with use_session(conn) as conn:
+            for start in range(0, len(logins), 500):
+                part = logins[start:start + 500]
+                query = self.FIND_MANY_FOR_LOGIN.format(', '.join('?' * len(part)))
+                for login, *row in conn.execute(query, [role] + part):
+                    self.cache.put((login, role), tuple(row))
+                    found += 1
+        return found
+
+    def invalidate(self, user_id=None):
+        """Foydalanuvchini (yoki user_id berilmasa - hammasini) keshdan olib tashlash"""
+        if user_id is None:
+            self.cache.clear()
+        else:
+            self.cache.discard(lambda key, row: row[0] == user_id)
+
+    def add(self, ism, login, parol_hash, salt, role='student', conn=None):
+        with use_session(conn) as conn:
+            return conn.execute(self.INSERT, (ism, login, parol_hash, salt, role)).lastrowid
+
+    def add_many(self, rows, conn=None):
+        """rows: (ism, login, parol_hash, salt, role) qatorlari"""
+        with use_session(conn) as conn:
+            conn.executemany(self.INSERT, rows)
+
+    def set_password(self, user_id, parol_hash, salt, conn=None):
+        with use_session(conn) as conn:
+            conn.execute(self.SET_PASSWORD, (parol_hash, salt, user_id))
+            # Eski xesh keshda qolmasin
+            on_commit(conn, lambda: self.invalidate(user_id))
+
+    def existing_logins(self, logins, conn=None):
+        """Berilganlar orasidan bazada allaqachon bor loginlar to'plami"""
+        logins = list(logins)
+        found = set()
+        with use_session(conn) as conn:
+            # SQLite parametrlar soni cheklangan, shuning uchun bo'laklab so'raymiz
+            for start in range(0, len(logins), 500):
+                part = logins[start:start + 500]
+                query = f"SELECT login FROM users WHERE login IN ({', '.join('?' * len(part))})"
+                found.update(row[0] for row in conn.execute(query, part))
+        return found
+
+
+# ==================== TESTLAR ====================
+class TestsRepository:
+    INSERT = '''
+    INSERT INTO tests (nomi, oqituvchi_id, savollar_soni)
+    VALUES (?, ?, ?)
+    '''
+    NAMES_FOR_TEACHER = "SELECT nomi FROM tests WHERE oqituvchi_id = ?"
+    REFRESH_QUESTION_COUNT = '''
+    UPDATE tests SET savollar_soni = (SELECT COUNT(*) FROM questions WHERE test_id = ?)
+    WHERE id = ?
+    '''
+    AVAILABLE_PAGE_SIZE = 100
+    # Anti-join: har bir test uchun urinish (oquvchi_id, test_id) UNIQUE indeksidan qidiriladi,
+    # t.id bo'yicha keyset sahifalash - katalog qanchalik katta bo'lmasin, sahifa tez keladi
+    AVAILABLE_FOR_STUDENT = '''
+    SELECT t.id, t.nomi
+    FROM tests t
+    WHERE t.id > ?
+      AND NOT EXISTS (
+        SELECT 1 FROM student_test_attempts a
+        WHERE a.oquvchi_id = ? AND a.test_id = t.id
+      )
+    ORDER BY t.id
+    LIMIT ?
+    '''
+
+    def __init__(self, cache_size=AVAILABLE_CACHE_SIZE, cache_seconds=AVAILABLE_CACHE_SECONDS):
+        # (oquvchi_id, after_id, limit) -> (yuklangan vaqt, sahifa); shu jarayonda urinish
+        # yozilganda yoki yangi test qo'shilganda tozalanadi, boshqalarniki - cache_seconds dan keyin
+        self.available_cache = LRUCache(cache_size)
+        self.cache_seconds = cache_seconds
+
+    def search_names(self, teacher_id, text, limit=50, conn=None):
+        """O'qituvchi testlari orasidan nomi bo'yicha qidirish"""
+        clause, param = text_match("nomi", "tests_fts", "id", text, fts_enabled())
+        query = f"SELECT nomi FROM tests WHERE oqituvchi_id = ? AND {clause} ORDER BY nomi LIMIT ?"
+        with use_session(conn) as conn:
+            return [row[0] for row in conn.execute(query, (teacher_id, param, limit))]
+
+    def create(self, nomi, teacher_id, question_count, conn=None):
+        """Yangi test yaratib, uning id sini qaytarish"""
+        with use_session(conn) as conn:
+            test_id = conn.execute(self.INSERT, (nomi, teacher_id, question_count)).lastrowid
+            # Yangi test hammaga ko'rinishi kerak
+            on_commit(conn, self.available_cache.clear)
+        return test_id
+
+    def refresh_question_count(self, test_id, conn=None):
+        """savollar_soni ni haqiqiy savollar soniga tenglashtirish"""
+        with use_session(conn) as conn:
+            conn.execute(self.REFRESH_QUESTION_COUNT, (test_id, test_id))
+
+    def names_for_teacher(self, teacher_id, conn=None):
+        with use_session(conn) as conn:
+            return [row[0] for row in conn.execute(self.NAMES_FOR_TEACHER, (teacher_id,))]
+
+    def available_for_student(self, student_id, after_id=0, limit=AVAILABLE_PAGE_SIZE, conn=None):
+        """O'quvchi hali ishlamagan testlar, after_id dan keyingi limit tasi: [(id, nomi), ...]"""
+        key = (student_id, after_id, limit)
+        cached = self.available_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_seconds:
+            return cached[1]
+        with use_session(conn) as conn:
+            page = conn.execute(self.AVAILABLE_FOR_STUDENT, (after_id, student_id, limit)).fetchall()
+        self.available_cache.put(key, (time.monotonic(), page))
+        return page
+
+    def invalidate_available(self, *student_ids):
+        self.available_cache.discard(lambda key, entry: key[0] in student_ids)
+
+
+# ==================== SAVOLLAR ====================
+class QuestionsRepository:
+    INSERT = '''
+    INSERT INTO questions (test_id, savol_matni, variant_a, variant_b, variant_c, variant_d, togri_javob)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    WITH_ANSWER_KEY = '''
+    SELECT savol_matni, variant_a, variant_b, variant_c, variant_d, togri_javob
+    FROM questions WHERE test_id = ? ORDER BY id
+    '''
+    TEST_OF_QUESTION = 'SELECT test_id FROM questions WHERE id = ?'
+    SET_ANSWER = 'UPDATE questions SET togri_javob = ? WHERE id = ?'
+
+    def add_many(self, rows, conn=None):
+        """rows: (test_id, savol, a, b, c, d, togri_javob) qatorlari"""
+        with use_session(conn) as conn:
+            conn.executemany(self.INSERT, rows)
+
+    def with_answer_key(self, test_id, conn=None):
+        """Savollar va to'g'ri javob bitta so'rovda: (savol, a, b, c, d, togri_javob)"""
+        with use_session(conn) as conn:
+            return conn.execute(self.WITH_ANSWER_KEY, (test_id,)).fetchall()
+
+    def set_answer(self, question_id, togri_javob, conn=None):
+        """To'g'ri javobni tuzatish; savol tegishli test id sini qaytaradi (savol yo'q bo'lsa None)"""
+        with use_session(conn) as conn:
+            row = conn.execute(self.TEST_OF_QUESTION, (question_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(self.SET_ANSWER, (togri_javob, question_id))
+            return row[0]
+
+
+# ==================== NATIJALAR ====================
+def fts_phrase(text):
+    """Foydalanuvchi matnini FTS5 MATCH uchun bitta iboraga aylantirish"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def text_match(column, fts_table, id_column, text, use_fts):
+    """Qisman moslik sharti: trigram indeks (3+ belgi) yoki LIKE"""
+    if use_fts and len(text) >= 3:
+        return f"{id_column} IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)", fts_phrase(text)
+    return f"{column} LIKE ?", f"%{text}%"
+
+
+@dataclass
+class ResultFilter:
+    """O'qituvchi natijalar oynasidagi filtrlar"""
+    otganmi: Optional[bool] = None      # None - hammasi
+    test_nomi: Optional[str] = None     # aniq nom
+    ism: Optional[str] = None           # ism bo'yicha qisman moslik
+    min_foiz: Optional[float] = None
+    test_matn: Optional[str] = None     # test nomi bo'yicha qisman moslik
+
+    def to_sql(self, use_fts=False):
+        """Qo'shimcha WHERE shartlari va parametrlari"""
+        clauses, params = [], []
+        if self.otganmi is not None:
+            clauses.append("r.otganmi = 1" if self.otganmi else "r.otganmi = 0")
+        if self.test_nomi:
+            clauses.append("t.nomi = ?")
+            params.append(self.test_nomi)
+        if self.test_matn:
+            clause, param = text_match("t.nomi", "tests_fts", "t.id", self.test_matn, use_fts)
+            clauses.append(clause)
+            params.append(param)
+        if self.ism:
+            clause, param = text_match("u.ism", "users_fts", "u.id", self.ism, use_fts)
+            clauses.append(clause)
+            params.append(param)
+        if self.min_foiz is not None:
+            clauses.append("r.foiz >= ?")
+            params.append(self.min_foiz)
+        return ''.join(f" AND {c}" for c in clauses), params
+
+    def selective(self):
+        """Natijalarni ism yoki test bo'yicha toraytiradimi"""
+        return bool(self.test_nomi or self.test_matn or self.ism)
+
+    def countable(self):
+        """Jami sonini test_stats dan olsa bo'ladimi (results ni skanerlamasdan)"""
+        return not (self.test_matn or self.ism or self.min_foiz is not None)
+
+
+class ResultsRepository:
+    PAGE_SIZE = 200
+
+    TEACHER_FROM = '''
+    FROM results r
+    JOIN users u ON r.oquvchi_id = u.id
+    JOIN tests t ON r.test_id = t.id
+    WHERE t.oqituvchi_id = ?
+    '''
+    # Ustunlar tartibi: o'quvchi, test, to'g'ri javoblar, foiz, holat, vaqt
+    FOR_TEACHER = "SELECT u.ism, t.nomi, r.togri_javoblar, r.foiz, r.otganmi, r.vaqt" + TEACHER_FROM
+    # Sahifalash uchun oldiga natija id si qo'shiladi
+    PAGE_COLUMNS = "SELECT r.id, u.ism, t.nomi, r.togri_javoblar, r.foiz, r.otganmi, r.vaqt"
+    PAGE_FOR_TEACHER = PAGE_COLUMNS + TEACHER_FROM
+    # Natijalarning katta qismi shu o'qituvchiniki bo'lsa: results ni id tartibida
+    # o'qib, LIMIT ga yetganda to'xtash. CROSS JOIN rejalashtiruvchiga tests dan
+    # boshlab, keyin hamma natijalarni vaqtinchalik B-daraxtda saralashga yo'l qo'ymaydi
+    PAGE_BY_ID = PAGE_COLUMNS + '''
+    FROM results r
+    CROSS JOIN tests t ON r.test_id = t.id
+    JOIN users u ON r.oquvchi_id = u.id
+    WHERE t.oqituvchi_id = ?
+    '''
+    COUNT_FOR_TEACHER = "SELECT COUNT(*)" + TEACHER_FROM
+    # O'qituvchi natijalari va jami natijalar (test_stats dan, results skanerlanmaydi)
+    TEACHER_SHARE = '''
+    SELECT COALESCE(SUM(s.urinishlar), 0), (SELECT COALESCE(SUM(urinishlar), 0) FROM test_stats)
+    FROM test_stats s
+    JOIN tests t ON s.test_id = t.id
+    WHERE t.oqituvchi_id = ?
+    '''
+    # Triggerlar yuritadigan test_stats dan: o'qituvchi testlari soni bo'yicha
+    COUNT_FROM_STATS = '''
+    SELECT COALESCE(SUM({column}), 0)
+    FROM test_stats s
+    JOIN tests t ON s.test_id = t.id
+    WHERE t.oqituvchi_id = ?
+    '''
+    FOR_STUDENT = '''
+    SELECT t.nomi, r.togri_javoblar, r.foiz, r.otganmi, r.vaqt
+    FROM results r
+    JOIN tests t ON r.test_id = t.id
+    WHERE r.oquvchi_id = ?
+    '''
+    INSERT = '''
+    INSERT INTO results (oquvchi_id, test_id, togri_javoblar, foiz, otganmi, javoblar)
+    VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    INSERT_ATTEMPT = '''
+    INSERT INTO student_test_attempts (oquvchi_id, test_id)
+    VALUES (?, ?)
+    '''
+    # Qayta baholash uchun: javoblari saqlangan urinishlar id tartibida
+    ANSWERS_FOR_TEST = '''
+    SELECT id, javoblar, togri_javoblar, foiz, otganmi
+    FROM results
+    WHERE test_id = ? AND javoblar IS NOT NULL AND id > ?
+    ORDER BY id LIMIT ?
+    '''
+    COUNT_WITHOUT_ANSWERS = 'SELECT COUNT(*) FROM results WHERE test_id = ? AND javoblar IS NULL'
+    UPDATE_SCORE = '''
+    UPDATE results SET togri_javoblar = ?, foiz = ?, otganmi = ?
+    WHERE id = ?
+    '''
+
+    def for_teacher(self, teacher_id, filters=None, conn=None):
+        query, params = self._teacher_query(teacher_id, filters)
+        with use_session(conn) as conn:
+            return conn.execute(query, params).fetchall()
+
+    def iter_for_teacher(self, teacher_id, filters=None, chunk_size=1000, conn=None):
+        """Natijalarni fetchmany bilan bo'laklab berish (xotirada faqat bitta bo'lak turadi)"""
+        query, params = self._teacher_query(teacher_id, filters)
+        with use_session(conn) as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+    def page_for_teacher(self, teacher_id, filters=None, after_id=None, before_id=None,
+                         limit=PAGE_SIZE, conn=None):
+        """Keyset sahifalash: after_id dan keyingi yoki before_id dan oldingi limit ta qator.
+
+        Qatorlar har doim id o'sish tartibida qaytadi:
+        (id, ism, nomi, togri_javoblar, foiz, otganmi, vaqt)
+        """
+        with use_session(conn) as conn:
+            base = self.PAGE_BY_ID if self._scan_by_id(conn, teacher_id, filters, limit) else self.PAGE_FOR_TEACHER
+            query, params = self._teacher_query(teacher_id, filters, base)
+            if before_id is not None:
+                query += " AND r.id < ? ORDER BY r.id DESC LIMIT ?"
+                params += [before_id, limit]
+            else:
+                query += " AND r.id > ? ORDER BY r.id LIMIT ?"
+                params += [after_id or 0, limit]
+            rows = conn.execute(query, params).fetchall()
+        if before_id is not None:
+            rows.reverse()
+        return rows
+
+    def _scan_by_id(self, conn, teacher_id, filters, limit):
+        """results ni id tartibida o'qish arzonroqmi.
+
+        Sahifa uchun taxminan limit * jami / o'qituvchiniki qator ko'riladi;
+        indeks bo'yicha esa o'qituvchining hamma qatorlari olinib saralanadi.
+        Tor filtrda (ism, test) mos qatorlar kam - indeks har doim yaxshi.
+        """
+        if filters is not None and filters.selective():
+            return False
+        own, total = conn.execute(self.TEACHER_SHARE, (teacher_id,)).fetchone()
+        return own * own >= limit * total
+
+    def count_for_teacher(self, teacher_id, filters=None, conn=None):
+        if filters is None or filters.countable():
+            query, params = self._count_from_stats(teacher_id, filters)
+        else:
+            query, params = self._teacher_query(teacher_id, filters, self.COUNT_FOR_TEACHER)
+        with use_session(conn) as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def _count_from_stats(self, teacher_id, filters):
+        otganmi = filters.otganmi if filters is not None else None
+        column = {None: 's.urinishlar', True: 's.otganlar', False: 's.urinishlar - s.otganlar'}[otganmi]
+        query, params = self.COUNT_FROM_STATS.format(column=column), [teacher_id]
+        if filters is not None and filters.test_nomi:
+            query += " AND t.nomi = ?"
+            params.append(filters.test_nomi)
+        return query, params
+
+    def for_student(self, student_id, conn=None):
+        with use_session(conn) as conn:
+            return conn.execute(self.FOR_STUDENT, (student_id,)).fetchall()
+
+    def record(self, student_id, test_id, correct, percentage, passed, answers=None, conn=None):
+        """Natija va urinishni bitta tranzaksiyada yozish (answers - "AC B..." satri)"""
+        with use_session(conn) as conn:
+            result_id = conn.execute(
+                self.INSERT, (student_id, test_id, correct, percentage, passed, answers)
+            ).lastrowid
+            conn.execute(self.INSERT_ATTEMPT, (student_id, test_id))
+            # Ishlangan test o'quvchining ro'yxatidan chiqishi kerak
+            on_commit(conn, lambda: tests.invalidate_available(student_id))
+        return result_id
+
+    def record_many(self, rows, conn=None):
+        """Bir nechta natijani bitta tranzaksiyada yozish (guruhli commit).
+
+        rows: (student_id, test_id, correct, percentage, passed, answers) qatorlari.
+        Har bir natija o'z SAVEPOINT ida yoziladi: testni allaqachon ishlagan
+        o'quvchining qatori qolganlariga ta'sir qilmaydi, uning o'rniga None qaytadi.
+        """
+        result_ids = []
+        with use_session(conn) as conn:
+            if not conn.in_transaction:
+                # Aks holda eng tashqi RELEASE har bir qatorni alohida commit qiladi
+                conn.execute("BEGIN IMMEDIATE")
+            for row in rows:
+                conn.execute("SAVEPOINT natija")
+                try:
+                    result_id = conn.execute(self.INSERT, row).lastrowid
+                    conn.execute(self.INSERT_ATTEMPT, row[:2])
+                except sqlite3.IntegrityError:
+                    conn.execute("ROLLBACK TO natija")
+                    result_id = None
+                conn.execute("RELEASE natija")
+                result_ids.append(result_id)
+            students = {row[0] for row in rows}
+            on_commit(conn, lambda: tests.invalidate_available(*students))
+        return result_ids
+
+    def answers_for_test(self, test_id, after_id=0, limit=5000, conn=None):
+        """Keyset bo'lak: (id, javoblar, togri_javoblar, foiz, otganmi)"""
+        with use_session(conn) as conn:
+            return conn.execute(self.ANSWERS_FOR_TEST, (test_id, after_id, limit)).fetchall()
+
+    def count_without_answers(self, test_id, conn=None):
+        """Javoblari saqlanmagan (qayta baholab bo'lmaydigan) eski urinishlar soni"""
+        with use_session(conn) as conn:
+            return conn.execute(self.COUNT_WITHOUT_ANSWERS, (test_id,)).fetchone()[0]
+
+    def update_scores(self, rows, conn=None):
+        """rows: (togri_javoblar, foiz, otganmi, id) qatorlari"""
+        with use_session(conn) as conn:
+            conn.executemany(self.UPDATE_SCORE, rows)
+
+    def _teacher_query(self, teacher_id, filters, base=None):
+        query, params = base or self.FOR_TEACHER, [teacher_id]
+        if filters is not None:
+            extra, extra_params = filters.to_sql(use_fts=fts_enabled())
+            query += extra
+            params += extra_params
+        return query, params
+
+
+class StatsRepository:
+    """Trigger yuritadigan yig'ma jadvallardan o'qish (results skanerlanmaydi)"""
+    BUCKETS = 10
+
+    # (test_id, nomi, urinishlar, otganlar, o'rtacha foiz, min, max)
+    FOR_TEACHER_TESTS = '''
+    SELECT t.id, t.nomi, s.urinishlar, s.otganlar,
+           s.foiz_yigindi / s.urinishlar, s.foiz_min, s.foiz_max
+    FROM tests t
+    JOIN test_stats s ON s.test_id = t.id
+    WHERE t.oqituvchi_id = ? AND s.urinishlar > 0
+    ORDER BY t.nomi
+    '''
+    # (oquvchi_id, ism, urinishlar, otganlar, o'rtacha foiz, min, max)
+    FOR_TEACHER_STUDENTS = '''
+    SELECT u.id, u.ism, s.urinishlar, s.otganlar,
+           s.foiz_yigindi / s.urinishlar, s.foiz_min, s.foiz_max
+    FROM student_stats s
+    JOIN users u ON u.id = s.oquvchi_id
+    WHERE s.oqituvchi_id = ? AND s.urinishlar > 0
+    ORDER BY u.ism
+    '''
+    HISTOGRAM = "SELECT bucket, soni FROM test_histogram WHERE test_id = ?"
+
+    def for_teacher_tests(self, teacher_id, conn=None):
+        with use_session(conn) as conn:
+            return conn.execute(self.FOR_TEACHER_TESTS, (teacher_id,)).fetchall()
+
+    def for_teacher_students(self, teacher_id, conn=None):
+        with use_session(conn) as conn:
+            return conn.execute(self.FOR_TEACHER_STUDENTS, (teacher_id,)).fetchall()
+
+    def histogram(self, test_id, conn=None):
+        """Har bir 10 foizlik oraliqdagi natijalar soni (uzunligi BUCKETS bo'lgan ro'yxat)"""
+        counts = [0] * self.BUCKETS
+        with use_session(conn) as conn:
+            for bucket, soni in conn.execute(self.HISTOGRAM, (test_id,)):
+                counts[bucket] = soni
+        return counts
+
+
+users = UsersRepository()
+tests = TestsRepository()
+questions = QuestionsRepository()
+results = ResultsRepository()
+stats = StatsRepository()
@@ -0,0 +1,303 @@
+"""Server rejimi: bazani bitta jarayon boshqaradi, laboratoriya kompyuterlari HTTP/JSON orqali ulanadi.
+
+    python -m server --host 0.0.0.0 --port 8765 --db edu_evaluation.db
+    EDU_API_URL=http://server:8765 python version2.py    # mijoz (o'quvchi rejimi)
+
+Yo'llar (token - kirishda olinadi, "Authorization: Bearer <token>" sarlavhasida,
+SESSION_TTL sekunddan keyin eskiradi):
+
+    POST /api/login            {"login", "password", "role"} -> {"token", "user"}
+    POST /api/logout           tokenni bekor qilish
+    GET  /api/tests?after_id=  o'quvchi hali ishlamagan testlar -> {"tests": [[id, nomi], ...]}
+    GET  /api/tests/<id>       savollar (javob kalitisiz) -> {"id", "questions"}
+    POST /api/tests/<id>/submit {"answers": ["A", null, "C", ...]} -> baho
+    GET  /api/results          o'quvchining natijalari
+
+O'qish so'rovlari ulanishlar hovuzida, fon oqimlarida bajariladi. Barcha
+natijalar submissions.SubmissionQueue orqali bitta yozuvchi oqimga keladi:
+avval jurnalga yoziladi, keyin bir vaqtda kelganlari bitta tranzaksiyada
+yoziladi - SQLite yozish qulfi uchun mijozlar o'zaro kurashmaydi.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import auth
+import database
+import grading
+import repository as repo
+import submissions
+
+
+HOST = os.environ.get('EDU_SERVER_HOST', '127.0.0.1')
+PORT = int(os.environ.get('EDU_SERVER_PORT', 8765))
+READ_WORKERS = int(os.environ.get('EDU_SERVER_WORKERS', 8))    # o'qish va parol tekshirish oqimlari
+TEST_CACHE_SECONDS = 30     # yuklangan test (kalit bilan) xotirada turadigan vaqt
+SESSION_TTL = float(os.environ.get('EDU_SESSION_TTL', 8 * 3600))    # sekund: token shuncha vaqt amal qiladi
+MAX_BODY = 1024 * 1024
+ANSWER_LETTERS = ('A', 'B', 'C', 'D')
+
+logger = logging.getLogger('edu.server')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 403: 'Forbidden', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error',
+           503: 'Service Unavailable'}
+
+
+class ExamServer:
+    def __init__(self, read_workers=READ_WORKERS, submission_queue=None):
+        self.readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix='db-reader')
+        self.submissions = submission_queue or submissions.SubmissionQueue()
+        self.sessions = {}      # token -> (foydalanuvchi, eskirish vaqti)
+        self._tests = {}        # test_id -> (yuklangan vaqt, LoadedTest)
+        self.routes = [
+            ('POST', ('api', 'login'), self.login),
+            ('POST', ('api', 'logout'), self.logout),
+            ('GET', ('api', 'tests'), self.available_tests),
+            ('GET', ('api', 'tests', None), self.get_test),
+            ('POST', ('api', 'tests', None, 'submit'), self.submit),
+            ('GET', ('api', 'results'), self.student_results),
+        ]
+
+    async def read(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.readers, fn, *args)
+
+    # ---------- yo'llar ----------
+    async def login(self, request, user):
+        body = _object(request)
+        try:
+            login, password, role = body['login'], body['password'], body.get('role', 'student')
+        except KeyError:
+            raise HTTPError(400, "login va password kerak")
+        if role != 'student':
+            # O'qituvchi paneli bazaga to'g'ridan-to'g'ri ulanadi
+            raise HTTPError(403, "Server orqali faqat o'quvchilar kiradi")
+        found, error = await self.read(auth.authenticate, login, password, role)
+        if error:
+            raise HTTPError(401, error)
+        self.prune_sessions()
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = (found, time.monotonic() + SESSION_TTL)
+        return {'token': token, 'user': found}
+
+    async def logout(self, request, user):
+        self.sessions.pop(request['token'], None)
+        return {}
+
+    def prune_sessions(self):
+        """Eskirgan tokenlarni o'chirish (chiqishni bosmay ketganlar)"""
+        now = time.monotonic()
+        for token in [token for token, (_, expires) in self.sessions.items() if expires <= now]:
+            del self.sessions[token]
+
+    async def available_tests(self, request, user):
+        after_id = _int(request['query'].get('after_id', ['0'])[0])
+        rows = await self.read(repo.tests.available_for_student, user['id'], after_id)
+        return {'tests': [list(row) for row in rows], 'page_size': repo.tests.AVAILABLE_PAGE_SIZE}
+
+    async def load_test(self, test_id):
+        cached = self._tests.get(test_id)
+        if cached is not None and time.monotonic() - cached[0] < TEST_CACHE_SECONDS:
+            return cached[1]
+        test = await self.read(grading.load_test, test_id)
+        self._tests[test_id] = (time.monotonic(), test)
+        return test
+
+    async def get_test(self, request, user, test_id):
+        test = await self.load_test(_int(test_id))
+        if not test.questions:
+            raise HTTPError(404, "Test topilmadi yoki unda savollar yo'q")
+        # Javob kaliti mijozga yuborilmaydi - baholash serverda
+        return {'id': test.id, 'questions': [list(question) for question in test.questions]}
+
+    async def submit(self, request, user, test_id):
+        answers = _object(request).get('answers')
+        if not isinstance(answers, list):
+            raise HTTPError(400, "answers ro'yxati kerak")
+        if any(answer is not None and answer not in ANSWER_LETTERS for answer in answers):
+            raise HTTPError(400, "Javoblar A, B, C, D yoki null bo'lishi kerak")
+        test = await self.load_test(_int(test_id))
+        if not test.questions:
+            raise HTTPError(404, "Test topilmadi")
+        if len(answers) > test.total:
+            raise HTTPError(400, f"Javoblar soni savollar sonidan ({test.total}) ko'p")
+        grade = grading.engine.score(test, answers)
+        submission = self.submissions.enqueue(user['id'], grade)
+        try:
+            result_id = await asyncio.wrap_future(submission.committed)
+        except submissions.NotCommittedError as error:
+            raise HTTPError(503, str(error))
+        if result_id is None:
+            raise HTTPError(409, "Bu testni allaqachon ishlagansiz")
+        return {'result_id': result_id, 'test_id': grade.test_id, 'correct': grade.correct,
+                'total': grade.total, 'percentage': grade.percentage, 'passed': grade.passed}
+
+    async def student_results(self, request, user):
+        rows = await self.read(repo.results.for_student, user['id'])
+        return {'results': [list(row) for row in rows]}
+
+    # ---------- HTTP ----------
+    def route(self, method, path):
+        parts = tuple(part for part in path.split('/') if part)
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            if len(pattern) != len(parts):
+                continue
+            if all(p is None or p == part for p, part in zip(pattern, parts)):
+                if route_method == method:
+                    return handler, [part for p, part in zip(pattern, parts) if p is None]
+                allowed = True
+        raise HTTPError(405 if allowed else 404, "Noto'g'ri so'rov yo'li")
+
+    def authorize(self, handler, token):
+        if handler == self.login:
+            return None
+        session = self.sessions.get(token)
+        if session is None:
+            raise HTTPError(401, "Avval tizimga kiring")
+        user, expires = session
+        if expires <= time.monotonic():
+            del self.sessions[token]
+            raise HTTPError(401, "Sessiya muddati tugagan, qaytadan kiring")
+        return user
+
+    async def dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        handler, params = self.route(method, url.path)
+        token = headers.get('authorization', '').removeprefix('Bearer ').strip()
+        user = self.authorize(handler, token)
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            raise HTTPError(400, "JSON noto'g'ri")
+        request = {'query': parse_qs(url.query), 'json': payload, 'token': token}
+        return await handler(request, user, *params)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = _content_length(headers)
+                if length is None:
+                    # Tana qayerda tugashi noma'lum - javobdan keyin ulanish yopiladi
+                    status, payload = 400, {'error': "Content-Length noto'g'ri"}
+                    body = None
+                elif length > MAX_BODY:
+                    status, payload = 413, {'error': "So'rov juda katta"}
+                    body = None
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, payload = 200, await self.dispatch(method, target, headers, body)
+                    except HTTPError as error:
+                        status, payload = error.status, {'error': error.message}
+                    except Exception as error:
+                        logger.exception("%s %s", method, target)
+                        status, payload = 500, {'error': f"Server xatosi: {error}"}
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1' and body is not None)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        """Serverni ishga tushirish; ready(port) - tinglash boshlanganda (sinov uchun)"""
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_BODY)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.readers.shutdown(wait=False)
+            await asyncio.get_running_loop().run_in_executor(None, self.submissions.close)
+
+
+def _object(request):
+    if not isinstance(request['json'], dict):
+        raise HTTPError(400, "JSON obyekt kutilgan edi")
+    return request['json']
+
+
+def _content_length(headers):
+    """Content-Length sarlavhasi; noto'g'ri bo'lsa None"""
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"Son kutilgan edi: {value!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m server', description="Edu Evaluation imtihon serveri")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--db', help="baza fayli (standart: EDU_DB_PATH)")
+    parser.add_argument('--workers', type=int, default=READ_WORKERS)
+    parser.add_argument('--journal-dir', default=submissions.JOURNAL_DIR,
+                        help="qabul qilingan natijalar jurnallari papkasi (standart: baza yonidagi journal)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    # O'quvchilar + bitta yozuvchi ulanishi
+    database.configure_pool(args.db or database.DB_PATH, size=args.workers + 1)
+    database.init_db()
+    server = ExamServer(read_workers=args.workers, submission_queue=submissions.SubmissionQueue(journal_dir=args.journal_dir))
+    try:
+        asyncio.run(server.serve(args.host, args.port,
+                                 ready=lambda port: logger.info("Server tayyor: http://%s:%s", args.host, port)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Dastur ishga tushish vaqtini o'lchash va og'ir modullarni kechiktirib yuklash.
+
+numpy, openpyxl va pyarrow faqat baholash/eksport/importda kerak, shuning uchun
+ular kirish oynasi chizilgandan keyin fon oqimida oldindan yuklanadi.
+
+Ishlatish:
+    python version2.py --startup-time    # kirish oynasi chizilgach vaqtni chiqarish
+    python version2.py --startup-check   # chiqarib, byudjetdan oshsa 1 kodi bilan chiqish
+    python -X importtime version2.py     # har bir import uchun batafsil hisobot
+"""
+import importlib
+import sys
+import threading
+import time
+
+
+# Ishga tushishda yuklanmasligi kerak bo'lgan modullar
+HEAVY_MODULES = ('numpy', 'pandas', 'openpyxl', 'pyarrow')
+# Kirish oynasidan keyin fon oqimida oldindan yuklanadiganlari
+PRELOAD_MODULES = ('numpy', 'openpyxl')
+STARTUP_BUDGET_MS = 500
+
+
+def preload(modules=PRELOAD_MODULES):
+    """Modullarni fon oqimida import qilish (o'rnatilmaganlari jimgina o'tkaziladi)"""
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=run, name='preload', daemon=True)
+    thread.start()
+    return thread
+
+
+def report(t0, budget_ms=STARTUP_BUDGET_MS, stream=None):
+    """t0 dan hozirgacha o'tgan vaqtni va oldindan yuklangan og'ir modullarni chiqarish.
+
+    Hammasi joyida bo'lsa True qaytaradi.
+    """
+    stream = stream or sys.stderr
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    eager = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    print(f"[startup] kirish oynasigacha: {elapsed_ms:.0f} ms (byudjet {budget_ms} ms)", file=stream)
+    if eager:
+        print(f"[startup] ishga tushishda yuklangan og'ir modullar: {', '.join(eager)}", file=stream)
+    return elapsed_ms <= budget_ms and not eager
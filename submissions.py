@@ -0,0 +1,342 @@
+"""Natijalarni kechiktirib yozish: jurnal + guruhli commit.
+
+Imtihon oxirida butun zal "Yakunlash" ni bir vaqtda bossa, har bir finish_test
+o'z tranzaksiyasini ochib SQLite yozish qulfi uchun kurashadi. Navbat bilan:
+
+  1. natija avval jurnal fayliga (faqat oxiriga qo'shiladigan JSON qatorlar)
+     yoziladi va fsync qilinadi - shu paytdan natija qabul qilingan;
+     bir vaqtda kelganlari bitta fsync bilan yoziladi;
+  2. yozuvchi oqim navbatdagilarning hammasini bitta tranzaksiyada
+     results / student_test_attempts ga yozadi (repo.results.record_many) va
+     jurnalga {"committed": [...]} belgisini qo'yadi.
+
+Har bir jarayonning o'z jurnali bor: JOURNAL_DIR/submissions-<kompyuter>-<pid>.journal,
+ochiq turguncha fayl qulflangan (fcntl.flock / msvcrt.locking). Jarayon toza
+yopilsa jurnali o'chiriladi. Yiqilgan jarayonning jurnalini shu kompyuterda
+keyingi ishga tushgan navbat egallaydi: belgilanmagan yozuvlarini o'z jurnaliga
+ko'chirib, qayta yozadi; UNIQUE (oquvchi_id, test_id) tufayli natija ikki marta
+yozilmaydi. Boshqa jarayon ishlatayotgan (qulflangan) faylga tegilmaydi.
+
+    queue = get_queue()
+    submission = queue.submit(student_id, grade)      # jurnalga yozilguncha kutadi
+    result_id = submission.committed.result(timeout)   # bazaga tushguncha (ixtiyoriy)
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+import database
+import repository as repo
+
+
+# Berilmasa - baza fayli yonidagi journal papkasi
+JOURNAL_DIR = os.environ.get('EDU_SUBMIT_JOURNAL_DIR')
+BATCH_SIZE = 500            # bitta tranzaksiyadagi eng ko'p natijalar
+RETRY_DELAY = 0.5           # sekund: baza band bo'lsa qayta urinish oralig'i (har urinishda oshadi)
+RETRY_LIMIT = 5             # band baza uchun qayta urinishlar; keyin natija jurnalda qoladi
+CLOSE_TIMEOUT = 15          # sekund: dastur yopilganda navbatdagilar yozilishini kutish
+JOURNAL_MAX_BYTES = 4 * 1024 * 1024     # hammasi yozilgach jurnal shundan katta bo'lsa tozalanadi
+
+logger = logging.getLogger('edu.submissions')
+_STOP = object()
+
+
+class NotCommittedError(RuntimeError):
+    """Natija jurnalda saqlangan, lekin bazaga yozilmadi (keyingi ishga tushishda qayta yoziladi)"""
+
+
+def default_journal_dir():
+    return JOURNAL_DIR or os.path.join(os.path.dirname(os.path.abspath(database.get_pool().db_path)), 'journal')
+
+
+def journal_name(pid=None):
+    return f"submissions-{socket.gethostname()}-{pid or os.getpid()}.journal"
+
+
+def _try_lock(f):
+    """Faylni shu ochilish uchun band qilish; boshqa jarayon band qilgan bo'lsa False"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _remove(f, path):
+    """Qulflangan faylni o'chirish: POSIX da qulf qo'yib yuborilishidan oldin, Windows da keyin"""
+    if fcntl is not None:
+        os.remove(path)
+        f.close()
+    else:
+        f.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _read_journal(f):
+    """Jurnaldagi bazaga yozilmagan yozuvlar: [(seq, row), ...] va eng katta seq"""
+    f.seek(0)
+    entries, committed = {}, set()
+    for line in f:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue    # yiqilish paytida chala yozilgan oxirgi qator
+        if 'committed' in record:
+            committed.update(record['committed'])
+        else:
+            entries[record['seq']] = record['row']
+    f.seek(0, os.SEEK_END)
+    pending = [(seq, tuple(row)) for seq, row in sorted(entries.items()) if seq not in committed]
+    return pending, max(entries, default=0)
+
+
+@dataclass
+class Submission:
+    row: tuple              # (student_id, test_id, correct, percentage, passed, answers)
+    seq: int = 0
+    accepted: threading.Event = field(default_factory=threading.Event)
+    committed: Future = field(default_factory=Future)     # results.id yoki None (allaqachon ishlangan)
+    error: Exception = None
+
+
+class SubmissionQueue:
+    def __init__(self, journal_path=None, batch_size=BATCH_SIZE, journal_dir=None):
+        if journal_path is None:
+            journal_path = os.path.join(journal_dir or default_journal_dir(), journal_name())
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self._incoming = queue.SimpleQueue()    # jurnalga hali yozilmaganlar
+        self._pending = queue.SimpleQueue()     # jurnalda bor, bazada yo'q
+        self._lock = threading.Lock()           # jurnal fayli
+        self._uncommitted = 0
+        self._closed = False
+        self.batches = 0
+        self.committed_count = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+        self._journal = open(journal_path, 'a+', encoding='utf-8')
+        if not _try_lock(self._journal):
+            self._journal.close()
+            raise RuntimeError(f"Jurnal boshqa jarayonda ochiq: {journal_path}")
+        recovered = self._recover()
+        for item in recovered:
+            self._uncommitted += 1
+            self._pending.put(item)
+
+        self._journal_thread = threading.Thread(target=self._journal_loop, name='submit-journal', daemon=True)
+        self._commit_thread = threading.Thread(target=self._commit_loop, name='submit-commit', daemon=True)
+        self._journal_thread.start()
+        self._commit_thread.start()
+
+    def _recover(self):
+        """O'z jurnalimiz va shu kompyuterdagi yiqilgan jarayonlar jurnallaridagi yozilmagan natijalar"""
+        pending, self._seq = _read_journal(self._journal)
+        recovered = [Submission(row, seq) for seq, row in pending]
+        if self._journal.tell() and not self._ends_with_newline():
+            self._journal.write('\n')     # chala qatorga keyingi yozuv qo'shilib ketmasin
+
+        pattern = os.path.join(os.path.dirname(os.path.abspath(self.journal_path)), journal_name('*'))
+        for path in sorted(glob.glob(pattern)):
+            if os.path.abspath(path) == os.path.abspath(self.journal_path):
+                continue
+            adopted = self._adopt(path)
+            recovered += adopted
+            if adopted:
+                logger.warning("%s dan %d ta yozilmagan natija olindi", path, len(adopted))
+
+        for item in recovered:
+            item.accepted.set()
+        if recovered:
+            logger.warning("Jurnaldan %d ta yozilmagan natija tiklandi", len(recovered))
+        return recovered
+
+    def _adopt(self, path):
+        """Egasi yo'q (qulflanmagan) jurnalni o'z jurnalimizga ko'chirib, o'chirish"""
+        try:
+            f = open(path, 'r+', encoding='utf-8')
+        except OSError:
+            return []   # boshqa navbat allaqachon egallab o'chirgan
+        if not _try_lock(f) or os.fstat(f.fileno()).st_nlink == 0:
+            f.close()   # egasi ishlayapti yoki fayl biz ochgandan keyin o'chirilgan
+            return []
+        pending, _ = _read_journal(f)
+        items = []
+        for _, row in pending:
+            self._seq += 1
+            items.append(Submission(row, self._seq))
+        if items:
+            self._journal.write(''.join(json.dumps({'seq': item.seq, 'row': item.row}) + '\n' for item in items))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        _remove(f, path)
+        return items
+
+    def _ends_with_newline(self):
+        self._journal.seek(self._journal.tell() - 1)
+        return self._journal.read(1) == '\n'
+
+    def enqueue(self, student_id, grade):
+        """Natijani navbatga qo'yib, kutmasdan qaytish (committed jurnalga yozilgandan keyingina keladi)"""
+        if self._closed:
+            raise RuntimeError("Natijalar navbati yopilgan")
+        item = Submission((student_id, grade.test_id, grade.correct, grade.percentage, grade.passed, grade.answers))
+        self._incoming.put(item)
+        return item
+
+    def submit(self, student_id, grade, timeout=None):
+        """Natijani navbatga qo'yish; jurnalga yozilib fsync qilingach qaytadi"""
+        item = self.enqueue(student_id, grade)
+        if not item.accepted.wait(timeout):
+            raise TimeoutError("Natija jurnalga yozilmadi")
+        if item.error is not None:
+            raise item.error
+        return item
+
+    @staticmethod
+    def _drain(source, first, limit):
+        batch = [first]
+        while len(batch) < limit:
+            try:
+                batch.append(source.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _journal_loop(self):
+        # Oldingi fsync davom etayotganda kelganlar keyingi guruhga yig'iladi
+        while True:
+            batch = self._drain(self._incoming, self._incoming.get(), self.batch_size)
+            stop = _STOP in batch
+            items = [item for item in batch if item is not _STOP]
+            if items:
+                lines = []
+                for item in items:
+                    self._seq += 1
+                    item.seq = self._seq
+                    lines.append(json.dumps({'seq': item.seq, 'row': item.row}) + '\n')
+                try:
+                    with self._lock:
+                        self._journal.write(''.join(lines))
+                        self._journal.flush()
+                        os.fsync(self._journal.fileno())
+                        self._uncommitted += len(items)
+                except OSError as error:
+                    for item in items:
+                        item.error = error
+                        item.committed.set_exception(error)
+                    items = []
+                for item in items:
+                    self._pending.put(item)
+                for item in batch:
+                    if item is not _STOP:
+                        item.accepted.set()
+            if stop:
+                self._pending.put(_STOP)
+                return
+
+    def _commit_loop(self):
+        while True:
+            batch = self._drain(self._pending, self._pending.get(), self.batch_size)
+            stop = _STOP in batch
+            items = [item for item in batch if item is not _STOP]
+            if items:
+                self._commit(items)
+            if stop:
+                return
+
+    def _commit(self, items):
+        attempt = 0
+        while True:
+            try:
+                result_ids = repo.results.record_many([item.row for item in items])
+                break
+            except Exception as error:
+                if _is_busy(error) and attempt < RETRY_LIMIT:
+                    # Baza band - natijalar jurnalda turibdi, biroz kutib qayta urinamiz
+                    attempt += 1
+                    logger.warning("Natijalarni yozib bo'lmadi, qayta urinamiz (%d): %s", attempt, error)
+                    time.sleep(RETRY_DELAY * attempt)
+                    continue
+                # Jurnalda qoladi va keyingi ishga tushishda qayta urinib ko'riladi
+                logger.exception("Natijalarni yozishda xatolik")
+                for item in items:
+                    item.committed.set_exception(NotCommittedError(
+                        f"Natija qabul qilindi, lekin bazaga yozilmadi ({error}). "
+                        f"Dastur qayta ishga tushganda yoziladi"))
+                return
+
+        with self._lock:
+            self._journal.write(json.dumps({'committed': [item.seq for item in items]}) + '\n')
+            self._journal.flush()
+            self._uncommitted -= len(items)
+            if self._uncommitted == 0 and self._journal.tell() > JOURNAL_MAX_BYTES:
+                self._journal.truncate(0)     # fayl faqat shu jarayonniki (qulflangan)
+        self.batches += 1
+        self.committed_count += len(items)
+        for item, result_id in zip(items, result_ids):
+            item.committed.set_result(result_id)
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Navbatdagilarni bazaga yozib, oqimlarni to'xtatish.
+
+        timeout ichida tugamasa, yozilmaganlar jurnalda qoladi va keyingi
+        ishga tushishda yoziladi.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._incoming.put(_STOP)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in (self._journal_thread, self._commit_thread):
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if self._commit_thread.is_alive():
+            # Fayl ochiq (qulflangan) qoladi - jarayon tugashi bilan bo'shaydi
+            logger.warning("Natijalar yozilib ulgurmadi, jurnalda qoldi: %s", self.journal_path)
+            return
+        with self._lock:
+            if self._uncommitted == 0:
+                _remove(self._journal, self.journal_path)
+            else:
+                self._journal.close()
+
+
+def _is_busy(error):
+    """Vaqtincha xato: boshqa yozuvchi bazani band qilgan"""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """Umumiy navbat (birinchi chaqirilganda ochiladi, dastur yopilganda bo'shatiladi)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = SubmissionQueue()
+            atexit.register(_queue.close)
+        return _queue
@@ -0,0 +1,38 @@
+"""Umumiy fixture lar: har bir test uchun vaqtinchalik baza"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import passwords  # noqa: E402
+import repository as repo  # noqa: E402
+
+FAST_HASH = {'iterations': 1000}
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Migratsiyalari qo'llangan bo'sh baza; yo'lini qaytaradi"""
+    path = str(tmp_path / 'test.db')
+    database.configure_pool(path)
+    database.init_db()
+    repo.users.invalidate()
+    repo.tests.available_cache.clear()
+    yield path
+    database.get_pool().close()
+
+
+def add_user(login, role='student', password='parol'):
+    parol_hash, salt = passwords.hash_password(password, params=FAST_HASH)
+    return repo.users.add(f"{login} ism", login, parol_hash, salt, role)
+
+
+def add_test(teacher_id, answer_key='ABCD', nomi='Test'):
+    with database.db_session() as conn:
+        test_id = repo.tests.create(nomi, teacher_id, len(answer_key), conn=conn)
+        repo.questions.add_many([(test_id, f"{n + 1}-savol", 'a', 'b', 'c', 'd', letter)
+                                 for n, letter in enumerate(answer_key)], conn=conn)
+    return test_id
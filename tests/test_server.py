@@ -0,0 +1,97 @@
+"""Imtihon serveri: localhost da ishga tushirib, client.ApiBackend orqali so'rovlar"""
+import asyncio
+import socket
+import threading
+
+import pytest
+
+import client
+import server
+import submissions
+from conftest import add_test, add_user
+
+
+@pytest.fixture
+def api(db, tmp_path):
+    """Fon oqimida ishlayotgan server va unga ulangan ApiBackend"""
+    srv = server.ExamServer(read_workers=2,
+                            submission_queue=submissions.SubmissionQueue(journal_dir=str(tmp_path / 'journal')))
+    started = threading.Event()
+    state = {}
+
+    def ready(port):
+        state.update(port=port, loop=asyncio.get_running_loop(), task=asyncio.current_task())
+        started.set()
+
+    def run():
+        try:
+            asyncio.run(srv.serve('127.0.0.1', 0, ready=ready))
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(10)
+    yield client.ApiBackend(f"http://127.0.0.1:{state['port']}")
+    state['loop'].call_soon_threadsafe(state['task'].cancel)
+    thread.join(10)
+
+
+def test_login_submit_and_logout(api):
+    teacher_id = add_user('teacher', 'teacher')
+    student_id = add_user('student')
+    test_id = add_test(teacher_id, answer_key='ABCD')
+
+    assert api.authenticate('student', 'xato', 'student') == (None, "Noto'g'ri parol!")
+    user, error = api.authenticate('student', 'parol', 'student')
+    assert error is None and user['id'] == student_id
+    assert api.available_for_student(student_id) == [(test_id, 'Test')]
+
+    test = api.load_test(test_id)
+    assert len(test.questions) == 4 and test.answer_key == ''
+    grade = api.submit(student_id, test, ['A', 'B', 'C', None])
+    assert (grade.correct, grade.total, grade.passed) == (3, 4, True)
+    assert [row[0] for row in api.results_for_student(student_id)] == ['Test']
+
+    with pytest.raises(client.ApiError) as duplicate:
+        api.submit(student_id, test, ['A', 'B', 'C', 'D'])
+    assert duplicate.value.status == 409
+
+    api.logout()
+    with pytest.raises(client.ApiError) as after_logout:
+        api.available_for_student(student_id)
+    assert after_logout.value.status == 401
+
+
+def test_rejects_teachers_and_missing_token(api):
+    add_user('teacher', 'teacher')
+    user, error = api.authenticate('teacher', 'parol', 'teacher')
+    assert user is None and error
+
+    with pytest.raises(client.ApiError) as no_token:
+        api.request('GET', '/api/results')
+    assert no_token.value.status == 401
+
+
+def test_bad_answers_are_rejected(api):
+    teacher_id = add_user('teacher', 'teacher')
+    add_user('student')
+    test_id = add_test(teacher_id, answer_key='AB')
+    api.authenticate('student', 'parol', 'student')
+
+    for answers in (['A', 'E'], 'AB', ['A', 'B', 'C']):
+        with pytest.raises(client.ApiError) as bad:
+            api.request('POST', f'/api/tests/{test_id}/submit', {'answers': answers})
+        assert bad.value.status == 400
+    assert api.results_for_student(0) == []
+
+
+@pytest.mark.parametrize('length', ['abc', '-5'])
+def test_malformed_content_length_gets_400(api, length):
+    with socket.create_connection((api.host, api.port), timeout=10) as sock:
+        sock.sendall(f"POST /api/login HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode())
+        response = b''
+        while chunk := sock.recv(4096):
+            response += chunk
+    assert response.startswith(b'HTTP/1.1 400 ')
+    assert b'Connection: close' in response
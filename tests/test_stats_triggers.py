@@ -0,0 +1,95 @@
+"""Yig'ma jadvallar (test_stats, student_stats, test_histogram) triggerlar bilan
+results ga mos turishi: natijalarni qo'shish, o'zgartirish va o'chirishdan keyin
+ular database.rebuild_stats noldan hisoblagan qiymatlarga teng bo'lishi kerak.
+"""
+import random
+
+import database
+from conftest import add_test, add_user
+
+TABLES = {
+    'test_stats': "SELECT test_id, urinishlar, otganlar, round(foiz_yigindi, 6), foiz_min, foiz_max "
+                  "FROM test_stats WHERE urinishlar > 0 ORDER BY test_id",
+    'student_stats': "SELECT oqituvchi_id, oquvchi_id, urinishlar, otganlar, round(foiz_yigindi, 6), foiz_min, foiz_max "
+                     "FROM student_stats WHERE urinishlar > 0 ORDER BY oqituvchi_id, oquvchi_id",
+    'test_histogram': "SELECT test_id, bucket, soni FROM test_histogram WHERE soni > 0 ORDER BY test_id, bucket",
+}
+
+
+def snapshot(conn):
+    return {name: conn.execute(query).fetchall() for name, query in TABLES.items()}
+
+
+def assert_stats_match_results():
+    with database.db_session() as conn:
+        maintained = snapshot(conn)
+        database.rebuild_stats(conn)
+        rebuilt = snapshot(conn)
+        conn.rollback()
+    assert maintained == rebuilt
+
+
+def setup_school():
+    teachers = [add_user(f'teacher{i}', 'teacher') for i in range(2)]
+    students = [add_user(f'student{i}') for i in range(6)]
+    tests = [add_test(teachers[i % 2], nomi=f'Test {i}') for i in range(4)]
+    return students, tests
+
+
+def insert_result(conn, student_id, test_id, foiz):
+    return conn.execute(
+        "INSERT INTO results (oquvchi_id, test_id, togri_javoblar, foiz, otganmi) VALUES (?, ?, ?, ?, ?)",
+        (student_id, test_id, int(foiz // 25), foiz, foiz >= 60)).lastrowid
+
+
+def test_insert_update_delete_keep_stats_in_sync(db):
+    students, tests = setup_school()
+    rng = random.Random(13)
+    with database.db_session() as conn:
+        ids = [insert_result(conn, s, t, rng.choice([0, 25, 50, 60, 75, 99.5, 100]))
+               for s in students for t in tests]
+    assert_stats_match_results()
+
+    with database.db_session() as conn:
+        # Qayta baholash: foiz va holat o'zgaradi (min/max chetidagi qiymatlar ham)
+        for result_id in rng.sample(ids, 10):
+            foiz = rng.choice([0, 10, 55, 60, 100])
+            conn.execute("UPDATE results SET foiz = ?, otganmi = ? WHERE id = ?", (foiz, foiz >= 60, result_id))
+        # Natija boshqa o'qituvchining testiga o'tkazilsa student_stats ham ko'chishi kerak
+        conn.execute("DELETE FROM results WHERE oquvchi_id = ? AND test_id = ?", (students[0], tests[1]))
+        conn.execute("UPDATE results SET test_id = ? WHERE id = ?", (tests[1], ids[0]))
+    assert_stats_match_results()
+
+    with database.db_session() as conn:
+        for result_id in rng.sample(ids[1:], 8):
+            conn.execute("DELETE FROM results WHERE id = ?", (result_id,))
+    assert_stats_match_results()
+
+
+def test_deleting_extreme_result_recomputes_min_max(db):
+    students, tests = setup_school()
+    with database.db_session() as conn:
+        low = insert_result(conn, students[0], tests[0], 10)
+        insert_result(conn, students[1], tests[0], 50)
+        high = insert_result(conn, students[2], tests[0], 90)
+    with database.db_session() as conn:
+        conn.execute("DELETE FROM results WHERE id IN (?, ?)", (low, high))
+        row = conn.execute("SELECT urinishlar, foiz_min, foiz_max FROM test_stats WHERE test_id = ?",
+                           (tests[0],)).fetchone()
+    assert row == (1, 50, 50)
+    assert_stats_match_results()
+
+
+def test_rolled_back_insert_leaves_stats_unchanged(db):
+    students, tests = setup_school()
+    with database.db_session() as conn:
+        insert_result(conn, students[0], tests[0], 70)
+    try:
+        with database.db_session() as conn:
+            insert_result(conn, students[1], tests[0], 20)
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    with database.db_session() as conn:
+        assert conn.execute("SELECT urinishlar FROM test_stats WHERE test_id = ?", (tests[0],)).fetchone() == (1,)
+    assert_stats_match_results()
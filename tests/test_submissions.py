@@ -0,0 +1,108 @@
+"""Natijalar navbati: jurnaldan tiklash va commit xatolaridan keyin qayta yozish"""
+import json
+import os
+import sqlite3
+
+import pytest
+
+import client
+import database
+import grading
+import repository as repo
+import submissions
+from conftest import add_test, add_user
+
+
+def result_count(student_id, test_id):
+    with database.db_session() as conn:
+        return conn.execute("SELECT count(*) FROM results WHERE oquvchi_id = ? AND test_id = ?",
+                            (student_id, test_id)).fetchone()[0]
+
+
+def grade_row(student_id, test_id, answers):
+    grade = grading.engine.score(grading.load_test(test_id), answers)
+    return [student_id, grade.test_id, grade.correct, grade.percentage, grade.passed, grade.answers]
+
+
+@pytest.fixture
+def school(db):
+    teacher_id = add_user('teacher', 'teacher')
+    students = [add_user(f'student{i}') for i in range(3)]
+    return students, add_test(teacher_id)
+
+
+def test_crashed_journal_is_adopted_and_replayed_once(school, tmp_path):
+    (replayed, marked, already_written), test_id = school
+    # Yiqilish bazaga commit bilan "committed" belgisi orasida bo'lgan natija
+    repo.results.record_many([grade_row(already_written, test_id, 'ABCD')])
+
+    journal_dir = tmp_path / 'journal'
+    journal_dir.mkdir()
+    orphan = journal_dir / submissions.journal_name(os.getpid() + 100000)
+    lines = [json.dumps({'seq': 1, 'row': grade_row(marked, test_id, 'ABCD')}),
+             json.dumps({'seq': 2, 'row': grade_row(replayed, test_id, 'ABCA')}),
+             json.dumps({'seq': 3, 'row': grade_row(already_written, test_id, 'ABCD')}),
+             json.dumps({'committed': [1]}),
+             '{"seq": 4, "ro']     # chala yozilgan oxirgi qator
+    orphan.write_text('\n'.join(lines), encoding='utf-8')
+
+    for _ in range(2):     # ikkinchi ishga tushish hech narsa qo'shmasligi kerak
+        queue = submissions.SubmissionQueue(journal_dir=str(journal_dir))
+        queue.close()
+        assert not orphan.exists()
+        assert os.listdir(journal_dir) == []
+        assert result_count(replayed, test_id) == 1
+        assert result_count(marked, test_id) == 0    # belgilangan yozuv qayta yozilmaydi
+        assert result_count(already_written, test_id) == 1
+
+
+def test_busy_commit_is_retried_without_duplicate(school, tmp_path, monkeypatch):
+    (student_id, *_), test_id = school
+    record_many = repo.results.record_many
+    calls = []
+
+    def flaky(rows):
+        calls.append(rows)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError('database is locked')
+        return record_many(rows)
+
+    monkeypatch.setattr(repo.results, 'record_many', flaky)
+    monkeypatch.setattr(submissions, 'RETRY_DELAY', 0)
+    queue = submissions.SubmissionQueue(journal_dir=str(tmp_path / 'journal'))
+    backend = client.LocalBackend(queue)
+    try:
+        grade = backend.submit(student_id, grading.load_test(test_id), ['A', 'B', 'C', 'D'])
+        assert grade.passed and len(calls) == 2
+        with pytest.raises(ValueError):
+            backend.submit(student_id, grading.load_test(test_id), ['A', 'B', 'C', 'D'])
+    finally:
+        queue.close()
+    assert result_count(student_id, test_id) == 1
+
+
+def test_failed_commit_stays_in_journal_and_is_written_on_restart(school, tmp_path, monkeypatch):
+    (student_id, *_), test_id = school
+    journal_path = str(tmp_path / 'journal' / 'submissions.journal')
+
+    def broken(rows):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(repo.results, 'record_many', broken)
+        queue = submissions.SubmissionQueue(journal_path)
+        with pytest.raises(submissions.NotCommittedError):
+            client.LocalBackend(queue).submit(student_id, grading.load_test(test_id), ['A', 'B', 'C', 'D'])
+        queue.close()
+    assert os.path.exists(journal_path)
+    assert result_count(student_id, test_id) == 0
+
+    queue = submissions.SubmissionQueue(journal_path)
+    try:
+        # O'quvchi qayta yuborsa ham natija bitta bo'lib qoladi
+        item = queue.submit(student_id, grading.engine.score(grading.load_test(test_id), ['A', 'B', 'C', 'D']))
+        assert item.committed.result(10) is None
+    finally:
+        queue.close()
+    assert result_count(student_id, test_id) == 1
+    assert not os.path.exists(journal_path)
@@ -0,0 +1,70 @@
+"""Vaqt o'lchovlari: persentillar, umumlashtirish va ikki o'lchovni solishtirish.
+
+benchmarks va ui_profiler ikkalasi ishlatadi - ilova benchmarks paketiga bog'lanmaydi.
+"""
+import json
+import platform
+import sqlite3
+import statistics
+
+
+PERCENTILES = (50, 90, 95, 99)
+REGRESSION_THRESHOLD = 0.20     # p50 yoki p95 shuncha (20%) sekinlashsa - regressiya
+NOISE_FLOOR_MS = 0.05           # bundan tez amallarda nisbiy farq hisobga olinmaydi
+
+
+def percentile(values, p):
+    """Eng yaqin daraja usuli bilan p-persentil"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(timings_ms):
+    summary = {f'p{p}': percentile(timings_ms, p) for p in PERCENTILES}
+    summary.update(
+        n=len(timings_ms),
+        mean=statistics.fmean(timings_ms) if timings_ms else 0.0,
+        min=min(timings_ms, default=0.0),
+        max=max(timings_ms, default=0.0),
+    )
+    return summary
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD, stream=None):
+    """Asosiy o'lchov bilan solishtirish; sekinlashgan amallar ro'yxatini qaytaradi"""
+    regressions = []
+    print(f"\n{'amal':<26}{'p50 oldin':>11}{'p50 hozir':>11}{'farq':>9}{'p95 oldin':>11}{'p95 hozir':>11}{'farq':>9}",
+          file=stream)
+    for name, summary in current.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:<26}{'(yangi)':>11}", file=stream)
+            continue
+        cells, slower = [], False
+        for key in ('p50', 'p95'):
+            before, after = old[key], summary[key]
+            change = (after - before) / before if before > 0 else 0.0
+            if change > threshold and after - before > NOISE_FLOOR_MS:
+                slower = True
+            cells.append(f"{before:>11.2f}{after:>11.2f}{change:>+9.0%}")
+        print(f"{name:<26}{''.join(cells)}{'  <- SEKINLASHDI' if slower else ''}", file=stream)
+        if slower:
+            regressions.append(name)
+    return regressions
@@ -0,0 +1,188 @@
+"""Tk oynalari uchun profiler: tugma bosilgandan oyna to'liq chizilguncha vaqt.
+
+Ishlatish:
+    python version2.py --ui-profile              # ui_profile.json ga yoziladi
+    EDU_UI_PROFILE=lab.json python version2.py
+    python -m ui_profiler ui_profile.json                      # hisobot
+    python -m ui_profiler new.json --compare old.json          # sekinlashsa 1 kodi bilan chiqadi
+
+Har bir Tk callbacki (tugma buyrug'i, bind, after) uchun yoziladi:
+    callback_ms  Python callbackning o'zi (vidjetlarni yaratish, bazaga murojaat)
+    layout_ms    callback tugagandan Tk bo'sh holatga (after_idle) kelguncha:
+                 joylashtirish (pack/grid) va qayta chizish
+    widgets      shundan keyin oynadagi vidjetlar soni
+    screen       clear_window ni chaqirgan metod (show_teacher_panel, start_test, ...)
+
+Natija dastur yopilganda faylga yoziladi. Juda qisqa (MIN_EVENT_MS dan kam)
+hodisalar - masalan DBWorker ning bo'sh so'rovlari - yozilmaydi.
+"""
+import atexit
+import json
+import os
+import sys
+import time
+import tkinter
+
+import timings
+
+
+DEFAULT_FILE = 'ui_profile.json'
+MIN_EVENT_MS = 1.0
+
+_profiler = None
+
+
+class Profiler:
+    def __init__(self, root, path):
+        self.root = root
+        self.path = path
+        self.events = []
+        self.screen = None
+        self._depth = 0
+
+    def wrap(self, func):
+        """Callbackni o'lchovchi bilan o'rash (CallWrapper ichidan chaqiriladi)"""
+        name = getattr(func, '__qualname__', None) or repr(func)
+
+        def profiled(*args):
+            # Ichma-ich callbacklar (masalan, update() ichida) tashqisiga qo'shiladi
+            if self._depth:
+                return func(*args)
+            self._depth += 1
+            screen_before = self.screen
+            t0 = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self._depth -= 1
+                t1 = time.perf_counter()
+                self._after_idle(name, screen_before, t0, t1)
+        return profiled
+
+    def _after_idle(self, name, screen_before, t0, t1):
+        def idle():
+            # Shu paytgacha navbatga qo'yilgan joylashtirish ham tugasin
+            try:
+                self.root.update_idletasks()
+            except tkinter.TclError:
+                return
+            t2 = time.perf_counter()
+            total_ms = (t2 - t0) * 1000
+            if total_ms < MIN_EVENT_MS:
+                return
+            self.events.append({
+                'callback': name,
+                'screen': self.screen,
+                'transition': self.screen != screen_before,
+                'callback_ms': round((t1 - t0) * 1000, 3),
+                'layout_ms': round((t2 - t1) * 1000, 3),
+                'total_ms': round(total_ms, 3),
+                'widgets': count_widgets(self.root),
+                'time': time.time(),
+            })
+        try:
+            self.root.after_idle(_internal(idle))
+        except tkinter.TclError:
+            pass    # oyna yopilgan
+
+    def summary(self):
+        """Oyna o'tishlari ekran bo'yicha, qolgan hodisalar callback bo'yicha guruhlanadi"""
+        groups = {}
+        for event in self.events:
+            key = f"screen:{event['screen']}" if event['transition'] else event['callback']
+            groups.setdefault(key, []).append(event)
+        return summarize_groups(groups)
+
+    def dump(self):
+        data = {'meta': dict(timings.environment(), tk=tkinter.TkVersion),
+                'summary': self.summary(), 'events': self.events}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"[ui-profile] {len(self.events)} ta hodisa: {self.path}", file=sys.stderr)
+
+
+def _internal(func):
+    func._ui_profiler_internal = True
+    return func
+
+
+def count_widgets(widget):
+    """widget ostidagi barcha vidjetlar soni (Toplevel oynalar ham)"""
+    return sum(1 + count_widgets(child) for child in widget.children.values())
+
+
+def summarize_groups(groups):
+    summary = {}
+    for key, events in sorted(groups.items()):
+        entry = timings.summarize([event['total_ms'] for event in events])
+        entry.update(
+            callback_ms=timings.percentile([event['callback_ms'] for event in events], 50),
+            layout_ms=timings.percentile([event['layout_ms'] for event in events], 50),
+            widgets=max(event['widgets'] for event in events),
+        )
+        summary[key] = entry
+    return summary
+
+
+class ProfiledCallWrapper(tkinter.CallWrapper):
+    def __init__(self, func, subst, widget):
+        if _profiler is not None and not getattr(func, '_ui_profiler_internal', False):
+            func = _profiler.wrap(func)
+        super().__init__(func, subst, widget)
+
+
+def enabled():
+    return _profiler is not None
+
+
+def requested(argv=None):
+    argv = sys.argv if argv is None else argv
+    return '--ui-profile' in argv or bool(os.environ.get('EDU_UI_PROFILE'))
+
+
+def install(root, path=None):
+    """Profilerni yoqish. Vidjetlar yaratilishidan oldin chaqirilishi kerak -
+    callbacklar ro'yxatdan o'tayotganda o'raladi."""
+    global _profiler
+    _profiler = Profiler(root, path or os.environ.get('EDU_UI_PROFILE') or DEFAULT_FILE)
+    tkinter.CallWrapper = ProfiledCallWrapper
+    atexit.register(_profiler.dump)
+    return _profiler
+
+
+def screen_changed(name):
+    """clear_window dan chaqiriladi: keyingi hodisalar shu ekranga tegishli"""
+    if _profiler is not None:
+        _profiler.screen = name
+
+
+def print_report(summary, stream=None):
+    print(f"{'ekran / callback':<44}{'n':>5}{'p50':>9}{'p95':>9}{'max':>9}{'callback':>10}{'layout':>9}{'vidjet':>8}",
+          file=stream)
+    for key, entry in summary.items():
+        print(f"{key[:43]:<44}{entry['n']:>5}{entry['p50']:>9.1f}{entry['p95']:>9.1f}{entry['max']:>9.1f}"
+              f"{entry['callback_ms']:>10.1f}{entry['layout_ms']:>9.1f}{entry['widgets']:>8}", file=stream)
+    print("(ms; callback va layout - p50)", file=stream)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m ui_profiler', description="UI profil hisoboti")
+    parser.add_argument('file')
+    parser.add_argument('--compare', help="avvalgi profil bilan solishtirish")
+    parser.add_argument('--threshold', type=float, default=timings.REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    current = timings.load(args.file)['summary']
+    print_report(current)
+    if args.compare:
+        regressions = timings.compare(current, timings.load(args.compare)['summary'], args.threshold)
+        if regressions:
+            print(f"\nSekinlashgan oynalar: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
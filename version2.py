@@ -1,119 +1,38 @@
-import pandas as pd
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import sqlite3
-import hashlib
 import os
-import pandas as pd
+import sys
 from datetime import datetime
 from tkinter import *
 from tkinter import messagebox, ttk
-from contextlib import contextmanager
 from tkinter import filedialog, messagebox
-from openpyxl import load_workbook
-from openpyxl.styles import Font
-
-
-
 
-# ==================== DATABASE UTILITIES ====================
-def get_db_connection():
-    """Database ulanishini olish uchun funksiya"""
-    conn = sqlite3.connect('edu_evaluation.db', timeout=10)
-    conn.execute("PRAGMA journal_mode=WAL")
-    return conn
+import client
+import exporters
+import importers
+import passwords
+import querylog
+import repository as repo
+import startup
+import ui_profiler
+from database import db_session, init_db
+from db_worker import DBWorker
+from repository import ResultFilter
 
-@contextmanager
-def db_session():
-    """Database transaktsiyalari uchun context manager"""
-    conn = get_db_connection()
-    try:
-        yield conn
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
-
-        
-# 1. Ma'lumotlar Bazasini Sozlash
-def init_db():
-    conn = sqlite3.connect('edu_evaluation.db')
-    cursor = conn.cursor()
-    
-    # Jadval yaratish
-    cursor.executescript('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        ism TEXT NOT NULL,
-        login TEXT UNIQUE NOT NULL,
-        parol_hash TEXT NOT NULL,
-        salt TEXT NOT NULL,
-        role TEXT NOT NULL CHECK (role IN ('teacher', 'student'))
-    );
-    
-    CREATE TABLE IF NOT EXISTS tests (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nomi TEXT NOT NULL,
-        oqituvchi_id INTEGER NOT NULL,
-        savollar_soni INTEGER DEFAULT 0,
-        FOREIGN KEY (oqituvchi_id) REFERENCES users(id)
-    );
-    
-    CREATE TABLE IF NOT EXISTS questions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        test_id INTEGER NOT NULL,
-        savol_matni TEXT NOT NULL,
-        variant_a TEXT NOT NULL,
-        variant_b TEXT NOT NULL,
-        variant_c TEXT NOT NULL,
-        variant_d TEXT NOT NULL,
-        togri_javob TEXT CHECK (togri_javob IN ('A', 'B', 'C', 'D')),
-        FOREIGN KEY (test_id) REFERENCES tests(id)
-    );
-    
-    CREATE TABLE IF NOT EXISTS results (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        oquvchi_id INTEGER NOT NULL,
-        test_id INTEGER NOT NULL,
-        togri_javoblar INTEGER NOT NULL,
-        foiz REAL NOT NULL,
-        otganmi BOOLEAN NOT NULL,
-        vaqt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (oquvchi_id) REFERENCES users(id),
-        FOREIGN KEY (test_id) REFERENCES tests(id)
-    );
-    
-    CREATE TABLE IF NOT EXISTS student_test_attempts (
-        oquvchi_id INTEGER NOT NULL,
-        test_id INTEGER NOT NULL,
-        PRIMARY KEY (oquvchi_id, test_id),
-        FOREIGN KEY (oquvchi_id) REFERENCES users(id),
-        FOREIGN KEY (test_id) REFERENCES tests(id)
-    );
-    ''')
-    
-    # Dastur boshlanganda admin qo'shamiz
-    try:
-        salt = os.urandom(16).hex()
-        parol_hash = hashlib.sha256(('admin123' + salt).encode()).hexdigest()
-        cursor.execute('''
-        INSERT INTO users (ism, login, parol_hash, salt, role)
-        VALUES (?, ?, ?, ?, ?)
-        ''', ('Admin', 'admin', parol_hash, salt, 'teacher'))
-        conn.commit()
-    except sqlite3.IntegrityError:
-        pass  # Admin allaqachon mavjud
-    
-    conn.close()
 
 # 2. Asosiy Tkinter Dasturi
 class EduEvaluationApp:
     
-    def __init__(self, root):
+    def __init__(self, root, backend=None):
         self.root = root
         self.root.title("Bilim Baholash Tizimi")
         self.current_user = None
         self.current_test = None
+        self.db = DBWorker(self.root)
+        # Kirish va o'quvchi oynalari: baza fayli yoki imtihon serveri (client.py)
+        self.backend = backend or client.LocalBackend()
         
         # Dizayn sozlamalari
         self.root.geometry("800x600")
@@ -170,7 +89,8 @@ class EduEvaluationApp:
         self.password_entry = ttk.Entry(self.root, show="*")
         self.password_entry.pack(pady=10)
         
-        ttk.Button(self.root, text="Kirish", command=self.login).pack(pady=20)
+        self.login_button = ttk.Button(self.root, text="Kirish", command=self.login)
+        self.login_button.pack(pady=20)
         ttk.Button(self.root, text="Chiqish", command=self.root.quit).pack()
     
     def login(self):
@@ -178,33 +98,37 @@ class EduEvaluationApp:
         password = self.password_entry.get()
         role = self.user_type.get()
         
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT id, ism, parol_hash, salt FROM users 
-        WHERE login = ? AND role = ?
-        ''', (login, role))
+        self.login_button.config(state=DISABLED)
+        self.db.submit(
+            self.backend.authenticate, login, password, role,
+            on_success=self.on_login_checked,
+            on_error=self.on_login_failed,
+            owner=self.login_button,
+        )
+
+    def on_login_checked(self, outcome):
+        user, error = outcome
+        if error:
+            self.login_button.config(state=NORMAL)
+            messagebox.showerror("Xatolik", error)
+            return
         
-        user = cursor.fetchone()
-        conn.close()
+        self.current_user = user
+        messagebox.showinfo("Muvaffaqiyat", f"Xush kelibsiz, {user['name']}!")
         
-        if user:
-            user_id, ism, stored_hash, salt = user
-            new_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-            
-            if new_hash == stored_hash:
-                self.current_user = {'id': user_id, 'name': ism, 'role': role}
-                messagebox.showinfo("Muvaffaqiyat", f"Xush kelibsiz, {ism}!")
-                
-                if role == 'teacher':
-                    self.show_teacher_panel()
-                else:
-                    self.show_student_panel()
-            else:
-                messagebox.showerror("Xatolik", "Noto'g'ri parol!")
+        if user['role'] == 'teacher':
+            self.show_teacher_panel()
         else:
-            messagebox.showerror("Xatolik", "Foydalanuvchi topilmadi!")
+            self.show_student_panel()
+
+    def on_login_failed(self, error):
+        self.login_button.config(state=NORMAL)
+        messagebox.showerror("Xatolik", f"Xatolik yuz berdi: {error}")
+
+    def logout(self):
+        # Server rejimida token bekor qilinadi (fon oqimida - oyna kutib qolmasin)
+        self.db.submit(self.backend.logout)
+        self.show_login_screen()
 
     def show_teacher_panel(self):
         self.clear_window()
@@ -214,8 +138,10 @@ class EduEvaluationApp:
         ttk.Button(self.root, text="Yangi O'quvchi Qo'shish", command=self.add_student).pack(pady=10)
         ttk.Button(self.root, text="Test Natijalarini Ko'rish", command=self.show_results).pack(pady=10)
         ttk.Button(self.root, text="Test Natijalarini Yuklash", command=self.export_results_to_excel).pack(pady=10)
+        ttk.Button(self.root, text="Statistika", command=self.show_statistics).pack(pady=10)
+        ttk.Button(self.root, text="Diagnostika", command=self.show_diagnostics).pack(pady=10)
 
-        ttk.Button(self.root, text="Chiqish", command=self.show_login_screen).pack(pady=20)
+        ttk.Button(self.root, text="Chiqish", command=self.logout).pack(pady=20)
 
     def add_student(self):
         self.clear_window()
@@ -234,7 +160,11 @@ class EduEvaluationApp:
         self.student_password_entry.pack(pady=10)
         
         ttk.Button(self.root, text="Saqlash", command=self.save_student).pack(pady=20)
-        ttk.Button(self.root, text="Orqaga", command=self.show_teacher_panel).pack()
+        self.enroll_button = ttk.Button(self.root, text="Ro'yxatni fayldan yuklash (CSV / XLSX)", command=self.enroll_students)
+        self.enroll_button.pack(pady=(0, 5))
+        self.enroll_status = ttk.Label(self.root, text="")
+        self.enroll_status.pack()
+        ttk.Button(self.root, text="Orqaga", command=self.show_teacher_panel).pack(pady=10)
 
     def save_student(self):
         ism = self.student_name_entry.get()
@@ -245,50 +175,68 @@ class EduEvaluationApp:
             messagebox.showerror("Xatolik", "Barcha maydonlarni to'ldiring!")
             return
         
-        try:
-            salt = os.urandom(16).hex()
-            parol_hash = hashlib.sha256((parol + salt).encode()).hexdigest()
-            
-            with db_session() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                INSERT INTO users (ism, login, parol_hash, salt, role)
-                VALUES (?, ?, ?, ?, ?)
-                ''', (ism, login, parol_hash, salt, 'student'))
-            
-            messagebox.showinfo("Muvaffaqiyat", "O'quvchi muvaffaqiyatli qo'shildi!")
-            self.show_teacher_panel()
-        except sqlite3.IntegrityError:
+        self.db.submit(
+            self.create_student, ism, login, parol,
+            on_success=self.on_student_saved,
+            on_error=self.on_student_save_failed,
+            owner=self.student_name_entry,
+        )
+
+    @staticmethod
+    def create_student(ism, login, parol):
+        """Fon oqimida: parolni xeshlash (qasddan sekin) va saqlash"""
+        parol_hash, salt = passwords.hash_password(parol)
+        return repo.users.add(ism, login, parol_hash, salt, 'student')
+
+    def on_student_saved(self, _user_id):
+        messagebox.showinfo("Muvaffaqiyat", "O'quvchi muvaffaqiyatli qo'shildi!")
+        self.show_teacher_panel()
+
+    def on_student_save_failed(self, error):
+        if isinstance(error, sqlite3.IntegrityError):
             messagebox.showerror("Xatolik", "Bu login band!")
-        except Exception as e:
-            messagebox.showerror("Xatolik", f"Xatolik yuz berdi: {str(e)}")
+        else:
+            messagebox.showerror("Xatolik", f"Xatolik yuz berdi: {str(error)}")
 
-    def save_student(self):
-        ism = self.student_name_entry.get()
-        login = self.student_login_entry.get()
-        parol = self.student_password_entry.get()
-        
-        if not ism or not login or not parol:
-            messagebox.showerror("Xatolik", "Barcha maydonlarni to'ldiring!")
+    def enroll_students(self):
+        """O'quvchilar ro'yxatini (ism, login, parol ustunlari) fayldan ommaviy qo'shish"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("O'quvchilar ro'yxati", "*.csv *.xlsx"), ("All files", "*.*")],
+            title="O'quvchilar ro'yxatini tanlash"
+        )
+        if not file_path:
             return
         
-        try:
-            salt = os.urandom(16).hex()
-            parol_hash = hashlib.sha256((parol + salt).encode()).hexdigest()
-            
-            conn = sqlite3.connect('edu_evaluation.db')
-            cursor = conn.cursor()
-            cursor.execute('''
-            INSERT INTO users (ism, login, parol_hash, salt, role)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (ism, login, parol_hash, salt, 'student'))
-            conn.commit()
-            conn.close()
-            
-            messagebox.showinfo("Muvaffaqiyat", "O'quvchi muvaffaqiyatli qo'shildi!")
-            self.show_teacher_panel()
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Xatolik", "Bu login band!")
+        self.enroll_button.config(state=DISABLED)
+        self.enroll_status.config(text="Yuklanmoqda...")
+        self.db.submit(
+            importers.enroll_students, file_path,
+            progress=lambda report: self.db.post(self.on_enroll_progress, report.processed, report.added),
+            on_success=self.on_students_enrolled,
+            on_error=self.on_enroll_failed,
+            owner=self.enroll_button,
+        )
+
+    def on_enroll_progress(self, processed, added):
+        if self.enroll_status.winfo_exists():
+            self.enroll_status.config(text=f"{processed} ta qator ishlandi, {added} ta qo'shildi")
+
+    def on_students_enrolled(self, report):
+        self.enroll_button.config(state=NORMAL)
+        self.enroll_status.config(text="")
+        message = f"{report.added} ta o'quvchi qo'shildi."
+        problems = [f"{line}-qator: login band ({login})" for line, login in report.duplicates]
+        problems += [text for _, text in report.errors]
+        if problems:
+            message += f"\n\nQo'shilmaganlar: {len(problems)} ta\n" + "\n".join(problems[:15])
+            if len(problems) > 15:
+                message += f"\n... va yana {len(problems) - 15} ta"
+        messagebox.showinfo("Natija", message)
+
+    def on_enroll_failed(self, error):
+        self.enroll_button.config(state=NORMAL)
+        self.enroll_status.config(text="")
+        messagebox.showerror("Xatolik", f"Import qilishda xatolik: {str(error)}")
 
     def create_test(self):
         self.clear_window()
@@ -303,6 +251,7 @@ class EduEvaluationApp:
         self.question_count_entry.pack(pady=10)
         
         ttk.Button(self.root, text="Testni Saqlash", command=self.save_test).pack(pady=20)
+        ttk.Button(self.root, text="Savollarni fayldan import qilish", command=self.import_test_questions).pack(pady=10)
         ttk.Button(self.root, text="Orqaga", command=self.show_teacher_panel).pack()
     
 
@@ -317,20 +266,39 @@ class EduEvaluationApp:
         
         question_count = int(question_count)
         
-        try:
-            with db_session() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                INSERT INTO tests (nomi, oqituvchi_id, savollar_soni)
-                VALUES (?, ?, ?)
-                ''', (test_name, self.current_user['id'], question_count))
-                test_id = cursor.lastrowid
-            
+        self.db.submit(
+            repo.tests.create, test_name, self.current_user['id'], question_count,
             # Test savollarini kiritish oynasini ochish
-            self.show_test_questions_window(test_id, test_name, question_count)
-            
-        except Exception as e:
-            messagebox.showerror("Xatolik", f"Test yaratishda xatolik: {str(e)}")
+            on_success=lambda test_id: self.show_test_questions_window(test_id, test_name, question_count),
+            on_error=lambda e: messagebox.showerror("Xatolik", f"Test yaratishda xatolik: {str(e)}"),
+            owner=self.test_name_entry,
+        )
+
+    def import_test_questions(self):
+        """Test nomi kiritilgach, savollar bankini CSV/XLSX fayldan import qilish"""
+        test_name = self.test_name_entry.get()
+        if not test_name:
+            messagebox.showerror("Xatolik", "Test nomini kiriting!")
+            return
+        
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Savollar fayli", "*.csv *.xlsx"), ("All files", "*.*")],
+            title="Savollar faylini tanlash"
+        )
+        if not file_path:
+            return
+        
+        self.db.submit(
+            importers.create_test_from_file, test_name, self.current_user['id'], file_path,
+            on_success=self.on_questions_imported,
+            on_error=lambda e: messagebox.showerror("Xatolik", f"Import qilishda xatolik: {str(e)}"),
+            owner=self.test_name_entry,
+        )
+
+    def on_questions_imported(self, outcome):
+        _test_id, count = outcome
+        messagebox.showinfo("Muvaffaqiyat", f"Test yaratildi, {count} ta savol import qilindi!")
+        self.show_teacher_panel()
 
     def show_test_questions_window(self, test_id, test_name, question_count):
         self.test_questions_window = Toplevel(self.root)
@@ -391,242 +359,226 @@ class EduEvaluationApp:
             command=lambda: self.save_all_questions(test_id, question_count)).pack(pady=20)
 
     def save_all_questions(self, test_id, question_count):
-        try:
-            with db_session() as conn:
-                cursor = conn.cursor()
-                
-                for i in range(question_count):
-                    question = self.question_entries[i].get()
-                    variant_a = self.variant_a_entries[i].get()
-                    variant_b = self.variant_b_entries[i].get()
-                    variant_c = self.variant_c_entries[i].get()
-                    variant_d = self.variant_d_entries[i].get()
-                    correct = self.correct_answer_vars[i].get()
-                    
-                    if not question or not variant_a or not variant_b or not variant_c or not variant_d:
-                        messagebox.showerror("Xatolik", f"Savol {i+1} uchun barcha maydonlarni to'ldiring!")
-                        return
-                    
-                    cursor.execute('''
-                    INSERT INTO questions (test_id, savol_matni, variant_a, variant_b, variant_c, variant_d, togri_javob)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (test_id, question, variant_a, variant_b, variant_c, variant_d, correct))
-                
-                self.test_questions_window.destroy()
-                messagebox.showinfo("Muvaffaqiyat", "Test muvaffaqiyatli yaratildi!")
-                self.show_teacher_panel()
-                
-        except Exception as e:
-            messagebox.showerror("Xatolik", f"Savollarni saqlashda xatolik: {str(e)}")
+        # Avval barcha qatorlar tekshiriladi, bazaga hech narsa yozilmaydi
+        rows, invalid = [], []
+        for i in range(question_count):
+            question = self.question_entries[i].get()
+            variant_a = self.variant_a_entries[i].get()
+            variant_b = self.variant_b_entries[i].get()
+            variant_c = self.variant_c_entries[i].get()
+            variant_d = self.variant_d_entries[i].get()
+            correct = self.correct_answer_vars[i].get()
+            
+            if not question or not variant_a or not variant_b or not variant_c or not variant_d:
+                invalid.append(str(i + 1))
+                continue
+            
+            rows.append((test_id, question, variant_a, variant_b, variant_c, variant_d, correct))
+        
+        if invalid:
+            messagebox.showerror("Xatolik", f"Savol {', '.join(invalid)} uchun barcha maydonlarni to'ldiring!")
+            return
+        
+        self.db.submit(
+            self._insert_questions, test_id, rows,
+            on_success=self.on_questions_saved,
+            on_error=lambda e: messagebox.showerror("Xatolik", f"Savollarni saqlashda xatolik: {str(e)}"),
+            owner=self.test_questions_window,
+        )
+
+    @staticmethod
+    def _insert_questions(test_id, rows):
+        # Savollar bitta executemany bilan, savollar_soni esa shu tranzaksiyada yangilanadi
+        with db_session() as conn:
+            repo.questions.add_many(rows, conn=conn)
+            repo.tests.refresh_question_count(test_id, conn=conn)
+
+    def on_questions_saved(self, _):
+        self.test_questions_window.destroy()
+        messagebox.showinfo("Muvaffaqiyat", "Test muvaffaqiyatli yaratildi!")
+        self.show_teacher_panel()
     
     def show_results(self):
         self.clear_window()
-        TeacherResultsPanel(Toplevel(self.root), self.current_user)
+        TeacherResultsPanel(Toplevel(self.root), self.current_user, self.db)
 
     def export_results_to_excel(self):
-        try:
-            with sqlite3.connect('edu_evaluation.db') as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                SELECT t.nomi, u.ism, r.togri_javoblar, r.foiz, r.otganmi, r.vaqt
-                FROM results r
-                JOIN users u ON r.oquvchi_id = u.id
-                JOIN tests t ON r.test_id = t.id
-                WHERE t.oqituvchi_id = ?
-                ''', (self.current_user['id'],))
-                
-                results = cursor.fetchall()
-
-            # Pandas DataFrame yaratish
-            df = pd.DataFrame(results, columns=["Test nomi", "O'quvchi", "To'g'ri javoblar", "Foiz", "Holat", "Vaqt"])
-            df["Holat"] = df["Holat"].apply(lambda x: "O'tdi" if x else "O'tmadi")
-
-            # Foydalanuvchidan fayl saqlash joyini tanlash
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                title="Natijalarni saqlash"
-            )
-            
-            if not file_path:  
-                return
-                
-            df.to_excel(file_path, index=False, engine='openpyxl')  
+        start_export(self.root, self.db, self.current_user['id'])
 
-            # **Ustun sarlavhalarini kengaytirish**
-            wb = load_workbook(file_path)
-            ws = wb.active
-            
-            for col in ws.columns:
-                max_length = 0
-                col_letter = col[0].column_letter  
-                for cell in col:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except:
-                        pass
-                ws.column_dimensions[col_letter].width = max_length + 3  
-
-            # **Headerlarni bold qilish**
-            for cell in ws[1]:
-                cell.font = Font(bold=True)
-
-            wb.save(file_path)
-            messagebox.showinfo("Muvaffaqiyat", f"Natijalar {file_path} fayliga saqlandi!")
-
-        except Exception as e:
-            messagebox.showerror("Xatolik", f"Export qilishda xatolik: {str(e)}")
+    def show_statistics(self):
+        TeacherStatsPanel(Toplevel(self.root), self.current_user, self.db)
+
+    def show_diagnostics(self):
+        DiagnosticsPanel(Toplevel(self.root))
     
     def show_student_panel(self):
         self.clear_window()
         Label(self.root, text=f"O'quvchi paneli: {self.current_user['name']}", font=('Arial', 16)).pack(pady=20)
         
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
+        # Testlar ro'yxati: Treeview faqat qatorlarni saqlaydi (har biriga vidjet yaratilmaydi),
+        # sahifalar esa pastga aylantirilganda fon oqimida yuklanadi
+        self.tests_frame = Frame(self.root)
+        self.tests_frame.pack(expand=True, fill=BOTH, padx=20)
+        self.tests_status = Label(self.tests_frame, text="Yuklanmoqda...", font=('Arial', 12, 'italic'))
+        self.tests_status.pack()
+        list_frame = Frame(self.tests_frame)
+        list_frame.pack(expand=True, fill=BOTH)
+        scrollbar = ttk.Scrollbar(list_frame, orient=VERTICAL)
+        self.tests_list = ttk.Treeview(list_frame, columns=("Test",), show='headings', height=12,
+                                       selectmode='browse', yscrollcommand=self.on_tests_scroll)
+        self.tests_list.heading("Test", text="Mavjud testlar")
+        scrollbar.config(command=self.tests_list.yview)
+        self.tests_scrollbar = scrollbar
+        scrollbar.pack(side=RIGHT, fill=Y)
+        self.tests_list.pack(side=LEFT, expand=True, fill=BOTH)
+        self.tests_list.bind('<Double-1>', lambda e: self.start_selected_test())
+        self.tests_list.bind('<Return>', lambda e: self.start_selected_test())
+        
+        ttk.Button(self.root, text="Testni boshlash", command=self.start_selected_test).pack(pady=(10, 0))
+        ttk.Button(self.root, text="Natijalarni ko'rish", command=self.show_student_results).pack(pady=20)
+        ttk.Button(self.root, text="Chiqish", command=self.logout).pack()
         
-        cursor.execute('''
-        SELECT t.id, t.nomi 
-        FROM tests t
-        WHERE t.id NOT IN (
-            SELECT test_id FROM student_test_attempts 
-            WHERE oquvchi_id = ?
+        self.tests_loading = False
+        self.tests_at_end = False
+        self.load_available_tests()
+
+    def load_available_tests(self):
+        """Navbatdagi sahifani yuklash (oxirgi ko'rsatilgan testdan keyingilari)"""
+        if self.tests_loading or self.tests_at_end:
+            return
+        children = self.tests_list.get_children()
+        after_id = int(children[-1]) if children else 0
+        self.tests_loading = True
+        self.db.submit(
+            self.backend.available_for_student, self.current_user['id'], after_id,
+            on_success=self.render_available_tests,
+            on_error=self.on_tests_failed,
+            owner=self.tests_list,
         )
-        ''', (self.current_user['id'],))
-        
-        available_tests = cursor.fetchall()
-        conn.close()
-        
-        if not available_tests:
-            Label(self.root, text="Hozircha testlar mavjud emas yoki siz barchasini ishlagansiz").pack()
+
+    def on_tests_failed(self, error):
+        # Keyingi aylantirishda qayta so'raladi
+        self.tests_loading = False
+        self.tests_status.config(text="")
+        messagebox.showerror("Xatolik", f"Testlarni yuklashda xatolik: {str(error)}")
+
+    def render_available_tests(self, available_tests):
+        self.tests_loading = False
+        self.tests_at_end = len(available_tests) < repo.tests.AVAILABLE_PAGE_SIZE
+        for test_id, test_name in available_tests:
+            self.tests_list.insert("", END, iid=test_id, values=(test_name,))
+        
+        count = len(self.tests_list.get_children())
+        if count == 0:
+            self.tests_status.config(text="Hozircha testlar mavjud emas yoki siz barchasini ishlagansiz")
         else:
-            Label(self.root, text="Mavjud testlar:").pack()
-            
-            for test_id, test_name in available_tests:
-                ttk.Button(self.root, text=test_name, 
-                          command=lambda tid=test_id: self.start_test(tid)).pack(pady=5)
-        
-        ttk.Button(self.root, text="Natijalarni ko'rish", command=self.show_student_results).pack(pady=20)
-        ttk.Button(self.root, text="Chiqish", command=self.show_login_screen).pack()
+            more = "" if self.tests_at_end else "+"
+            self.tests_status.config(text=f"Mavjud testlar: {count}{more}", font=('Arial', 12))
+        # Ro'yxat oynani to'ldirmagan bo'lsa, aylantirish hodisasi kelmaydi - keyingisini o'zimiz so'raymiz
+        self.root.after_idle(self.fill_tests_list)
+
+    def fill_tests_list(self):
+        if self.tests_list.winfo_exists():
+            self.on_tests_scroll(*self.tests_list.yview())
+
+    def on_tests_scroll(self, first, last):
+        self.tests_scrollbar.set(first, last)
+        if float(last) > 0.9:
+            self.load_available_tests()
+
+    def start_selected_test(self):
+        selection = self.tests_list.selection()
+        if not selection:
+            messagebox.showerror("Xatolik", "Ro'yxatdan testni tanlang!")
+            return
+        self.start_test(int(selection[0]))
     
     def start_test(self, test_id):
-        self.current_test = test_id
         self.clear_window()
         
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT savol_matni, variant_a, variant_b, variant_c, variant_d FROM questions WHERE test_id = ?', (test_id,))
-        questions = cursor.fetchall()
-        conn.close()
-        
-        self.answers = []
-        self.current_question = 0
-        
-        Label(self.root, text=f"Test: {test_id} - Savol {self.current_question+1}/{len(questions)}", 
-              font=('Arial', 14)).pack(pady=10)
-        
-        self.question_label = Label(self.root, text=questions[self.current_question][0], wraplength=700)
-        self.question_label.pack(pady=10)
-        
-        self.answer_var = StringVar()
-        Radiobutton(self.root, text=questions[self.current_question][1], variable=self.answer_var, value="A").pack(anchor=W)
-        Radiobutton(self.root, text=questions[self.current_question][2], variable=self.answer_var, value="B").pack(anchor=W)
-        Radiobutton(self.root, text=questions[self.current_question][3], variable=self.answer_var, value="C").pack(anchor=W)
-        Radiobutton(self.root, text=questions[self.current_question][4], variable=self.answer_var, value="D").pack(anchor=W)
-        
-        ttk.Button(self.root, text="Keyingi savol", command=lambda: self.next_question(test_id, questions)).pack(pady=20)
-    
-    def next_question(self, test_id, questions):
-        if not self.answer_var.get():
-            messagebox.showerror("Xatolik", "Iltimos, javobni belgilang!")
+        # Savollar va javob kaliti bir marta, id tartibida yuklanadi
+        loading = Label(self.root, text="Test yuklanmoqda...", font=('Arial', 12, 'italic'))
+        loading.pack(pady=40)
+        self.db.submit(
+            self.backend.load_test, test_id,
+            on_success=self.render_test,
+            on_error=self.on_test_load_failed,
+            owner=loading,
+        )
+
+    def on_test_load_failed(self, error):
+        messagebox.showerror("Xatolik", f"Testni yuklashda xatolik: {str(error)}")
+        self.show_student_panel()
+
+    def render_test(self, test):
+        if not test.questions:
+            messagebox.showerror("Xatolik", "Bu testda savollar yo'q!")
+            self.show_student_panel()
             return
         
-        self.answers.append(self.answer_var.get())
-        self.current_question += 1
-        
-        if self.current_question < len(questions):
-            self.clear_window()
-            Label(self.root, text=f"Test: {test_id} - Savol {self.current_question+1}/{len(questions)}", 
-                  font=('Arial', 14)).pack(pady=10)
-            
-            self.question_label = Label(self.root, text=questions[self.current_question][0], wraplength=700)
-            self.question_label.pack(pady=10)
-            
-            self.answer_var = StringVar()
-            Radiobutton(self.root, text=questions[self.current_question][1], variable=self.answer_var, value="A").pack(anchor=W)
-            Radiobutton(self.root, text=questions[self.current_question][2], variable=self.answer_var, value="B").pack(anchor=W)
-            Radiobutton(self.root, text=questions[self.current_question][3], variable=self.answer_var, value="C").pack(anchor=W)
-            Radiobutton(self.root, text=questions[self.current_question][4], variable=self.answer_var, value="D").pack(anchor=W)
-            
-            if self.current_question == len(questions)-1:
-                ttk.Button(self.root, text="Yakunlash", command=lambda: self.finish_test(test_id, questions)).pack(pady=20)
-            else:
-                ttk.Button(self.root, text="Keyingi savol", command=lambda: self.next_question(test_id, questions)).pack(pady=20)
-        else:
-            self.finish_test(test_id, questions)
+        self.current_test = test
+        self.clear_window()
+        self.question_view = QuestionView(self.root, test, on_finish=self.finish_test)
     
-    def finish_test(self, test_id, questions):
-        self.answers.append(self.answer_var.get())
-        
-        # To'g'ri javoblarni olish
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT togri_javob FROM questions WHERE test_id = ? ORDER BY id', (test_id,))
-        correct_answers = [row[0] for row in cursor.fetchall()]
-        
-        # Baholash
-        correct = sum(1 for i in range(len(questions)) if self.answers[i] == correct_answers[i])
-        percentage = (correct / len(questions)) * 100
-        passed = percentage >= 60
-        
-        # Natijalarni saqlash
-        cursor.execute('''
-        INSERT INTO results (oquvchi_id, test_id, togri_javoblar, foiz, otganmi)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (self.current_user['id'], test_id, correct, percentage, passed))
-        
-        # Test ishlanganligini belgilash
-        cursor.execute('''
-        INSERT INTO student_test_attempts (oquvchi_id, test_id)
-        VALUES (?, ?)
-        ''', (self.current_user['id'], test_id))
-        
-        conn.commit()
-        conn.close()
+    def finish_test(self, answers):
+        test = self.current_test
+        
+        # Natija saqlanguncha oyna bloklanmaydi, faqat holat ko'rsatiladi
+        self.clear_window()
+        saving = Label(self.root, text="Natija saqlanmoqda...", font=('Arial', 12, 'italic'))
+        saving.pack(pady=40)
+        
+        # Baholash start_test'da yuklangan kalit bo'yicha (server rejimida - serverda),
+        # natija va urinish bitta tranzaksiyada yoziladi
+        self.db.submit(
+            self.backend.submit, self.current_user['id'], test, answers,
+            on_success=self.show_test_result,
+            on_error=self.on_finish_failed,
+            owner=saving,
+        )
+
+    def show_test_result(self, grade):
+        holat = "O'tdingiz! ✅" if grade.passed else "O'tmadingiz ❌"
         
         # Natijalarni ko'rsatish
         messagebox.showinfo(
             "Test yakunlandi",
-            f"Natijangiz: {correct}/{len(questions)}\n"
-            f"Foiz: {percentage:.1f}%\n"
-            f"Holat: {"O'tdingiz! ✅" if passed else "O'tmadingiz ❌"}"
+            f"Natijangiz: {grade.correct}/{grade.total}\n"
+            f"Foiz: {grade.percentage:.1f}%\n"
+            f"Holat: {holat}"
         )
         
         self.show_student_panel()
+
+    def on_finish_failed(self, error):
+        messagebox.showerror("Xatolik", f"Natijani saqlashda xatolik: {str(error)}")
+        self.show_student_panel()
     
     def show_student_results(self):
         self.clear_window()
         Label(self.root, text="Mening Natijalarim", font=('Arial', 16)).pack(pady=20)
         
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
+        self.results_frame = Frame(self.root)
+        self.results_frame.pack(expand=True, fill=BOTH)
+        Label(self.results_frame, text="Yuklanmoqda...", font=('Arial', 12, 'italic')).pack()
         
-        cursor.execute('''
-        SELECT t.nomi, r.togri_javoblar, r.foiz, r.otganmi, r.vaqt 
-        FROM results r
-        JOIN tests t ON r.test_id = t.id
-        WHERE r.oquvchi_id = ?
-        ''', (self.current_user['id'],))
+        ttk.Button(self.root, text="Orqaga", command=self.show_student_panel).pack(pady=20)
         
-        results = cursor.fetchall()
-        conn.close()
+        self.db.submit(
+            self.backend.results_for_student, self.current_user['id'],
+            on_success=self.render_student_results,
+            owner=self.results_frame,
+        )
+
+    def render_student_results(self, results):
+        for widget in self.results_frame.winfo_children():
+            widget.destroy()
         
         if not results:
-            Label(self.root, text="Hozircha natijalar mavjud emas").pack()
+            Label(self.results_frame, text="Hozircha natijalar mavjud emas").pack()
         else:
             columns = ('Test nomi', "To'g'ri javoblar", "Foiz", "Holat", "Vaqt")
-            tree = ttk.Treeview(self.root, columns=columns, show='headings')
+            tree = ttk.Treeview(self.results_frame, columns=columns, show='headings')
             
             for col in columns:
                 tree.heading(col, text=col)
@@ -637,10 +589,9 @@ class EduEvaluationApp:
                 tree.insert('', END, values=(row[0], row[1], f"{row[2]:.1f}%", holat, row[4]))
             
             tree.pack(expand=True, fill=BOTH)
-        
-        ttk.Button(self.root, text="Orqaga", command=self.show_student_panel).pack(pady=20)
     
     def clear_window(self):
+        ui_profiler.screen_changed(sys._getframe(1).f_code.co_name)
         for widget in self.root.winfo_children():
             widget.destroy()
 
@@ -654,11 +605,150 @@ class EduEvaluationApp:
 
 
 
+class ExportProgress:
+    """Eksport jarayonini ko'rsatuvchi kichik oyna"""
+
+    def __init__(self, parent, file_path):
+        self.window = Toplevel(parent)
+        self.window.title("Eksport")
+        self.window.resizable(False, False)
+        Label(self.window, text=f"Saqlanmoqda: {os.path.basename(file_path)}").pack(padx=20, pady=(15, 5))
+        self.bar = ttk.Progressbar(self.window, length=300, mode='determinate')
+        self.bar.pack(padx=20, pady=5)
+        self.label = Label(self.window, text="Tayyorlanmoqda...")
+        self.label.pack(padx=20, pady=(0, 15))
+
+    def update(self, done, total):
+        if not self.window.winfo_exists():
+            return
+        self.bar.config(maximum=max(total, 1), value=done)
+        self.label.config(text=f"{done} / {total} qator")
+
+    def close(self):
+        if self.window.winfo_exists():
+            self.window.destroy()
+
+
+def start_export(parent, db, teacher_id, filters=None):
+    """Natijalarni tanlangan formatda fon oqimida eksport qilish"""
+    file_path = filedialog.asksaveasfilename(
+        parent=parent,
+        defaultextension=".xlsx",
+        filetypes=exporters.FILE_TYPES + [("All files", "*.*")],
+        title="Natijalarni saqlash"
+    )
+    if not file_path:
+        return
+    
+    progress = ExportProgress(parent, file_path)
+
+    def on_done(count):
+        progress.close()
+        messagebox.showinfo("Muvaffaqiyat", f"{count} ta natija {file_path} fayliga saqlandi!")
+
+    def on_error(error):
+        progress.close()
+        messagebox.showerror("Xatolik", f"Export qilishda xatolik: {str(error)}")
+
+    db.submit(
+        exporters.export_results, file_path, teacher_id, filters,
+        progress=lambda done, total: db.post(progress.update, done, total),
+        on_success=on_done,
+        on_error=on_error,
+    )
+
+
+class QuestionView:
+    """Test ishlash oynasi.
+
+    Vidjetlar start_test'da bir marta yaratiladi; savollar orasida yurilganda
+    faqat matnlar va tanlangan javob yangilanadi (clear_window chaqirilmaydi).
+    """
+
+    def __init__(self, parent, test, on_finish):
+        self.test = test
+        self.on_finish = on_finish
+        self.answers = [None] * test.total
+        self.index = 0
+        
+        self.title_label = Label(parent, font=('Arial', 14))
+        self.title_label.pack(pady=10)
+        
+        self.question_label = Label(parent, wraplength=700)
+        self.question_label.pack(pady=10)
+        
+        self.answer_var = StringVar(parent)
+        self.option_buttons = []
+        for value in ("A", "B", "C", "D"):
+            button = Radiobutton(parent, variable=self.answer_var, value=value)
+            button.pack(anchor=W)
+            self.option_buttons.append(button)
+        
+        nav_frame = Frame(parent)
+        nav_frame.pack(pady=20)
+        self.prev_button = ttk.Button(nav_frame, text="Oldingi savol", command=self.previous)
+        self.prev_button.pack(side=LEFT, padx=5)
+        self.next_button = ttk.Button(nav_frame, command=self.next)
+        self.next_button.pack(side=LEFT, padx=5)
+        
+        self.show(0)
+
+    def show(self, index):
+        """index-savolni ko'rsatish"""
+        self.index = index
+        question = self.test.questions[index]
+        
+        self.title_label.config(text=f"Test: {self.test.id} - Savol {index+1}/{self.test.total}")
+        self.question_label.config(text=question[0])
+        for button, text in zip(self.option_buttons, question[1:5]):
+            button.config(text=text)
+        self.answer_var.set(self.answers[index] or "")
+        
+        self.prev_button.config(state=NORMAL if index > 0 else DISABLED)
+        is_last = index == self.test.total - 1
+        self.next_button.config(text="Yakunlash" if is_last else "Keyingi savol")
+
+    def _remember_answer(self):
+        self.answers[self.index] = self.answer_var.get() or None
+
+    def previous(self):
+        self._remember_answer()
+        if self.index > 0:
+            self.show(self.index - 1)
+
+    def next(self):
+        if not self.answer_var.get():
+            messagebox.showerror("Xatolik", "Iltimos, javobni belgilang!")
+            return
+        
+        self._remember_answer()
+        if self.index < self.test.total - 1:
+            self.show(self.index + 1)
+        elif None in self.answers:
+            missing = self.answers.index(None)
+            messagebox.showerror("Xatolik", f"Savol {missing+1} ga javob belgilanmagan!")
+            self.show(missing)
+        else:
+            self.on_finish(list(self.answers))
+
+
 class TeacherResultsPanel:
-    def __init__(self, parent, current_user):
+    PAGE_SIZE = 200     # bitta so'rovda olinadigan qatorlar
+    MAX_ROWS = 1000     # Treeview'da bir vaqtda turadigan qatorlar (qolganlari aylantirilganda yuklanadi)
+    SEARCH_DELAY = 300  # ms: yozish to'xtagandan keyin shuncha kutib qidirish
+
+    def __init__(self, parent, current_user, db_worker=None):
         self.parent = parent  # Root o‘rniga parent ishlatamiz
         self.current_user = current_user
+        self.db = db_worker or DBWorker(parent)
+        self.generation = 0     # filtr o'zgarganda eski sahifalarni tashlab yuborish uchun
+        self.loading = False
+        self.search_job = None
+        self.test_names = []
+        self.suggested_for = ''     # ochiladigan ro'yxat qaysi matn bo'yicha to'ldirilgan
         self.create_ui()
+        self.load_test_names()
+        self.show_results()
 
     def create_ui(self):
         Label(self.parent, text="Test Natijalari", font=('Arial', 16)).pack(pady=10)
@@ -674,7 +764,8 @@ class TeacherResultsPanel:
         self.holat_combobox.pack()
         
         ttk.Label(self.parent, text="Test nomi:").pack()
-        self.test_combobox = ttk.Combobox(self.parent, textvariable=self.test_var, values=self.get_test_names(), state='readonly')
+        # Yozish mumkin: nomning bir qismi bo'yicha ham qidiradi
+        self.test_combobox = ttk.Combobox(self.parent, textvariable=self.test_var, values=["Hammasi"])
         self.test_combobox.pack()
         
         ttk.Label(self.parent, text="Foydalanuvchi ismi:").pack()
@@ -685,93 +776,390 @@ class TeacherResultsPanel:
         self.foiz_combobox = ttk.Combobox(self.parent, textvariable=self.foiz_var, values=["Hammasi", "50%+", "80%+"], state='readonly')
         self.foiz_combobox.pack()
         
-        ttk.Button(self.parent, text="Filtrlash", command=self.show_results).pack(pady=10)
-        
-        self.tree = ttk.Treeview(self.parent, columns=("O‘quvchi", "Test", "To‘g‘ri javoblar", "Foiz", "Holat", "Vaqt"), show='headings')
+        # Yozish bilan birga qidirish (debounce bilan)
+        self.student_var.trace_add('write', self.schedule_search)
+        self.test_var.trace_add('write', self.schedule_search)
+        self.holat_combobox.bind('<<ComboboxSelected>>', lambda e: self.show_results())
+        self.foiz_combobox.bind('<<ComboboxSelected>>', lambda e: self.show_results())
+        
+        self.filter_button = ttk.Button(self.parent, text="Filtrlash", command=self.show_results)
+        self.filter_button.pack(pady=10)
+        self.status_label = ttk.Label(self.parent, text="")
+        self.status_label.pack()
+        
+        tree_frame = Frame(self.parent)
+        tree_frame.pack(expand=True, fill=BOTH)
+        self.scrollbar = ttk.Scrollbar(tree_frame, orient=VERTICAL)
+        self.tree = ttk.Treeview(tree_frame, columns=("O‘quvchi", "Test", "To‘g‘ri javoblar", "Foiz", "Holat", "Vaqt"), show='headings',
+                                 yscrollcommand=self.on_tree_scroll)
+        self.scrollbar.config(command=self.tree.yview)
         for col in ("O‘quvchi", "Test", "To‘g‘ri javoblar", "Foiz", "Holat", "Vaqt"):
             self.tree.heading(col, text=col)
             self.tree.column(col, width=120)
-        self.tree.pack(expand=True, fill=BOTH)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
         
-        ttk.Button(self.parent, text="Excelga saqlash", command=self.export_results_to_excel).pack(pady=10)
+        ttk.Button(self.parent, text="Faylga saqlash (XLSX / CSV / Parquet)", command=self.export_results_to_excel).pack(pady=10)
 
     
     def get_test_names(self):
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT nomi FROM tests WHERE oqituvchi_id = ?", (self.current_user['id'],))
-        tests = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        tests = repo.tests.names_for_teacher(self.current_user['id'])
         return ["Hammasi"] + tests
+
+    def load_test_names(self):
+        """Test nomlarini fon oqimida yuklab, comboboxga qo'yish"""
+        self.db.submit(
+            self.get_test_names,
+            on_success=self.on_test_names_loaded,
+            owner=self.test_combobox,
+        )
+
+    def on_test_names_loaded(self, names):
+        self.test_names = names
+        self.test_combobox.config(values=names)
+
+    def schedule_search(self, *args):
+        """Har bir tugma bosilishida emas, yozish to'xtagach bitta so'rov yuborish"""
+        if self.search_job is not None:
+            self.parent.after_cancel(self.search_job)
+        self.search_job = self.parent.after(self.SEARCH_DELAY, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        self.suggest_test_names()
+        self.show_results()
+
+    def suggest_test_names(self):
+        """Yozilgan matnga mos test nomlarini ochiladigan ro'yxatga qo'yish (FTS indeks orqali)"""
+        text = self.test_var.get().strip()
+        if text == self.suggested_for:
+            return
+        self.suggested_for = text
+        if not text or text in self.test_names:
+            self.test_combobox.config(values=self.test_names)
+            return
+        self.db.submit(
+            repo.tests.search_names, self.current_user['id'], text,
+            on_success=lambda names: self.on_test_names_found(text, names),
+            owner=self.test_combobox,
+        )
+
+    def on_test_names_found(self, text, names):
+        if text == self.suggested_for:
+            self.test_combobox.config(values=["Hammasi"] + names)
+    
+    def current_filter(self):
+        """Oynadagi filtrlarni ResultFilter ko'rinishida olish"""
+        holat = self.holat_var.get()
+        foiz = self.foiz_var.get()
+        test = self.test_var.get().strip()
+        if test == "Hammasi":
+            test = ''
+        # Ro'yxatdagi nom tanlangan bo'lsa - aniq moslik, aks holda qisman qidiruv
+        exact = test in self.test_names
+        return ResultFilter(
+            otganmi=True if holat == "O‘tgan" else False if holat == "O‘tolmagan" else None,
+            test_nomi=test if test and exact else None,
+            test_matn=test if test and not exact else None,
+            ism=self.student_var.get().strip() or None,
+            min_foiz={"50%+": 50, "80%+": 80}.get(foiz),
+        )
     
     def show_results(self):
+        """Filtr bo'yicha natijalarni boshidan ko'rsatish: jami soni va birinchi sahifa"""
+        if self.search_job is not None:
+            self.parent.after_cancel(self.search_job)
+            self.search_job = None
+        self.generation += 1
+        self.filters = self.current_filter()
         self.tree.delete(*self.tree.get_children())
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
-        
-        query = '''
-        SELECT u.ism, t.nomi, r.togri_javoblar, r.foiz, r.otganmi, r.vaqt
-        FROM results r
-        JOIN users u ON r.oquvchi_id = u.id
-        JOIN tests t ON r.test_id = t.id
-        WHERE t.oqituvchi_id = ?
-        '''
-        params = [self.current_user['id']]
-        
-        # Filtrlash shartlari
-        if self.holat_var.get() == "O‘tgan":
-            query += " AND r.otganmi = 1"
-        elif self.holat_var.get() == "O‘tolmagan":
-            query += " AND r.otganmi = 0"
-        
-        if self.test_var.get() != "Hammasi":
-            query += " AND t.nomi = ?"
-            params.append(self.test_var.get())
-        
-        if self.student_var.get():
-            query += " AND u.ism LIKE ?"
-            params.append(f"%{self.student_var.get()}%")
-        
-        if self.foiz_var.get() == "50%+":
-            query += " AND r.foiz >= 50"
-        elif self.foiz_var.get() == "80%+":
-            query += " AND r.foiz >= 80"
-        
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        conn.close()
-        
-        for row in results:
-            holat = "O‘tdi" if row[4] else "O‘tmadi"
-            self.tree.insert('', END, values=(row[0], row[1], row[2], f"{row[3]:.1f}%", holat, row[5]))
+        self.at_start, self.at_end = True, False
+        self.loading = False
+        self.total = None
+        
+        self.filter_button.config(state=DISABLED)
+        self.status_label.config(text="Yuklanmoqda...")
+        
+        # Jami soni test_stats dan olinadigan bo'lsagina so'raladi: ism yoki
+        # qisman nom bo'yicha sanash hamma natijalarni ko'rib chiqadi
+        if self.filters.countable():
+            generation = self.generation
+            self.db.submit(
+                repo.results.count_for_teacher, self.current_user['id'], self.filters,
+                on_success=lambda total: self.on_total_counted(generation, total),
+                on_error=self.on_results_failed,
+                owner=self.tree,
+            )
+        self.load_page(forward=True)
+
+    def on_total_counted(self, generation, total):
+        if generation == self.generation:
+            self.total = total
+            self.update_status()
+
+    def load_page(self, forward=True):
+        """Ko'rinib turgan oynadan keyingi (forward) yoki oldingi sahifani yuklash"""
+        if self.loading:
+            return
+        children = self.tree.get_children()
+        if forward:
+            if self.at_end:
+                return
+            position = {'after_id': int(children[-1])} if children else {}
+        else:
+            if self.at_start or not children:
+                return
+            position = {'before_id': int(children[0])}
+        
+        self.loading = True
+        generation = self.generation
+        self.db.submit(
+            repo.results.page_for_teacher, self.current_user['id'], self.filters,
+            limit=self.PAGE_SIZE, **position,
+            on_success=lambda rows: self.render_page(generation, rows, forward),
+            on_error=self.on_results_failed,
+            owner=self.tree,
+        )
+
+    def render_page(self, generation, rows, forward):
+        if generation != self.generation:
+            return  # filtr o'zgargan, bu sahifa endi kerak emas
+        self.loading = False
+        
+        # Ko'rinib turgan birinchi qator joyida qolishi uchun uning indeksini eslab qolamiz
+        children = self.tree.get_children()
+        top = int(round(self.tree.yview()[0] * len(children))) if children else 0
+        
+        if forward:
+            for row in rows:
+                self.insert_row(END, row)
+            self.at_end = len(rows) < self.PAGE_SIZE
+            children = self.tree.get_children()
+            excess = len(children) - self.MAX_ROWS
+            if excess > 0:
+                self.tree.delete(*children[:excess])
+                self.at_start = False
+                top -= excess
+        else:
+            for row in reversed(rows):
+                self.insert_row(0, row)
+            self.at_start = len(rows) < self.PAGE_SIZE
+            top += len(rows)
+            children = self.tree.get_children()
+            excess = len(children) - self.MAX_ROWS
+            if excess > 0:
+                self.tree.delete(*children[-excess:])
+                self.at_end = False
+        
+        children = self.tree.get_children()
+        if children:
+            self.tree.yview_moveto(max(top, 0) / len(children))
+        self.update_status()
+        self.filter_button.config(state=NORMAL)
+
+    def insert_row(self, index, row):
+        result_id, ism, nomi, togri, foiz, otganmi, vaqt = row
+        holat = "O‘tdi" if otganmi else "O‘tmadi"
+        self.tree.insert('', index, iid=str(result_id), values=(ism, nomi, togri, f"{foiz:.1f}%", holat, vaqt))
+
+    def on_tree_scroll(self, first, last):
+        """Aylantirilganda oyna chetiga yaqinlashsa, navbatdagi sahifani yuklash"""
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9:
+            self.load_page(forward=True)
+        elif float(first) < 0.1:
+            self.load_page(forward=False)
+
+    def update_status(self):
+        shown = len(self.tree.get_children())
+        if self.total is not None:
+            total = self.total
+        elif not self.filters.countable():
+            # Sanalmagan: hammasi yuklanganda aniq, aks holda kamida shuncha
+            total = shown if self.at_start and self.at_end else f"{shown}+"
+        else:
+            total = "..."
+        self.status_label.config(text=f"Ko'rsatilmoqda: {shown} ta, jami natijalar: {total}")
+
+    def on_results_failed(self, error):
+        self.loading = False
+        self.status_label.config(text="")
+        self.filter_button.config(state=NORMAL)
+        messagebox.showerror("Xatolik", f"Natijalarni yuklashda xatolik: {str(error)}")
     
     def export_results_to_excel(self):
-        conn = sqlite3.connect('edu_evaluation.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-        SELECT u.ism, t.nomi, r.togri_javoblar, r.foiz, r.otganmi, r.vaqt
-        FROM results r
-        JOIN users u ON r.oquvchi_id = u.id
-        JOIN tests t ON r.test_id = t.id
-        WHERE t.oqituvchi_id = ?
-        ''', (self.current_user['id'],))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        df = pd.DataFrame(results, columns=["O‘quvchi", "Test", "To‘g‘ri javoblar", "Foiz", "Holat", "Vaqt"])
-        df["Holat"] = df["Holat"].apply(lambda x: "O‘tdi" if x else "O‘tmadi")
-        
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")], title="Natijalarni saqlash"
-        )
-        
-        if file_path:
-            df.to_excel(file_path, index=False)
-            messagebox.showinfo("Muvaffaqiyatli", "Natijalar Excel fayliga saqlandi!")
+        # Oynadagi filtrlar eksportga ham qo'llanadi
+        start_export(self.parent, self.db, self.current_user['id'], self.current_filter())
+
+
+class TeacherStatsPanel:
+    """Testlar va o'quvchilar bo'yicha statistika.
+
+    Raqamlar test_stats / student_stats / test_histogram jadvallaridan olinadi -
+    ularni natija yozilganda triggerlar yangilaydi, results qayta hisoblanmaydi.
+    """
+    BAR_WIDTH = 40  # gistogrammadagi eng uzun ustun (belgilar soni)
+
+    def __init__(self, parent, current_user, db_worker=None):
+        self.parent = parent
+        self.current_user = current_user
+        self.db = db_worker or DBWorker(parent)
+        self.parent.title("Statistika")
+        self.create_ui()
+        self.load()
+
+    def create_ui(self):
+        Label(self.parent, text="Statistika", font=('Arial', 16)).pack(pady=10)
+        notebook = ttk.Notebook(self.parent)
+        notebook.pack(expand=True, fill=BOTH, padx=10, pady=10)
+
+        tests_tab = Frame(notebook)
+        notebook.add(tests_tab, text="Testlar")
+        self.tests_tree = self.make_tree(tests_tab, ("Test", "Urinishlar", "O‘tganlar", "O‘tish %", "O‘rtacha", "Min", "Max"))
+        self.tests_tree.bind('<<TreeviewSelect>>', self.on_test_selected)
+        self.histogram_label = Label(tests_tab, text="Gistogramma uchun testni tanlang", font=('Courier', 10), justify=LEFT)
+        self.histogram_label.pack(pady=10, anchor=W)
+
+        students_tab = Frame(notebook)
+        notebook.add(students_tab, text="O‘quvchilar")
+        self.students_tree = self.make_tree(students_tab, ("O‘quvchi", "Urinishlar", "O‘tganlar", "O‘tish %", "O‘rtacha", "Min", "Max"))
+
+    @staticmethod
+    def make_tree(parent, columns):
+        frame = Frame(parent)
+        frame.pack(expand=True, fill=BOTH)
+        tree = ttk.Treeview(frame, columns=columns, show='headings')
+        scrollbar = ttk.Scrollbar(frame, orient=VERTICAL, command=tree.yview)
+        tree.config(yscrollcommand=scrollbar.set)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=90)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        tree.pack(side=LEFT, expand=True, fill=BOTH)
+        return tree
+
+    def load(self):
+        teacher_id = self.current_user['id']
+        self.db.submit(repo.stats.for_teacher_tests, teacher_id,
+                       on_success=lambda rows: self.fill(self.tests_tree, rows), owner=self.tests_tree)
+        self.db.submit(repo.stats.for_teacher_students, teacher_id,
+                       on_success=lambda rows: self.fill(self.students_tree, rows), owner=self.students_tree)
+
+    @staticmethod
+    def fill(tree, rows):
+        for row_id, name, urinishlar, otganlar, ortacha, foiz_min, foiz_max in rows:
+            tree.insert("", END, iid=row_id, values=(
+                name, urinishlar, otganlar, f"{otganlar / urinishlar * 100:.1f}%",
+                f"{ortacha:.1f}%", f"{foiz_min:.1f}%", f"{foiz_max:.1f}%",
+            ))
+
+    def on_test_selected(self, event):
+        selection = self.tests_tree.selection()
+        if selection:
+            test_id = int(selection[0])
+            self.db.submit(repo.stats.histogram, test_id,
+                           on_success=self.show_histogram, owner=self.histogram_label)
+
+    def show_histogram(self, counts):
+        peak = max(counts) or 1
+        lines = []
+        for bucket, soni in enumerate(counts):
+            low = bucket * 10
+            high = 100 if bucket == len(counts) - 1 else low + 9
+            bar = '#' * round(soni / peak * self.BAR_WIDTH)
+            lines.append(f"{low:>3}-{high:<3}% | {bar} {soni}")
+        self.histogram_label.config(text="\n".join(lines))
+
+
+class DiagnosticsPanel:
+    """So'rovlar o'lchovi (querylog): eng ko'p vaqt olgan so'rovlar va oxirgi sekinlari.
+
+    Ma'lumot xotiradan olinadi, bazaga murojaat qilinmaydi.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.parent.title("Diagnostika")
+        self.create_ui()
+        self.refresh()
+
+    def create_ui(self):
+        Label(self.parent, text="So'rovlar diagnostikasi", font=('Arial', 16)).pack(pady=10)
+        self.status_label = Label(self.parent, font=('Arial', 10, 'italic'))
+        self.status_label.pack()
+
+        notebook = ttk.Notebook(self.parent)
+        notebook.pack(expand=True, fill=BOTH, padx=10, pady=10)
+
+        top_tab = Frame(notebook)
+        notebook.add(top_tab, text="Eng og'ir so'rovlar")
+        self.top_tree = TeacherStatsPanel.make_tree(top_tab, ("So'rov", "Soni", "Jami ms", "O'rtacha ms", "Max ms", "Qatorlar", "Sekin", "Chaqiruvchilar"))
+        self.top_tree.column("So'rov", width=360)
+        self.top_tree.column("Chaqiruvchilar", width=240)
+
+        slow_tab = Frame(notebook)
+        notebook.add(slow_tab, text="Sekin so'rovlar")
+        self.slow_tree = TeacherStatsPanel.make_tree(slow_tab, ("Vaqt", "ms", "Qatorlar", "Ekran", "Chaqiruvchi", "So'rov"))
+        self.slow_tree.column("So'rov", width=360)
+        self.slow_tree.bind('<<TreeviewSelect>>', self.on_slow_selected)
+        self.plan_label = Label(slow_tab, text="Reja (EXPLAIN QUERY PLAN) uchun so'rovni tanlang",
+                                font=('Courier', 10), justify=LEFT, anchor=W)
+        self.plan_label.pack(fill=X, pady=5)
+
+        buttons = Frame(self.parent)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="Yangilash", command=self.refresh).pack(side=LEFT, padx=5)
+        ttk.Button(buttons, text="Tozalash", command=self.clear).pack(side=LEFT, padx=5)
+
+    def refresh(self):
+        if querylog.ENABLED:
+            self.status_label.config(text=f"Sekin so'rov chegarasi: {querylog.SLOW_QUERY_MS:g} ms, jurnal: {querylog.LOG_FILE}")
+        else:
+            self.status_label.config(text="O'lchash o'chirilgan: dasturni EDU_QUERY_LOG=1 bilan ishga tushiring")
+
+        self.top_tree.delete(*self.top_tree.get_children())
+        for entry in querylog.top_queries():
+            self.top_tree.insert("", END, values=(
+                entry.sql[:200], entry.count, f"{entry.total_ms:.1f}", f"{entry.total_ms / entry.count:.2f}",
+                f"{entry.max_ms:.1f}", entry.rows, entry.slow, ", ".join(sorted(entry.callers)),
+            ))
+
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        self.slow_records = querylog.slow_queries()[::-1]
+        for index, record in enumerate(self.slow_records):
+            self.slow_tree.insert("", END, iid=index, values=(
+                time.strftime('%H:%M:%S', time.localtime(record.wall_time)), f"{record.elapsed_ms:.1f}",
+                record.rows, record.screen or '-', record.caller, querylog.normalize(record.sql)[:200],
+            ))
+
+    def on_slow_selected(self, event):
+        selection = self.slow_tree.selection()
+        if selection:
+            record = self.slow_records[int(selection[0])]
+            plan = "\n".join(record.plan) if record.plan else "(reja yozilmagan)"
+            self.plan_label.config(text=f"{querylog.normalize(record.sql)}\n\n{plan}")
+
+    def clear(self):
+        querylog.reset()
+        self.refresh()
 
 if __name__ == "__main__":
-    init_db()
+    backend = client.backend_for(sys.argv)
+    if isinstance(backend, client.LocalBackend):
+        init_db()
     root = Tk()
-    app = EduEvaluationApp(root)
+    if ui_profiler.requested():
+        ui_profiler.install(root)
+    app = EduEvaluationApp(root, backend)
+    
+    # Kirish oynasi chizilgach: vaqtni o'lchash va og'ir modullarni fonda yuklash
+    if "--startup-time" in sys.argv or "--startup-check" in sys.argv:
+        def check_startup():
+            ok = startup.report(_STARTUP_T0)
+            if "--startup-check" in sys.argv:
+                root.destroy()
+                sys.exit(0 if ok else 1)
+        root.after_idle(check_startup)
+    root.after_idle(lambda: root.after(200, startup.preload))
+    
     root.mainloop()
\ No newline at end of file